@@ -0,0 +1,106 @@
+"""
+Shared HTTP client for the AI service at BASE_URL.
+
+All calls go through one `requests.Session`, so connections are pooled and
+kept alive instead of paying a TCP and TLS handshake for every submission and
+status poll. Up to AI_POOL_SIZE connections are kept; it should cover the STT
+submissions of all work queue workers plus the job monitor's workers.
+
+Every call has a (connect, read) timeout: AI_CONNECT_TIMEOUT_SECONDS and, unless
+the caller passes its own, AI_READ_TIMEOUT_SECONDS. Idempotent GET requests
+are retried up to AI_GET_RETRIES times on connection errors and 502/503/504
+responses, with exponential backoff. Submissions (POST) are never retried, as
+a retry could start a second GPU job.
+
+Latency and error counts are kept per endpoint and reported by `stats`.
+"""
+import os
+import threading
+import time
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+load_dotenv()
+
+AI_CONNECT_TIMEOUT_SECONDS = float(os.getenv("AI_CONNECT_TIMEOUT_SECONDS", "10"))
+AI_READ_TIMEOUT_SECONDS = float(os.getenv("AI_READ_TIMEOUT_SECONDS", "120"))
+AI_POOL_SIZE = int(os.getenv("AI_POOL_SIZE", "32"))
+AI_GET_RETRIES = int(os.getenv("AI_GET_RETRIES", "3"))
+
+_retry = Retry(
+    total=AI_GET_RETRIES,
+    backoff_factor=0.5,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(["GET"]),
+    # Hand the last response to the caller, which reports the status code as before
+    raise_on_status=False,
+)
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=AI_POOL_SIZE, max_retries=_retry)
+session = requests.Session()
+session.mount("http://", _adapter)
+session.mount("https://", _adapter)
+
+_stats = {}  # Format: {endpoint: {"calls", "errors", "total_seconds", "max_seconds"}}
+_stats_lock = threading.Lock()
+
+
+def _record(endpoint: str, seconds: float, failed: bool):
+    with _stats_lock:
+        entry = _stats.setdefault(endpoint, {"calls": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+        entry["calls"] += 1
+        entry["errors"] += failed
+        entry["total_seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+
+
+def request(method: str, endpoint: str, url: str, read_timeout: float = None, **kwargs) -> requests.Response:
+    """
+    Send a request to the AI service on the shared session.
+
+    Args:
+        method (str): HTTP method.
+        endpoint (str): Name the latency is recorded under, e.g. "job_status".
+        url (str): Full URL of the request.
+        read_timeout (float): Read timeout in seconds, AI_READ_TIMEOUT_SECONDS by default.
+        **kwargs: Passed on to `requests.Session.request`.
+
+    Returns:
+        requests.Response: The response; error statuses are not raised.
+    """
+    kwargs["timeout"] = (AI_CONNECT_TIMEOUT_SECONDS, read_timeout or AI_READ_TIMEOUT_SECONDS)
+    started = time.perf_counter()
+    failed = True
+    try:
+        response = session.request(method, url, **kwargs)
+        failed = response.status_code >= 400
+        return response
+    finally:
+        # For streamed downloads this is the time until the response headers arrived
+        _record(endpoint, time.perf_counter() - started, failed)
+
+
+def get(endpoint: str, url: str, **kwargs) -> requests.Response:
+    """Send a GET request to the AI service; see `request`."""
+    return request("GET", endpoint, url, **kwargs)
+
+
+def post(endpoint: str, url: str, **kwargs) -> requests.Response:
+    """Send a POST request to the AI service; see `request`."""
+    return request("POST", endpoint, url, **kwargs)
+
+
+def stats() -> dict:
+    """Return the number of calls, errors and the average and max latency per endpoint."""
+    with _stats_lock:
+        return {
+            endpoint: {
+                "calls": entry["calls"],
+                "errors": entry["errors"],
+                "avg_ms": round(entry["total_seconds"] / entry["calls"] * 1000, 1),
+                "max_ms": round(entry["max_seconds"] * 1000, 1),
+            }
+            for endpoint, entry in _stats.items()
+        }
@@ -0,0 +1,203 @@
+"""
+Admission control for the jobs this process submits to the AI service.
+
+At most AI_MAX_IN_FLIGHT AI jobs are in flight at a time. A job holds its
+slot from its submission until the job monitor sees it finish or fail; a
+submission that returns no job id gives its slot back at once. Slots whose job
+was never handed to the monitor are reclaimed after
+AI_SLOT_TIMEOUT_SECONDS.
+
+When the cap is reached, submissions wait and freed slots are granted:
+1. to interactive work (a chapter triggered by a user and the preflight test
+   jobs) before bulk transcriptions of books and projects,
+2. then to the user with the fewest jobs in flight,
+3. then to that user's project with the fewest jobs in flight,
+4. then to the submission that has waited longest.
+So a user who queues a whole project shares the AI service with everyone else
+instead of holding all of it.
+
+Preflight test jobs are submitted on the request path and do not wait: without
+a free slot they are refused, so waiting requests cannot tie up the threads
+that serve the API.
+
+Jobs recovered at startup were admitted before the restart and are not counted.
+
+The cap and the fair-share order apply within one process. Each standalone
+`python work_queue.py` worker has a scheduler of its own, so when workers run
+beside the app, give every process AI_MAX_IN_FLIGHT divided by the number of
+processes to keep the total within what the AI service takes.
+"""
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+from dependency import logger
+
+load_dotenv()
+
+AI_MAX_IN_FLIGHT = int(os.getenv("AI_MAX_IN_FLIGHT", "16"))
+AI_SLOT_TIMEOUT_SECONDS = float(os.getenv("AI_SLOT_TIMEOUT_SECONDS", "3600"))
+# Seconds a waiting submission sleeps before checking for expired slots again
+EXPIRY_CHECK_SECONDS = 30
+
+_cond = threading.Condition()
+_waiting = []  # Format: [ticket], see `_Ticket`
+_granted = set()  # Tickets submitting or holding an AI job
+_jobs = {}  # Format: {ai_jobid: ticket}
+_in_flight_by_user = {}
+_in_flight_by_project = {}
+_wait_stats = {}  # Format: {user_id: {"granted", "wait_seconds", "max_wait_seconds"}}
+
+
+class _Ticket:
+    def __init__(self, user_id: int, project_id: int, interactive: bool):
+        self.user_id = user_id
+        self.project_id = project_id
+        self.interactive = interactive
+        self.queued_at = time.time()
+        self.granted_at = None
+
+
+class AIServiceBusy(Exception):
+    """Raised when a submission is not admitted within its timeout."""
+
+
+def _expire(now: float):
+    for ticket in [ticket for ticket in _granted if now - ticket.granted_at > AI_SLOT_TIMEOUT_SECONDS]:
+        logger.warning(
+            f"Reclaiming AI slot of user {ticket.user_id}, project {ticket.project_id} "
+            f"held for more than {AI_SLOT_TIMEOUT_SECONDS} seconds"
+        )
+        _release(ticket)
+
+
+def _release(ticket: _Ticket):
+    if ticket not in _granted:
+        return
+    _granted.discard(ticket)
+    _in_flight_by_user[ticket.user_id] -= 1
+    _in_flight_by_project[ticket.project_id] -= 1
+
+
+def _grant():
+    """Hand free slots to waiting submissions in fair-share order. The caller holds `_cond`."""
+    now = time.time()
+    _expire(now)
+    while _waiting and len(_granted) < AI_MAX_IN_FLIGHT:
+        ticket = min(
+            _waiting,
+            key=lambda ticket: (
+                not ticket.interactive,
+                _in_flight_by_user.get(ticket.user_id, 0),
+                _in_flight_by_project.get(ticket.project_id, 0),
+                ticket.queued_at,
+            ),
+        )
+        _waiting.remove(ticket)
+        ticket.granted_at = now
+        _granted.add(ticket)
+        _in_flight_by_user[ticket.user_id] = _in_flight_by_user.get(ticket.user_id, 0) + 1
+        _in_flight_by_project[ticket.project_id] = _in_flight_by_project.get(ticket.project_id, 0) + 1
+        waited = now - ticket.queued_at
+        entry = _wait_stats.setdefault(ticket.user_id, {"granted": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0})
+        entry["granted"] += 1
+        entry["wait_seconds"] += waited
+        entry["max_wait_seconds"] = max(entry["max_wait_seconds"], waited)
+    _cond.notify_all()
+
+
+def submit(
+    call: Callable[[], dict],
+    user_id: int,
+    project_id: int,
+    interactive: bool = True,
+    timeout: Optional[float] = None,
+) -> dict:
+    """
+    Wait for a slot and submit a job to the AI service.
+
+    Args:
+        call (Callable[[], dict]): Submits the job, e.g. `call_stt_api`, and
+            returns its response; the job id is read from ["data"]["jobId"].
+        user_id (int): The owner of the project the job belongs to.
+        project_id (int): The project the job belongs to.
+        interactive (bool): False for bulk work, which yields to interactive work.
+        timeout (Optional[float]): Seconds to wait for a slot, without limit by
+            default; 0 only takes a slot that is free right away.
+
+    Raises:
+        AIServiceBusy: If no slot was granted within the timeout.
+
+    Returns:
+        dict: The response of `call`.
+    """
+    ticket = _Ticket(user_id, project_id, interactive)
+    deadline = None if timeout is None else ticket.queued_at + timeout
+    with _cond:
+        _waiting.append(ticket)
+        _grant()
+        while ticket.granted_at is None:
+            remaining = EXPIRY_CHECK_SECONDS if deadline is None else min(deadline - time.time(), EXPIRY_CHECK_SECONDS)
+            if remaining <= 0:
+                _waiting.remove(ticket)
+                raise AIServiceBusy(f"No AI slot free within {timeout} seconds" if timeout else "No AI slot free")
+            _cond.wait(remaining)
+            _grant()
+
+    result = None
+    try:
+        result = call()
+        return result
+    finally:
+        ai_jobid = result.get("data", {}).get("jobId") if isinstance(result, dict) else None
+        with _cond:
+            if ai_jobid:
+                _jobs[ai_jobid] = ticket
+            else:
+                _release(ticket)
+                _grant()
+
+
+def finished(ai_jobid: str):
+    """Free the slot of an AI job that finished or failed."""
+    with _cond:
+        ticket = _jobs.pop(ai_jobid, None)
+        if ticket is not None:
+            _release(ticket)
+            _grant()
+
+
+def _user_stats(user_id: int, now: float) -> dict:
+    waiting = [ticket for ticket in _waiting if ticket.user_id == user_id]
+    history = _wait_stats.get(user_id)
+    return {
+        "in_flight": _in_flight_by_user.get(user_id, 0),
+        "waiting": len(waiting),
+        "oldest_wait_seconds": max((now - ticket.queued_at for ticket in waiting), default=0),
+        "avg_wait_seconds": history["wait_seconds"] / history["granted"] if history else 0,
+        "max_wait_seconds": history["max_wait_seconds"] if history else 0,
+    }
+
+
+def stats(user_id: Optional[int] = None) -> dict:
+    """
+    Return the jobs in flight and the submissions waiting for a slot, in total
+    and per user, with how long submissions waited. With a user id only that
+    user's entry is returned.
+    """
+    now = time.time()
+    with _cond:
+        if user_id is not None:
+            return _user_stats(user_id, now)
+        active = {ticket.user_id for ticket in _waiting} | {
+            user for user, in_flight in _in_flight_by_user.items() if in_flight
+        }
+        return {
+            "max_in_flight": AI_MAX_IN_FLIGHT,
+            "in_flight": len(_granted),
+            "waiting": len(_waiting),
+            "users": {user: _user_stats(user, now) for user in sorted(active)},
+        }
@@ -1,4 +1,6 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import insert, func, case, and_, or_, cast, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 import zipfile
 import os
 from database import SessionLocal, User,Verse,Chapter,Job
@@ -7,9 +9,10 @@ import requests
 import time
 import shutil
 from fastapi import  HTTPException,UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 from pathlib import Path
-from database import Project ,Book
+from database import Project ,Book, WorkItem
 import json
 from dotenv import load_dotenv
 import librosa
@@ -17,12 +20,23 @@ import soundfile as sf
 from dependency import logger, LOG_FOLDER
 import re
 import router
+import auth
 import datetime
 import time
 from language import language_codes, source_languages
 from typing import Tuple,List
 import tempfile
+import threading
 from typing import Optional
+import hashlib
+from contextlib import asynccontextmanager, contextmanager, ExitStack
+from concurrent.futures import ThreadPoolExecutor
+import ingestion
+import ai_client
+import ai_scheduler
+import job_monitor
+import served_models
+import work_queue
 
 
 def current_time():
@@ -47,6 +61,17 @@ VALID_VERSE_PATTERN = re.compile(r"^\d+_\d+(?:_\d+)?(?:_default)?$")
 # Load API Token from .env
 API_TOKEN = os.getenv("API_TOKEN", "api_token")
 BASE_URL = os.getenv("BASE_URL", "base ai url")
+# Number of STT jobs submitted to the AI API at the same time by this process, across all chapters
+STT_SUBMIT_CONCURRENCY = int(os.getenv("STT_SUBMIT_CONCURRENCY", "4"))
+_stt_submit_slots = threading.BoundedSemaphore(STT_SUBMIT_CONCURRENCY)
+# Number of verse files sent in one STT batch job
+STT_BATCH_SIZE = int(os.getenv("STT_BATCH_SIZE", "10"))
+# Read timeout in seconds for STT submissions, which upload the audio
+STT_SUBMIT_TIMEOUT_SECONDS = int(os.getenv("STT_SUBMIT_TIMEOUT_SECONDS", "300"))
+# Seconds a client is asked to wait before retrying a preflight the AI scheduler refused
+PREFLIGHT_RETRY_AFTER_SECONDS = 30
+# Script language of each spoken language, e.g. "Adavi (Kadu) Kuruba" -> "Kannada"
+SCRIPT_LANGUAGES = {entry["language_name"]: entry["script_language"] for entry in source_languages}
 
 
 # Directory for extracted files
@@ -62,6 +87,35 @@ def get_user(db: Session, user_id: int):
     return user
 
 
+def create_user(db: Session, username: str, email: str, password: str) -> User:
+    """
+    Create a user after checking that the username and email are not taken.
+    """
+    # Check if the username already exists
+    existing_user = db.query(User).filter(User.username == username).first()
+    if existing_user:
+        logger.warning(f"Signup failed: Username '{username}' already exists")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Username '{username}' already exists. Please choose a different username.",
+        )
+    # Check if the email already exists
+    existing_email = db.query(User).filter(User.email == email).first()
+    if existing_email:
+        logger.warning(f"Signup failed: Email '{email}' already exists")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Email '{email}' already exists. Please use a different email.",
+        )
+    # Hash the password and create the user
+    hashed_password = auth.get_password_hash(password)
+    new_user = User(username=username, email=email, hashed_password=hashed_password)
+    db.add(new_user)
+    db.commit()
+    db.refresh(new_user)
+    return new_user
+
+
 def get_project(project_id: int, db: Session, current_user: User):
     """
     Retrieve a project by ID and ensure the user has access to it.
@@ -124,27 +178,139 @@ def get_script_lang(db: Session, project_id: int, current_user: User):
 
 MAX_AUDIO_FILE_SIZE_MB = 1  # limit to 1 MB per file
 AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a"}
+# Limit for a whole uploaded ZIP, checked against Content-Length and while streaming
+MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "2048"))
+MAX_UPLOAD_SIZE_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Read uploads in chunks of 1MB
+
+
+def upload_too_large(content_length: Optional[str]) -> bool:
+    """
+    Check the declared Content-Length of a request against the upload limit.
+    """
+    return bool(content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE_BYTES)
 
-async def process_uploaded_zip(file: UploadFile) -> Path:
+
+async def save_upload_to_disk(file: UploadFile, destination: Path) -> str:
+    """
+    Stream an uploaded file to disk chunk by chunk, so memory use stays constant
+    regardless of the archive size. Rejects the upload as soon as it exceeds
+    MAX_UPLOAD_SIZE_MB.
+
+    Returns:
+        str: SHA-256 checksum of the uploaded content.
     """
-    Validate, save, and extract a ZIP file to a temporary directory.
+    checksum = hashlib.sha256()
+    total_bytes = 0
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(destination, "wb") as buffer:
+
+            def write_chunk(chunk: bytes):
+                checksum.update(chunk)
+                buffer.write(chunk)
+
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                total_bytes += len(chunk)
+                if total_bytes > MAX_UPLOAD_SIZE_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Uploaded file exceeds the {MAX_UPLOAD_SIZE_MB} MB limit",
+                    )
+                # Hashing and disk writes block, so they run on the threadpool
+                await run_in_threadpool(write_chunk, chunk)
+    except Exception:
+        destination.unlink(missing_ok=True)
+        raise
+    logger.info(f"Saved upload {file.filename} ({total_bytes} bytes, sha256 {checksum.hexdigest()}) to {destination}")
+    return checksum.hexdigest()
+
+
+def create_upload_workspace() -> Path:
+    """
+    Create a unique temporary workspace for a single upload under BASE_DIR/temp,
+    so concurrent uploads never share temporary files.
+    """
+    temp_root = BASE_DIR / "temp"
+    temp_root.mkdir(parents=True, exist_ok=True)
+    workspace = Path(tempfile.mkdtemp(prefix="upload_", dir=temp_root))
+    logger.debug(f"Created upload workspace: {workspace}")
+    return workspace
+
+
+def remove_upload_workspace(workspace: Path):
+    """Remove an upload workspace and everything in it."""
+    shutil.rmtree(workspace, ignore_errors=True)
+    logger.debug(f"Removed upload workspace: {workspace}")
+
+
+@contextmanager
+def upload_workspace():
+    """
+    Upload workspace that is removed when the block exits, including on failure.
+    """
+    workspace = create_upload_workspace()
+    try:
+        yield workspace
+    finally:
+        remove_upload_workspace(workspace)
+
+
+@asynccontextmanager
+async def async_upload_workspace():
+    """
+    `upload_workspace` for async routes: the workspace is created and removed on
+    the threadpool, since removing an extracted upload can take a while.
+    """
+    workspace = await run_in_threadpool(create_upload_workspace)
+    try:
+        yield workspace
+    finally:
+        await run_in_threadpool(remove_upload_workspace, workspace)
+
+
+async def process_uploaded_zip(file: UploadFile, workspace: Path) -> Path:
+    """
+    Validate and save a project ZIP file into the given upload workspace.
     Also ensures no individual file exceeds 1MB.
+
+    Returns:
+        Path: Path of the saved ZIP file. Nothing is extracted here; the project
+        is planned from the ZIP central directory by `plan_project_zip`.
     """
     # Validate ZIP file format
     if not file.filename.endswith(".zip"):
         raise HTTPException(status_code=400, detail="Uploaded file is not a ZIP file")
-    # Save ZIP file to a temporary location
-    temp_zip_path = BASE_DIR / "temp" / file.filename.replace(" ", "_")
-    temp_zip_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(temp_zip_path, "wb") as buffer:
-        buffer.write(await file.read())
-    # Extract the ZIP file
-    temp_extract_path = BASE_DIR / "temp" / "extracted"
-    temp_extract_path.mkdir(parents=True, exist_ok=True)
-    
+    # Save ZIP file inside the workspace
+    temp_zip_path = workspace / "upload.zip"
+    await save_upload_to_disk(file, temp_zip_path)
+    await run_in_threadpool(validate_project_zip, temp_zip_path)
+    return temp_zip_path
+
+
+def validate_project_zip(zip_path: Path):
+    """
+    Reject a saved project ZIP holding audio files over MAX_AUDIO_FILE_SIZE_MB, removing the ZIP.
+    """
+    invalid_audio_files = find_oversized_audio_files(zip_path)
+    if invalid_audio_files:
+        os.remove(zip_path)
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "message": f"Some audio files exceed the {MAX_AUDIO_FILE_SIZE_MB} MB limit",
+                "invalid_files": invalid_audio_files,
+            },
+        )
+
+
+def find_oversized_audio_files(zip_path: Path) -> List[str]:
+    """
+    List the audio files in a ZIP whose uncompressed size exceeds MAX_AUDIO_FILE_SIZE_MB,
+    read from the central directory without extracting anything.
+    """
     invalid_audio_files = []
-    
-    with zipfile.ZipFile(temp_zip_path, "r") as zip_ref:
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
         for zip_info in zip_ref.infolist():
             if zip_info.is_dir():
                 continue
@@ -157,34 +323,29 @@ async def process_uploaded_zip(file: UploadFile) -> Path:
                     invalid_audio_files.append(
                         f"{zip_info.filename} ({size_mb:.2f} MB)"
                     )
-
-        if invalid_audio_files:
-            os.remove(temp_zip_path)
-            raise HTTPException(
-                status_code=400,
-                detail={
-                    "message": f"Some audio files exceed the {MAX_AUDIO_FILE_SIZE_MB} MB limit",
-                    "invalid_files": invalid_audio_files,
-                },
-            )
-        # Extract only if validation passed
-        zip_ref.extractall(temp_extract_path)
-    # Remove ZIP file after extraction
-    os.remove(temp_zip_path)
-    return temp_extract_path
+    return invalid_audio_files
 
 
+def zip_member_parts(filename: str) -> Tuple[str, ...]:
+    """
+    Split a ZIP member name into path components, dropping empty, '.' and '..'
+    parts so that members can never be written outside the target folder.
+    """
+    return tuple(part for part in filename.replace("\\", "/").split("/") if part not in ("", ".", ".."))
 
 
-def read_metadata(temp_extract_path: Path) -> dict:
-    """Find and read metadata.json."""
-    metadata_path = next(temp_extract_path.rglob("metadata.json"), None)
-    if not metadata_path:
+def read_metadata(zip_ref: zipfile.ZipFile) -> dict:
+    """Find and read metadata.json from the ZIP archive (the shallowest one wins)."""
+    metadata_members = [
+        zip_info for zip_info in zip_ref.infolist()
+        if not zip_info.is_dir() and zip_member_parts(zip_info.filename)[-1:] == ("metadata.json",)
+    ]
+    if not metadata_members:
         raise HTTPException(
             status_code=400, detail="Please upload Scribe's - Scripture Burrito validated zip file"
         )
-
-    with open(metadata_path, "r", encoding="utf-8") as metadata_file:
+    metadata_info = min(metadata_members, key=lambda zip_info: len(zip_member_parts(zip_info.filename)))
+    with zip_ref.open(metadata_info) as metadata_file:
         return json.load(metadata_file)
 
 
@@ -228,12 +389,6 @@ def create_project_folders(project: Project, metadata_content: dict) -> Tuple[Pa
     return input_path, output_path
 
 
-def move_extracted_files(temp_extract_path: Path, input_path: Path):
-    """Move extracted files to the input folder."""
-    for item in temp_extract_path.iterdir():
-        shutil.move(str(item), str(input_path))
-    shutil.rmtree(temp_extract_path)
-
 def load_metadata():
     METADATA_FILE = "metadatainfo.json"
     try:
@@ -481,338 +636,638 @@ def get_verse_statuses(db: Session, chapter_id: int):
     ]
 
 
-def normalize_project_structure(input_path):
+def verse_file_priority(verse_filename: str, chapter_number: int) -> Optional[Tuple[int, int]]:
     """
-    Normalize the project directory structure within input_path.
+    Parse a verse file name (without extension) that already matches VALID_VERSE_PATTERN.
+
+    Returns:
+        Tuple[int, int]: (verse_number, priority), or None if the file does not belong
+        to the chapter. Priority is 2 for `1_1`, 1 for `1_1_1_default` and 0 for takes like `1_1_1`.
     """
-    extracted_items = list(input_path.iterdir())
-    if len(extracted_items) == 1 and extracted_items[0].is_dir():
-        project_input_path = extracted_items[0]
-        next_folder = extracted_items[0]
-        
-        if next_folder.name == input_path.name:
-            logger.info(f"Duplicate folder detected: {next_folder}")
-            for sub_item in next_folder.iterdir():
-                target_path = input_path / sub_item.name
-                if target_path.exists():
-                    logger.warning(f"Conflict while moving {sub_item} to {target_path}, skipping.")
-                else:
-                    shutil.move(str(sub_item), str(target_path))
-            next_folder.rmdir()
-            logger.info(f"Resolved duplicate folder: {next_folder}")
-            project_input_path = input_path
+    parts = verse_filename.split("_")
+    # Ensure first part matches chapter number
+    if not (parts[0].isdigit() and int(parts[0]) == chapter_number):
+        return None
+    # Extract verse number
+    if len(parts) < 2 or not parts[1].isdigit():
+        return None
+    # Determine file priority
+    if len(parts) == 2:  # Basic format like 1_1.mp3
+        priority = 2
+    elif "default" in parts:  # Contains 'default'
+        priority = 1
+    else:  # Any other format (takes)
+        priority = 0
+    return int(parts[1]), priority
+
+
+def select_verse_files(candidates, chapter_number: int):
+    """
+    Pick one file per verse from (file_name, item) candidates, keeping the highest
+    priority file and the first one seen among equal priorities.
+
+    Returns:
+        Tuple[dict, list, list]: ({verse_number: {'file': item, 'priority': int}},
+        incompatible verse names, items that lost to a better file).
+    """
+    verse_files = {}
+    incompartible_verses = []
+    discarded = []
+    for file_name, item in candidates:
+        verse_filename = Path(file_name).stem
+        if not VALID_VERSE_PATTERN.match(verse_filename):
+            logger.info(f"Skipping invalid verse file: {file_name}")
+            incompartible_verses.append(verse_filename)
+            continue
+        parsed = verse_file_priority(verse_filename, chapter_number)
+        if not parsed:
+            continue
+        verse_number, priority = parsed
+        if verse_number not in verse_files:
+            verse_files[verse_number] = {'file': item, 'priority': priority}
+        elif priority > verse_files[verse_number]['priority']:
+            discarded.append(verse_files[verse_number]['file'])
+            verse_files[verse_number] = {'file': item, 'priority': priority}
         else:
-            logger.info("No duplicate folder found.")
-            if re.match(r".+\(\d+\)$", project_input_path.name) or any(char.isalpha() for char in project_input_path.name):
-                logger.info(f"Flattening top-level count folder: {project_input_path}")
-                for sub_item in project_input_path.iterdir():
-                    target_path = input_path / sub_item.name
-                    if target_path.exists():
-                        logger.warning(f"Conflict while moving {sub_item} to {target_path}, skipping.")
-                    else:
-                        shutil.move(str(sub_item), str(target_path))
-                        logger.info(f"Moved {sub_item} to {target_path}")
-                project_input_path.rmdir()
-                logger.info(f"Removed count folder: {project_input_path}")
-                project_input_path = input_path  
-    
-    elif any((input_path / item).exists() for item in ["audio", "text-1", "metadata.json"]):
-        project_input_path = input_path
-    else:
-        logger.error("Unexpected folder structure in the input path.")
-        raise HTTPException(status_code=400, detail="Please upload Scribe's - Scripture Burrito validated zip file")
-    
-    if not project_input_path or not project_input_path.is_dir():
-        logger.error("Project directory not found under input path.")
-        raise HTTPException(status_code=400, detail="Please upload Scribe's - Scripture Burrito validated zip file")
-    
-    return project_input_path
+            discarded.append(item)
+    return verse_files, incompartible_verses, discarded
 
-def locate_versification_and_ingredients(project_input_path):
+
+def find_ingredients_dir(tree: dict, path: Tuple[str, ...] = ()) -> Optional[Tuple[str, ...]]:
     """
-    Locate versification.json and the ingredients folder.
+    Locate the `ingredients` folder in a directory tree built from ZIP member names,
+    checking audio/ingredients, text/ingredients and ingredients at each level, top-down.
     """
-    versification_path= "versification.json"
-    if not versification_path:
-        logger.error("versification.json not found .")
-        raise HTTPException(status_code=400, detail="Please upload Scribe's - Scripture Burrito validated zip file")
-    # Read versification.json
-    with open(versification_path, "r", encoding="utf-8") as versification_file:
-        versification_data = json.load(versification_file)
-    max_verses = versification_data.get("maxVerses", {})
-    # Dynamically locate the `ingredients` folder
-    ingredients_path = None
-    for root, dirs, files in os.walk(project_input_path):
-        if "audio" in dirs and "ingredients" in os.listdir(os.path.join(root, "audio")):
-            ingredients_path = Path(root) / "audio" / "ingredients"
-            break
-        elif "text" in dirs and "ingredients" in os.listdir(os.path.join(root, "text")):
-            ingredients_path = Path(root) / "text" / "ingredients"
-            break
-        elif "ingredients" in dirs:
-            ingredients_path = Path(root) / "ingredients"
-            break
-    if not ingredients_path:
+    dirs = [name for name, child in tree.items() if isinstance(child, dict)]
+    if "audio" in dirs and "ingredients" in tree["audio"]:
+        return path + ("audio", "ingredients")
+    if "text" in dirs and "ingredients" in tree["text"]:
+        return path + ("text", "ingredients")
+    if "ingredients" in dirs:
+        return path + ("ingredients",)
+    for name in sorted(dirs):
+        found = find_ingredients_dir(tree[name], path + (name,))
+        if found:
+            return found
+    return None
+
+
+def plan_project_zip(zip_ref: zipfile.ZipFile, metadata_content: dict) -> dict:
+    """
+    Plan project ingestion from the ZIP central directory, without extracting anything.
+
+    Applies the folder normalization, ingredients lookup, verse priority rules and
+    versification limits to member names only, so that only the selected verse
+    files ever need to be written.
+
+    Returns:
+        dict: {
+            "files": [(ZipInfo, relative parts)] written as-is (metadata, text, etc.),
+            "books": {book: {chapter: {"verses": {verse: (ZipInfo, relative parts)},
+                                       "missing_verses": list | None}}},
+            "incompartible_verses": list,
+        }
+        Relative parts are relative to the project input folder.
+    """
+    invalid_structure = HTTPException(status_code=400, detail="Please upload Scribe's - Scripture Burrito validated zip file")
+    base_name = metadata_content.get("identification", {}).get("name", {}).get("en", "Unknown Project")
+    members = [
+        (zip_info, zip_member_parts(zip_info.filename))
+        for zip_info in zip_ref.infolist()
+    ]
+    members = [(zip_info, parts) for zip_info, parts in members if parts]
+
+    # Normalize the top-level structure: flatten a single wrapping project folder
+    top_level = {parts[0] for _, parts in members}
+    top_dirs = {parts[0] for zip_info, parts in members if len(parts) > 1 or zip_info.is_dir()}
+    strip = 0
+    project_root = ()
+    if len(top_level) == 1 and top_level <= top_dirs:
+        folder = next(iter(top_level))
+        if folder == base_name or re.match(r".+\(\d+\)$", folder) or any(char.isalpha() for char in folder):
+            logger.info(f"Flattening top-level folder: {folder}")
+            strip = 1
+        else:
+            project_root = (folder,)
+    elif not top_level & {"audio", "text-1", "metadata.json"}:
+        logger.error("Unexpected folder structure in the uploaded ZIP file.")
+        raise invalid_structure
+
+    # Build a directory tree of the normalized member names
+    tree = {}
+    normalized = []
+    for zip_info, parts in members:
+        relative = parts[strip:]
+        if not relative:
+            continue
+        node = tree
+        for part in (relative if zip_info.is_dir() else relative[:-1]):
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+        if not zip_info.is_dir():
+            node.setdefault(relative[-1], None)
+            normalized.append((zip_info, relative))
+
+    root_tree = tree
+    for part in project_root:
+        root_tree = root_tree.get(part) or {}
+    ingredients = find_ingredients_dir(root_tree, project_root)
+    if not ingredients:
         logger.error("Ingredients folder not found. Checked all possible locations.")
-        raise HTTPException(status_code=400, detail="Please upload Scribe's - Scripture Burrito validated zip file")
-    logger.info(f"Ingredients folder found at: {ingredients_path}")
-    return max_verses, ingredients_path
+        raise invalid_structure
+    logger.info(f"Ingredients folder found at: {'/'.join(ingredients)}")
+
+    # Split members into chapter audio candidates and files copied as-is
+    max_verses = load_versification().get("maxVerses", {})
+    depth = len(ingredients)
+    files = []
+    chapter_members = {}  # {book: {chapter_dir: [(ZipInfo, relative parts)]}}
+    for zip_info, relative in normalized:
+        if (
+            len(relative) > depth + 2
+            and relative[:depth] == ingredients
+            and relative[depth + 1].isdigit()
+        ):
+            book_members = chapter_members.setdefault(relative[depth], {})
+            book_members.setdefault(relative[depth + 1], []).append((zip_info, relative))
+        else:
+            files.append((zip_info, relative))
 
+    books = {}
+    incompartible_verses = []
+    for book_name, chapters in chapter_members.items():
+        # A book is only ingested if some chapter has a verse-like file name
+        has_valid_chapters = any(
+            len(relative) == depth + 3
+            and "_" in Path(relative[-1]).stem
+            and re.match(r"^(\d+)", Path(relative[-1]).stem.split("_")[1])
+            for chapter_files in chapters.values()
+            for _, relative in chapter_files
+        )
+        if not has_valid_chapters:
+            logger.info(f"Skipping book '{book_name}' as it has no valid chapters.")
+            continue
 
+        book_max_verses = max_verses.get(book_name, [])
+        book_plan = books.setdefault(book_name, {})
+        for chapter_dir_name, chapter_files in chapters.items():
+            chapter_number = int(chapter_dir_name)
+            chapter_max_verses = int(book_max_verses[chapter_number - 1]) if chapter_number <= len(book_max_verses) else 0
+            # Only direct children of the chapter folder are verse files
+            candidates = [
+                (relative[-1], (zip_info, relative))
+                for zip_info, relative in chapter_files
+                if len(relative) == depth + 3
+            ]
+            verse_files, incompatible, _ = select_verse_files(candidates, chapter_number)
+            incompartible_verses.extend(incompatible)
+            if not verse_files:
+                logger.info(f"Empty chapter detected: {book_name} {chapter_dir_name}, skipping it.")
+                continue
+            selected_files = {verse: data['file'] for verse, data in verse_files.items()}
+            # Determine missing verses
+            expected_verses = set(range(1, chapter_max_verses + 1))
+            missing_verses = list(expected_verses - set(selected_files.keys()))
+            book_plan[chapter_number] = {
+                "verses": selected_files,
+                "missing_verses": missing_verses if missing_verses else None,
+            }
 
-def process_books_and_verses(ingredients_path, max_verses, db, project):
+    if not books:
+        logger.error("No valid books or chapters found in the uploaded project.")
+        raise HTTPException(status_code=400, detail="No valid books or chapters found in the project")
+
+    return {"files": files, "books": books, "incompartible_verses": incompartible_verses}
+
+
+def copy_with_digest(source, destination) -> str:
     """
-    Process books, chapters, and verses from the ingredients folder and populate the database.
+    Copy a file object to another in UPLOAD_CHUNK_SIZE chunks, hashing the bytes on the way.
+
+    Returns:
+        str: SHA-256 hex digest of the copied content.
     """
-    incompartible_verses = []
-    has_valid_books = False
-    
-    for book_dir in ingredients_path.iterdir():
-            if book_dir.is_dir():
-                book_name = book_dir.name
-                book_max_verses = max_verses.get(book_name, [])
-                
-                # Check if the book has any chapters with valid verses
-                has_valid_chapters = False
-                for chapter_dir in book_dir.iterdir():
-                    if chapter_dir.is_dir() and chapter_dir.name.isdigit():
-                        chapter_number = int(chapter_dir.name)
-                        chapter_max_verses = int(book_max_verses[chapter_number - 1]) if chapter_number <= len(book_max_verses) else 0
-                        # Get all available verses in the chapter
-                        available_verses = set(
-                            int(verse_digits.group(1))
-                            for verse_file in chapter_dir.iterdir()
-                            if verse_file.is_file() and "_" in verse_file.stem
-                            for verse_digits in [re.match(r"^(\d+)", verse_file.stem.split("_")[1])]
-                            if verse_digits
-                        )
-                        if available_verses:
-                            has_valid_chapters = True
-                            break
-                # No need to check further chapters if one valid chapter is found
-                if not has_valid_chapters:
-                    logger.info(f"Skipping book '{book_name}' as it has no valid chapters.")
-                    continue# Skip this book if no valid chapters are found
- 
-                # If at least one book with valid chapters is found, mark the project as valid
-                has_valid_books = True
-                
-                # Create a book entry in the database
-                book_entry = Book(
-                    project_id=project.project_id,
-                    book=book_name,
-                    # approved=False,
-                )
-                db.add(book_entry)
-                db.commit()
-                db.refresh(book_entry)
-                
-                for chapter_dir in book_dir.iterdir():
-                    if chapter_dir.is_dir() and chapter_dir.name.isdigit():
-                        chapter_number = int(chapter_dir.name)
-                        chapter_max_verses = int(book_max_verses[chapter_number - 1]) if chapter_number <= len(book_max_verses) else 0
-                        
-                        verse_files = {}
-                        for verse_file in chapter_dir.iterdir():
-                            if not verse_file.is_file():
-                                continue  # Skip directories
-
-                            # Extract filename without extension
-                            verse_filename = verse_file.stem
-                            # Skip files that do not match valid verse patterns
-                            if not VALID_VERSE_PATTERN.match(verse_filename):
-                                logger.info(f"Skipping invalid verse file: {verse_file.name}")
-                                print("Skipping invalid verse file:", verse_file.name)
-                                incompartible_verses.append(verse_filename)
-                                continue
-
-                            try:
-                                # Extract chapter and verse numbers
-                                parts = verse_filename.split("_")
-
-                                # Ensure first part matches chapter number
-                                if not (parts[0].isdigit() and int(parts[0]) == chapter_number):
-                                    continue
-
-                                # Extract verse number
-                                if len(parts) >= 2 and parts[1].isdigit():
-                                    verse_number = int(parts[1])
-                                else:
-                                    logger.warning(f"Skipping malformed verse file: {verse_file.name}")
-                                    continue
-
-                                # Determine file priority
-                                if len(parts) == 2:  # Format: 1_1 (basic format)
-                                    priority = 2
-                                elif "default" in parts:  # Format: 1_1_1_default
-                                    priority = 1
-                                else:  # Format: 1_1_1 (takes format)
-                                    priority = 0
-
-                                # Store the best file for each verse based on priority
-                                if verse_number not in verse_files:
-                                    verse_files[verse_number] = {'file': verse_file, 'priority': priority}
-                                elif priority > verse_files[verse_number]['priority']:
-                                    logger.info(f"Removing lower priority verse file: {verse_files[verse_number]['file']}")
-                                    os.remove(verse_files[verse_number]['file'])
-                                    verse_files[verse_number] = {'file': verse_file, 'priority': priority}
-                                else:
-                                    logger.info(f"Removing duplicate verse file: {verse_file}")
-                                    os.remove(verse_file)
+    checksum = hashlib.sha256()
+    while chunk := source.read(UPLOAD_CHUNK_SIZE):
+        checksum.update(chunk)
+        destination.write(chunk)
+    return checksum.hexdigest()
+
+
+def file_digest(path) -> str:
+    """
+    SHA-256 hex digest of a file on disk, read in UPLOAD_CHUNK_SIZE chunks.
+    """
+    checksum = hashlib.sha256()
+    with open(path, "rb") as source:
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            checksum.update(chunk)
+    return checksum.hexdigest()
 
-                            except Exception as e:
-                                logger.warning(f"Error processing verse file {verse_file.name}: {str(e)}")
-                                continue  # Skip invalid files
 
-                        # Finalize verse files after prioritization
-                        selected_files = {verse: data['file'] for verse, data in verse_files.items()}
+# Content-addressed store of uploaded files: one blob per SHA-256 digest, shared by
+# hardlinks from every project tree that holds the same content
+BLOB_STORE_DIR = Path(os.getenv("BLOB_STORE_DIR", str(BASE_DIR / "blobs")))
+# Blobs whose links changed this recently are never pruned: an upload may be about
+# to link a project file to a blob that has none yet, or just had its last one replaced
+BLOB_PRUNE_GRACE_SECONDS = 3600
 
-                        # Get available verses after duplicate removal
-                        available_verses = set(selected_files.keys())
 
-                        # Skip empty chapter if no valid verse files found
-                        if not available_verses:
-                            logger.info(f"Empty chapter detected: {chapter_dir}, deleting it.")
-                            shutil.rmtree(chapter_dir)
-                            continue
- 
-                        # Determine missing verses
-                        expected_verses = set(range(1, chapter_max_verses + 1))
-                        missing_verses = list(expected_verses - available_verses)
-                        # Create a chapter entry in the database
-                        chapter_entry = Chapter(
-                            book_id=book_entry.book_id,
-                            chapter=chapter_number,
-                            approved=False,
-                            missing_verses=missing_verses if missing_verses else None,
-                        )
-                        db.add(chapter_entry)
-                        db.commit()
-                        db.refresh(chapter_entry)
-                        # Add verse records
-                        for verse_number, verse_file in selected_files.items():
-
-                            verse = Verse(
-                                chapter_id=chapter_entry.chapter_id,
-                                verse=verse_number,
-                                name=verse_file.name,
-                                path=str(verse_file),
-                                size=verse_file.stat().st_size,
-                                format=verse_file.suffix.lstrip("."),
-                                stt=False,
-                                text="",
-                                modified=False,
-                                tts=False,
-                                tts_path="",
-                                stt_msg="",
-                                tts_msg="",
-                            )
-                            db.add(verse)
+def blob_path(digest: str) -> Path:
+    """Location of the blob for a digest, fanned out by its first two characters."""
+    return BLOB_STORE_DIR / digest[:2] / digest
+
+
+def link_or_copy(source: Path, target: Path):
+    """
+    Put a hardlink of source at target, replacing target atomically. Falls back to a
+    copy when a hardlink is not possible, e.g. across filesystems.
+    """
+    temp_target = target.with_name(f".{target.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        os.link(source, temp_target)
+    except OSError:
+        shutil.copy2(source, temp_target)
+    os.replace(temp_target, target)
+
+
+def store_blob(path: Path, digest: Optional[str]):
+    """
+    Deduplicate a file through the blob store. The first file with a given digest
+    becomes the blob; later ones are replaced by a hardlink to it, so duplicate
+    uploads take no extra disk. Files without a digest are left as they are.
+    """
+    if not digest:
+        return
+    blob = blob_path(digest)
+    try:
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(path, blob)
+        except FileExistsError:
+            link_or_copy(blob, path)
+    except OSError as e:
+        logger.warning(f"Could not add {path} to the blob store: {e}")
+
+
+def prune_blob_store():
+    """
+    Remove blobs no project file links to any more (link count of one). Blobs
+    whose link count changed within BLOB_PRUNE_GRACE_SECONDS are kept, so the
+    prune can run while uploads are linking files to them.
+    """
+    if not BLOB_STORE_DIR.exists():
+        return
+    removed = 0
+    cutoff = time.time() - BLOB_PRUNE_GRACE_SECONDS
+    for fan_out in os.scandir(BLOB_STORE_DIR):
+        if not fan_out.is_dir():
+            continue
+        for entry in os.scandir(fan_out.path):
+            try:
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+                # A link being added or removed updates the inode's change time
+                if stat.st_nlink == 1 and stat.st_ctime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError as e:
+                logger.warning(f"Could not prune blob {entry.path}: {e}")
+    logger.info(f"Pruned {removed} unreferenced blobs from {BLOB_STORE_DIR}")
+
+
+def extract_member(zip_ref: zipfile.ZipFile, zip_info: zipfile.ZipInfo, target_path: Path) -> str:
+    """
+    Stream one ZIP member to target_path and return the SHA-256 digest of its content.
+    """
+    target_path.parent.mkdir(parents=True, exist_ok=True)
+    with zip_ref.open(zip_info) as source, open(target_path, "wb") as destination:
+        return copy_with_digest(source, destination)
+
+
+def extract_planned_files(zip_ref: zipfile.ZipFile, plan: dict, input_path: Path, progress=None) -> dict:
+    """
+    Write planned ZIP members straight to their final location under input_path.
+    Lower-priority takes, duplicates and invalid verse files are never written.
+    Each member is hashed while it is streamed and then deduplicated through the blob store.
+
+    Args:
+        progress: Optional callable receiving the number of files written so far.
+
+    Returns:
+        dict: {relative path parts: SHA-256 digest} of the written files.
+    """
+    planned_members = list(plan["files"])
+    for chapters in plan["books"].values():
+        for chapter_plan in chapters.values():
+            planned_members.extend(chapter_plan["verses"].values())
+
+    digests = {}
+    for files_written, (zip_info, relative) in enumerate(planned_members, start=1):
+        target_path = input_path.joinpath(*relative)
+        digests[relative] = extract_member(zip_ref, zip_info, target_path)
+        store_blob(target_path, digests[relative])
+        if progress:
+            progress(files_written)
+    logger.info(f"Extracted {len(planned_members)} planned files to {input_path}")
+    return digests
 
+
+BULK_INSERT_BATCH_SIZE = 1000  # rows per multi-row INSERT statement
+
+
+def bulk_insert(db: Session, model, rows: list, returning: tuple = None) -> list:
+    """
+    Insert rows with multi-row INSERT statements of up to BULK_INSERT_BATCH_SIZE rows.
+    Does not commit, so callers can keep a whole upload in one transaction.
+
+    Returns:
+        list: The RETURNING rows when `returning` columns are given.
+    """
+    returned_rows = []
+    for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+        statement = insert(model).values(rows[start:start + BULK_INSERT_BATCH_SIZE])
+        if returning:
+            returned_rows.extend(db.execute(statement.returning(*returning)).all())
+        else:
+            db.execute(statement)
+    return returned_rows
+
+
+def verse_row(verse_number: int, verse_path: Path, size: int, digest: Optional[str] = None) -> dict:
+    """
+    Build the column values of a new, unprocessed verse for bulk insertion.
+    """
+    return {
+        "verse": verse_number,
+        "name": verse_path.name,
+        "path": str(verse_path),
+        "size": size,
+        "digest": digest,
+        "format": verse_path.suffix.lstrip("."),
+        "stt": False,
+        "text": "",
+        "modified": False,
+        "tts": False,
+        "tts_path": "",
+        "stt_msg": "",
+        "tts_msg": "",
+    }
+
+
+def bulk_insert_chapters(db: Session, chapters: list) -> int:
+    """
+    Insert chapters and their verses set-based, without committing.
+
+    Args:
+        chapters: List of dicts with "book_id", "chapter", "missing_verses" and
+            "verses" (verse rows from `verse_row`).
+
+    Returns:
+        int: Number of verses inserted.
+    """
+    chapter_rows = [
+        {
+            "book_id": chapter["book_id"],
+            "chapter": chapter["chapter"],
+            "approved": False,
+            "missing_verses": chapter["missing_verses"],
+        }
+        for chapter in chapters
+    ]
+    chapter_ids = {
+        (book_id, chapter_number): chapter_id
+        for chapter_id, book_id, chapter_number in bulk_insert(
+            db, Chapter, chapter_rows, returning=(Chapter.chapter_id, Chapter.book_id, Chapter.chapter)
+        )
+    }
+    verse_rows = [
+        dict(row, chapter_id=chapter_ids[(chapter["book_id"], chapter["chapter"])])
+        for chapter in chapters
+        for row in chapter["verses"]
+    ]
+    bulk_insert(db, Verse, verse_rows)
+    return len(verse_rows)
+
+
+def process_books_and_verses(plan: dict, input_path: Path, db, project, digests: dict = None):
+    """
+    Populate the database with the books, chapters, and verses of an ingestion plan,
+    using set-based inserts inside a single transaction.
+
+    Args:
+        digests: Content digests returned by `extract_planned_files`, keyed by relative path parts.
+    """
+    digests = digests or {}
+    book_rows = [{"project_id": project.project_id, "book": book_name} for book_name in plan["books"]]
+    book_ids = {
+        book_name: book_id
+        for book_id, book_name in bulk_insert(db, Book, book_rows, returning=(Book.book_id, Book.book))
+    }
+    chapters = [
+        {
+            "book_id": book_ids[book_name],
+            "chapter": chapter_number,
+            "missing_verses": chapter_plan["missing_verses"],
+            "verses": [
+                verse_row(verse_number, input_path.joinpath(*relative), zip_info.file_size, digests.get(relative))
+                for verse_number, (zip_info, relative) in chapter_plan["verses"].items()
+            ],
+        }
+        for book_name, book_chapters in plan["books"].items()
+        for chapter_number, chapter_plan in book_chapters.items()
+    ]
+    verse_count = bulk_insert_chapters(db, chapters)
     db.commit()
-    print("incompartible_verses after processing:", incompartible_verses)
-        # If no valid books or chapters were found, delete the project and its folder structure
-    if not has_valid_books:
-        logger.error("No valid books or chapters found in the project. Rolling back project creation.")
+    logger.info(f"Inserted {len(book_rows)} books, {len(chapters)} chapters and {verse_count} verses for project {project.project_id}")
 
-        # Delete the project from the database
-        db.delete(project)
-        db.commit()
-        project_base_path = BASE_DIR / str(project.project_id)
-        if project_base_path.exists():
-            shutil.rmtree(project_base_path)
-            logger.info(f"Deleted project folder: {project_base_path}")
-        raise HTTPException(status_code=400, detail="No valid books or chapters found in the project")
-    
+    incompartible_verses = plan["incompartible_verses"]
+    logger.info(f"incompartible_verses after processing: {incompartible_verses}")
+    return {
+        "status": "success",
+        "incompartible_verses": incompartible_verses,
+        "books": len(book_rows),
+        "chapters": len(chapters),
+        "verses": verse_count,
+    }
 
-    return {"status": "success", "incompartible_verses": incompartible_verses}
+
+def plan_totals(plan: dict) -> dict:
+    """
+    Count the books, chapters, verses and files an ingestion plan will write.
+    """
+    chapters = [chapter_plan for book_chapters in plan["books"].values() for chapter_plan in book_chapters.values()]
+    verses = sum(len(chapter_plan["verses"]) for chapter_plan in chapters)
+    return {
+        "books": len(plan["books"]),
+        "chapters": len(chapters),
+        "verses": verses,
+        "files": len(plan["files"]) + verses,
+    }
 
 
-def process_project_files(input_path, output_path, db, project):
+def ingest_project(ingestion_id: str, workspace: Path, zip_path: Path, user_id: int):
     """
-    Process the files in the extracted project directory and populate the database.
+    Ingest an uploaded project ZIP as a background job.
+
+    Runs with its own database session, reports the phase and counts to the
+    ingestion registry, removes a partially created project on failure and
+    removes the upload workspace when done.
+
+    Args:
+        ingestion_id (str): Id returned by `ingestion.create_ingestion`.
+        workspace (Path): Upload workspace owned by this job.
+        zip_path (Path): The persisted upload inside the workspace.
+        user_id (int): Id of the uploading user, who becomes the project owner.
     """
+    db = SessionLocal()
+    project = None
     try:
-        project_input_path = normalize_project_structure(input_path)
-        max_verses, ingredients_path = locate_versification_and_ingredients(project_input_path)
-        return process_books_and_verses(ingredients_path, max_verses, db, project)
-    
+        ingestion.update_ingestion(ingestion_id, status="in_progress", phase="validating")
+        current_user = db.query(User).filter(User.user_id == user_id).first()
+        if not current_user:
+            raise HTTPException(status_code=404, detail="User not found")
+        with zipfile.ZipFile(zip_path, "r") as zip_ref:
+            # Locate metadata.json and plan books, chapters and verses from the ZIP member names
+            metadata_content = read_metadata(zip_ref)
+            plan = plan_project_zip(zip_ref, metadata_content)
+            ingestion.update_ingestion(ingestion_id, totals=plan_totals(plan))
+            # Create the project and its directories
+            project_name = generate_unique_project_name(metadata_content, db)
+            project = create_project_entry(project_name, current_user, db)
+            input_path, output_path = create_project_folders(project, metadata_content)
+            ingestion.update_ingestion(ingestion_id, project_id=project.project_id, phase="extracting")
+            # Write the planned files, hashing them on the way
+            digests = extract_planned_files(
+                zip_ref, plan, input_path,
+                progress=lambda files_written: ingestion.update_ingestion(
+                    ingestion_id, processed={"files": files_written}
+                ),
+            )
+        # Populate books, chapters, verses
+        ingestion.update_ingestion(ingestion_id, phase="inserting")
+        result = process_books_and_verses(plan, input_path, db, project, digests)
+        ingestion.update_ingestion(
+            ingestion_id,
+            processed={"books": result["books"], "chapters": result["chapters"], "verses": result["verses"]},
+        )
+        ingestion.complete_ingestion(ingestion_id, result["incompartible_verses"])
+
+    except zipfile.BadZipFile:
+        db.rollback()
+        remove_failed_project(project, db)
+        ingestion.fail_ingestion(ingestion_id, 400, "The file is not a valid ZIP archive")
     except HTTPException as http_exc:
-        raise http_exc
+        db.rollback()
+        remove_failed_project(project, db)
+        ingestion.fail_ingestion(ingestion_id, http_exc.status_code, http_exc.detail)
     except Exception as e:
-        logger.error(f"Error while processing project files: {str(e)}")
-        raise HTTPException(status_code=400, detail=str(e))
-
+        db.rollback()
+        logger.error(f"Error while ingesting project: {str(e)}")
+        remove_failed_project(project, db)
+        ingestion.fail_ingestion(ingestion_id, 500, str(e))
+    finally:
+        db.close()
+        remove_upload_workspace(workspace)
 
 
+def remove_failed_project(project: Optional[Project], db: Session):
+    """
+    Remove a partially created project: its DB entry and its folder.
+    """
+    if not project:
+        return
+    project_id = project.project_id
+    db.delete(project)
+    db.commit()
+    project_base_path = BASE_DIR / str(project_id)
+    if project_base_path.exists():
+        shutil.rmtree(project_base_path)
 
 
-def process_verse_files(chapter_dir, chapter_number):
-    """
-    Process verse files: validate filenames, determine priority, and remove duplicates.
+def build_book_manifest(book_folder: Path, digests: dict = None):
     """
-    verse_files = {}
-    incompartible_verses = []
+    Scan an extracted book folder in a single os.scandir pass and build an
+    in-memory manifest of its chapters and verse candidates.
 
-    for verse_file in chapter_dir.iterdir():
-        if not verse_file.is_file():
-            continue  # Skip directories
-        
-        verse_filename = verse_file.stem
-        if not VALID_VERSE_PATTERN.match(verse_filename):
-            logger.info(f"Skipping invalid verse file: {verse_file.name}")
-            print("Skipping invalid verse file:", verse_file.name)
-            incompartible_verses.append(verse_filename)
-            continue
-        try:
-            # Split the filename to extract components
-            parts = verse_file.stem.split("_")
-            
-            # Ensure first part matches chapter number
-            if not (parts[0].isdigit() and int(parts[0]) == chapter_number):
-                continue
-                
-            # Extract verse number
-            if len(parts) >= 2 and parts[1].isdigit():
-                verse_number = int(parts[1])
-            else:
-                logger.warning(f"Skipping malformed verse file: {verse_file.name}")
-                continue
-                
-                    
-            # Determine file priority
-            if len(parts) == 2:  # Basic format like 1_1.mp3
-                priority = 2
-            elif "default" in parts:  # Contains 'default'
-                priority = 1
-            else:  # Any other format (takes)
-                priority = 0
-                
-            # Add or replace based on priority
-            if verse_number not in verse_files:
-                # First file for this verse number
-                verse_files[verse_number] = {
-                    'file': verse_file,
-                    'priority': priority
-                }
-            elif priority > verse_files[verse_number]['priority']:
-                # New file has higher priority
-                logger.info(f"Removing lower priority verse file: {verse_files[verse_number]['file']}")
-                os.remove(verse_files[verse_number]['file'])
-                verse_files[verse_number] = {
-                    'file': verse_file,
-                    'priority': priority
-                }
-            else:
-                # Keep existing file, remove the current one
-                logger.info(f"Removing duplicate verse file: {verse_file}")
-                os.remove(verse_file)
+    Directory entries carry their file type, so only the selected verse files
+    are stat'ed for their size.
 
-        except (ValueError, IndexError) as e:
-            logger.warning(f"Invalid file name format: {verse_file.name}. Error: {str(e)}")
-            continue
+    Args:
+        book_folder (Path): Folder holding the numbered chapter folders.
+        digests (dict): Optional SHA-256 digests recorded during extraction, keyed by file path.
+
+    Returns:
+        list: One dict per chapter folder, in scan order:
+            {
+                "chapter": int,
+                "dir_name": str,
+                "verse_numbers": set of verse numbers named by any file in the folder,
+                "verses": {verse_number: {"name": str, "size": int, "digest": str or None}}
+                    after priority selection,
+                "discarded": [str] lower priority or duplicate file names,
+                "incompartible_verses": [str],
+            }
+    """
+    manifest = []
+    digests = digests or {}
+    directories_scanned = 1
+    files_seen = 0
+    stat_calls = 0
+    with os.scandir(book_folder) as book_entries:
+        chapter_entries = [
+            entry for entry in book_entries if entry.is_dir() and entry.name.isdigit()
+        ]
+    for chapter_entry in chapter_entries:
+        chapter_number = int(chapter_entry.name)
+        with os.scandir(chapter_entry.path) as verse_entries:
+            file_entries = [entry for entry in verse_entries if entry.is_file()]
+        directories_scanned += 1
+        files_seen += len(file_entries)
+        # Verse numbers named by any take, used to validate the chapter against the versification
+        verse_numbers = set()
+        for entry in file_entries:
+            stem = Path(entry.name).stem
+            if "_" in stem:
+                verse_digits = re.match(r"^(\d+)", stem.split("_")[1])
+                if verse_digits:
+                    verse_numbers.add(int(verse_digits.group(1)))
+        verse_files, incompartible_verses, discarded = select_verse_files(
+            [(entry.name, entry) for entry in file_entries], chapter_number
+        )
+        verses = {}
+        for verse_number, data in verse_files.items():
+            verses[verse_number] = {
+                "name": data["file"].name,
+                "size": data["file"].stat().st_size,
+                "digest": digests.get(data["file"].path),
+            }
+            stat_calls += 1
+        manifest.append({
+            "chapter": chapter_number,
+            "dir_name": chapter_entry.name,
+            "verse_numbers": verse_numbers,
+            "verses": verses,
+            "discarded": [entry.name for entry in discarded],
+            "incompartible_verses": incompartible_verses,
+        })
+    logger.info(
+        f"Scanned {book_folder}: {directories_scanned} directories, {files_seen} files, {stat_calls} stat calls"
+    )
+    return manifest
 
-    return verse_files, incompartible_verses
+
+def remove_discarded_verse_files(chapter_dir: Path, chapter: dict):
+    """
+    Remove the lower priority and duplicate verse files recorded in a chapter manifest.
+    """
+    for file_name in chapter["discarded"]:
+        verse_file = chapter_dir / file_name
+        logger.info(f"Removing lower priority or duplicate verse file: {verse_file}")
+        os.remove(verse_file)
 
 def setup_project_folders(project, book_entry):
     """
@@ -835,44 +1290,101 @@ def setup_project_folders(project, book_entry):
     return  target_book_path 
 
 
-def add_verses_to_db(target_chapter_path, chapter_entry, db):
+def verse_content_changed(existing_verse: Verse, verse_info: dict, verse_file: Path) -> bool:
     """
-    Add verses to the database from the processed chapter files.
+    Decide whether a re-uploaded verse file differs from the stored audio.
+
+    A size difference is a change without hashing anything. Otherwise the upload's
+    digest is compared with the stored one; verses stored before digests were
+    recorded get theirs computed from the stored file once and saved. Digests
+    already computed by a "digest" file operation are used as they are.
     """
-    for verse_file in target_chapter_path.iterdir():
-        try: 
-            if not verse_file.is_file():
-                continue
-            if not VALID_VERSE_PATTERN.match(verse_file.stem):
-                logger.info(f"Skipping invalid verse file during database insert: {verse_file.name}")
-                continue
-            verse_number = int(verse_file.stem.split("_")[1])     
-            verse = Verse(
-                chapter_id=chapter_entry.chapter_id,
-                verse=verse_number,
-                name=verse_file.name,
-                path=str(verse_file),
-                size=verse_file.stat().st_size,
-                format=verse_file.suffix.lstrip("."),
-                stt=False,
-                text="",
-            )
-            db.add(verse)
-        except (ValueError, IndexError):
-            logger.warning(f"Invalid file: {verse_file.name}")
+    if existing_verse.size != verse_info["size"]:
+        return True
+    new_digest = verse_info["digest"] or file_digest(verse_file)
+    verse_info["digest"] = new_digest
+    if existing_verse.digest is None:
+        stored_digest = verse_info.get("stored_digest")
+        if stored_digest is None:
+            if not os.path.exists(existing_verse.path):
+                return True
+            stored_digest = file_digest(existing_verse.path)
+        existing_verse.digest = stored_digest
+    return existing_verse.digest != new_digest
 
-    db.commit()
+
+CHAPTER_IO_WORKERS = int(os.getenv("CHAPTER_IO_WORKERS", "4"))  # threads for per-chapter file work
 
 
-def process_chapters(book_folder, project, book_entry, db,book_name):
+def run_file_operations(operations: list):
+    """
+    Run the filesystem operations planned for one chapter, in order.
+
+    Args:
+        operations: List of tuples, one of ("remove", path), ("rmtree", path),
+            ("mkdir", path), ("copy", source, target, digest), ("move", source, target),
+            ("store", path, digest) or ("digest", verse_info, verse_file, stored_path).
+            Copies and stored files go through the blob store. A digest operation
+            hashes a re-uploaded verse file into verse_info["digest"] and, when a
+            stored path is given, the stored file into verse_info["stored_digest"].
+    """
+    for operation, *paths in operations:
+        if operation == "remove":
+            logger.info(f"Removing lower priority or duplicate verse file: {paths[0]}")
+            os.remove(paths[0])
+        elif operation == "rmtree":
+            shutil.rmtree(paths[0])
+        elif operation == "mkdir":
+            paths[0].mkdir(parents=True, exist_ok=True)
+        elif operation == "copy":
+            source, target, digest = paths
+            store_blob(source, digest)
+            link_or_copy(source, target)
+        elif operation == "move":
+            source, target = paths
+            shutil.move(str(source), str(target))
+        elif operation == "store":
+            store_blob(*paths)
+        elif operation == "digest":
+            verse_info, verse_file, stored_path = paths
+            if not verse_info["digest"]:
+                verse_info["digest"] = file_digest(verse_file)
+            if stored_path and os.path.exists(stored_path):
+                verse_info["stored_digest"] = file_digest(stored_path)
+
+
+def run_chapter_operations(chapter_operations: list):
+    """
+    Run the file operations of several chapters on a pool of CHAPTER_IO_WORKERS threads.
+    Operations of one chapter keep their order; the first failure is re-raised once all
+    chapters have finished.
+    """
+    with ThreadPoolExecutor(max_workers=CHAPTER_IO_WORKERS, thread_name_prefix="chapter_io") as executor:
+        futures = [
+            executor.submit(run_file_operations, operations)
+            for operations in chapter_operations
+            if operations
+        ]
+    for future in futures:
+        future.result()
+
+
+def process_chapters(book_folder, project, book_entry, db,book_name, digests=None):
     """
     Process chapters: add new chapters and skip existing ones.
+    Re-uploaded verses count as modified only when their content digest changed.
     """
     target_book_path = setup_project_folders(project, book_entry)   
     # Fetch existing chapters
     existing_chapters = {
         chapter.chapter: chapter for chapter in db.query(Chapter).filter(Chapter.book_id == book_entry.book_id)
     }
+    # Fetch the verses of all existing chapters in one query
+    existing_verses_by_chapter = {}
+    if existing_chapters:
+        existing_chapter_ids = [chapter.chapter_id for chapter in existing_chapters.values()]
+        for verse in db.query(Verse).filter(Verse.chapter_id.in_(existing_chapter_ids)):
+            existing_verses_by_chapter.setdefault(verse.chapter_id, {})[verse.verse] = verse
     versification_data = load_versification()
     max_verses_data = versification_data.get("maxVerses", {})
     valid_books = set(max_verses_data.keys())
@@ -892,204 +1404,207 @@ def process_chapters(book_folder, project, book_entry, db,book_name):
     added_verses = []
     modified_verses = []
     modified_chapters = []
+    # Rows collected for set-based inserts at the end
+    new_chapter_rows = []
+    new_verse_rows = []
      
-    for chapter_dir in book_folder.iterdir():
-        if chapter_dir.is_dir() and chapter_dir.name.isdigit():
-            chapter_number = int(chapter_dir.name)
-            # Check if the chapter exceeds the maximum allowed chapters
-            if chapter_number > max_chapters:
-                logger.error(f"Invalid chapter {chapter_number}: Exceeds maximum allowed chapters ({max_chapters})")
-                shutil.rmtree(chapter_dir)  # Remove the invalid chapter folder
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"{book_name} should have {max_chapters} chapter(s) but found chapter {chapter_number}. "
-                    "Please upload the ZIP file with proper chapter count"
-                )          
-            # if chapter_number in existing_chapters:
-            #     logger.info(f"Skipping existing chapter: {chapter_number}")
-            #     skipped_chapters.append(chapter_number)
-            #     continue
-               
-            # Call the separate function to process verses and remove duplicates
-            verse_files, incompatible_verses = process_verse_files(chapter_dir, chapter_number)
-            incompatible_chapters_verses.extend(incompatible_verses)
-            
+    # Filesystem work per chapter, planned here in upload order and run in parallel below
+    chapter_operations = []
+
+    manifest = build_book_manifest(book_folder, digests)
+    # Re-uploaded verses of the same size are compared by digest. Hash the ones
+    # without a digest, and stored verses recorded before digests, per chapter in
+    # parallel, so the comparison below does no file I/O.
+    digest_operations = []
+    for chapter in manifest:
+        chapter_entry = existing_chapters.get(chapter["chapter"])
+        existing_verses = existing_verses_by_chapter.get(chapter_entry.chapter_id, {}) if chapter_entry else {}
+        digest_operations.append([
+            (
+                "digest",
+                verse_info,
+                book_folder / chapter["dir_name"] / verse_info["name"],
+                None if existing_verses[verse_number].digest else existing_verses[verse_number].path,
+            )
+            for verse_number, verse_info in chapter["verses"].items()
+            if verse_number in existing_verses and existing_verses[verse_number].size == verse_info["size"]
+        ])
+    run_chapter_operations(digest_operations)
+
+    for chapter in manifest:
+        chapter_number = chapter["chapter"]
+        chapter_dir = book_folder / chapter["dir_name"]
+        # Check if the chapter exceeds the maximum allowed chapters
+        if chapter_number > max_chapters:
+            logger.error(f"Invalid chapter {chapter_number}: Exceeds maximum allowed chapters ({max_chapters})")
+            shutil.rmtree(chapter_dir)  # Remove the invalid chapter folder
+            raise HTTPException(
+                status_code=400,
+                detail=f"{book_name} should have {max_chapters} chapter(s) but found chapter {chapter_number}. "
+                "Please upload the ZIP file with proper chapter count"
+            )          
+        # if chapter_number in existing_chapters:
+        #     logger.info(f"Skipping existing chapter: {chapter_number}")
+        #     skipped_chapters.append(chapter_number)
+        #     continue
            
-            # Get available verses after duplicate removal
-            available_verses = {verse: data['file'] for verse, data in verse_files.items()}
-                     
-            # If no verses are found, delete the empty chapter folder
-            if not available_verses:
-                logger.info(f"Empty chapter detected: {chapter_dir}, deleting it.")
-                shutil.rmtree(chapter_dir)
-                continue
+        # Remove lower priority and duplicate verse files picked out by the scan
+        operations = [("remove", chapter_dir / file_name) for file_name in chapter["discarded"]]
+        chapter_operations.append(operations)
+        incompatible_chapters_verses.extend(chapter["incompartible_verses"])
+        
+        # Verses selected by the scan: {verse_number: {"name", "size"}}
+        available_verses = chapter["verses"]
                  
-            max_verses_in_chapter = max_verses_per_chapter.get(chapter_number, 0)
+        # If no verses are found, delete the empty chapter folder
+        if not available_verses:
+            logger.info(f"Empty chapter detected: {chapter_dir}, deleting it.")
+            operations.append(("rmtree", chapter_dir))
+            continue
+             
+        max_verses_in_chapter = max_verses_per_chapter.get(chapter_number, 0)
   
-            existing_verse_numbers = set()
+        existing_verse_numbers = set()
+        
+        if chapter_number in existing_chapters:
+            chapter_entry = existing_chapters[chapter_number]
+            existing_verse_numbers = set(existing_verses_by_chapter.get(chapter_entry.chapter_id, {}))
+        
+        combined_verse_numbers = set(available_verses.keys()).union(existing_verse_numbers)
+        
+        # Determine missing verses
+        expected_verses = set(range(1, max_verses_in_chapter + 1))
+        missing_verses = sorted(expected_verses - combined_verse_numbers)
+                  
+        # Check if verses exceed the maximum allowed
+        if available_verses and max(available_verses.keys()) > max_verses_in_chapter:
+            logger.error(
+                f"Invalid chapter {chapter_number}: Exceeds maximum allowed verses or has no valid verses."
+            )
+            shutil.rmtree(chapter_dir)
+            raise HTTPException(
+                status_code=400,
+                detail=f"{book_name}: Chapter {chapter_number} should have {max_verses_in_chapter} verses "
+                f"but {max(available_verses.keys())} verses found. "
+                "Please upload the ZIP file with correct verse count",
+            )
             
-            if chapter_number in existing_chapters:
-                chapter_entry = existing_chapters[chapter_number]
-                existing_verse_numbers = {
-                    verse.verse for verse in db.query(Verse).filter(Verse.chapter_id == chapter_entry.chapter_id)
-                }
+        # Handle existing chapter
+        if chapter_number in existing_chapters:
+            chapter_entry = existing_chapters[chapter_number]
+            chapter_modified = False
             
-            combined_verse_numbers = set(available_verses.keys()).union(existing_verse_numbers)
+            #existing verses for this chapter
+            existing_verses = existing_verses_by_chapter.get(chapter_entry.chapter_id, {})
             
-            # Determine missing verses
-            expected_verses = set(range(1, max_verses_in_chapter + 1))
-            missing_verses = sorted(expected_verses - combined_verse_numbers)
-                      
-            # Check if verses exceed the maximum allowed
-            if available_verses and max(available_verses.keys()) > max_verses_in_chapter:
-                logger.error(
-                    f"Invalid chapter {chapter_number}: Exceeds maximum allowed verses or has no valid verses."
-                )
-                shutil.rmtree(chapter_dir)
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"{book_name}: Chapter {chapter_number} should have {max_verses_in_chapter} verses "
-                    f"but {max(available_verses.keys())} verses found. "
-                    "Please upload the ZIP file with correct verse count",
-                )
-                
-            # Handle existing chapter
-            if chapter_number in existing_chapters:
-                chapter_entry = existing_chapters[chapter_number]
-                chapter_modified = False
-                
-                #fetch existing verses for this chapter
-                existing_verses = {
-                    verse.verse: verse 
-                    for verse in db.query(Verse).filter(Verse.chapter_id == chapter_entry.chapter_id)
-                }
-                
-                chapter_verses_modified = []
-                chapter_verses_added = []
-                skipped_verse_count = 0
-                
-                # Target path for this chapter
-                target_chapter_path = target_book_path / str(chapter_number)
-                if not target_chapter_path.exists():
-                    target_chapter_path.mkdir(parents=True, exist_ok=True)
+            chapter_verses_modified = []
+            chapter_verses_added = []
+            skipped_verse_count = 0
+            
+            # Target path for this chapter
+            target_chapter_path = target_book_path / str(chapter_number)
+            operations.append(("mkdir", target_chapter_path))
+            
+             # Process each verse file
+            for verse_number, verse_info in available_verses.items():
+                verse_file_size = verse_info["size"]
+                verse_file_name = verse_info["name"]
+                verse_file = chapter_dir / verse_file_name
                 
-                 # Process each verse file
-                for verse_number, verse_file in available_verses.items():
-                    verse_file_size = verse_file.stat().st_size
-                    verse_file_name = verse_file.name
+                # Check if verse exists in database
+                if verse_number in existing_verses:
+                    existing_verse = existing_verses[verse_number]
                     
-                    # Check if verse exists in database
-                    if verse_number in existing_verses:
-                        existing_verse = existing_verses[verse_number]
+                    # Compare content digests to detect modifications
+                    if verse_content_changed(existing_verse, verse_info, verse_file):
+                        logger.info(f"Verse {verse_number} in chapter {chapter_number} has been modified")
+                        target_verse_path = target_chapter_path / verse_file_name
+                        # Replace the file in target path
+                        operations.append(("copy", verse_file, target_verse_path, verse_info["digest"]))
                         
-                        # Compare file size to detect modifications
-                        if existing_verse.size != verse_file_size:
-                            logger.info(f"Verse {verse_number} in chapter {chapter_number} has been modified")
-                            target_verse_path = target_chapter_path / verse_file_name
-                            # Update the existing verse record
-                            # existing_verse.size = verse_file_size
-                            # existing_verse.name = verse_file_name
-                            # existing_verse.text = ""
-                            # existing_verse.tts = False
-                            # existing_verse.stt = False
-                            # existing_verse.modified = False
-                            # existing_verse.format = verse_file.suffix.lstrip('.')
-                            # existing_verse.stt_msg = ""
-                            # existing_verse.tts_msg = ""
-                            # existing_verse.tts_path = ""
-                            
-                            # Replace the file in target path
-                            # target_verse_path = target_chapter_path / verse_file_name
-                            if target_verse_path.exists():
-                                os.remove(target_verse_path)
-                            shutil.copy2(str(verse_file), str(target_verse_path))
-                            
-                              # Always update file metadata
-                            existing_verse.size = verse_file_size
-                            existing_verse.name = verse_file_name
-                            existing_verse.path = str(target_verse_path)
-                            existing_verse.format = verse_file.suffix.lstrip(".")
-
-                            if getattr(existing_verse, "modified", False):
-                                # ✅ PRESERVE manual edits/flags: do not touch text, modified, stt/tts flags & messages, tts_path
-                                logger.info(
-                                    f"Preserving manual text/flags for verse {verse_number} (modified=True)."
-                                )
-                            else:
-                                # 🔄 Not manually modified: reset for clean reprocessing
-                                existing_verse.text = ""
-                                existing_verse.stt = False
-                                existing_verse.stt_msg = ""
-                                existing_verse.tts = False
-                                existing_verse.tts_msg = ""
-                                existing_verse.tts_path = ""
-                                existing_verse.modified = False
-
-                            chapter_verses_modified.append(verse_number)
-                            chapter_modified = True
+                          # Always update file metadata
+                        existing_verse.size = verse_file_size
+                        existing_verse.digest = verse_info["digest"]
+                        existing_verse.name = verse_file_name
+                        existing_verse.path = str(target_verse_path)
+                        existing_verse.format = verse_file.suffix.lstrip(".")
+
+                        if getattr(existing_verse, "modified", False):
+                            # ✅ PRESERVE manual edits/flags: do not touch text, modified, stt/tts flags & messages, tts_path
+                            logger.info(
+                                f"Preserving manual text/flags for verse {verse_number} (modified=True)."
+                            )
                         else:
-                            # Audio unchanged
-                            skipped_verse_count += 1
+                            # 🔄 Not manually modified: reset for clean reprocessing
+                            existing_verse.text = ""
+                            existing_verse.stt = False
+                            existing_verse.stt_msg = ""
+                            existing_verse.tts = False
+                            existing_verse.tts_msg = ""
+                            existing_verse.tts_path = ""
+                            existing_verse.modified = False
+
+                        chapter_verses_modified.append(verse_number)
+                        chapter_modified = True
                     else:
-                        # New verse found, create new record
-                        target_verse_path = target_chapter_path / verse_file_name
-                        shutil.copy2(str(verse_file), str(target_verse_path))
-                        
-                        # Create new verse entry
-                        new_verse = Verse(
+                        # Audio unchanged
+                        skipped_verse_count += 1
+                else:
+                    # New verse found, create new record
+                    target_verse_path = target_chapter_path / verse_file_name
+                    operations.append(("copy", verse_file, target_verse_path, verse_info["digest"]))
+                    
+                    # Create new verse entry
+                    new_verse_rows.append(
+                        dict(
+                            verse_row(verse_number, target_verse_path, verse_file_size, verse_info["digest"]),
                             chapter_id=chapter_entry.chapter_id,
-                            verse=verse_number,
-                            name=verse_file_name,
-                            path=str(target_verse_path),
-                            size=verse_file_size,
-                            format=verse_file.suffix.lstrip('.'),
-                            stt=False,
-                            text="",
-                            modified=False
                         )
-                        db.add(new_verse)
-                        
-                        # Add to tracking lists
-                        chapter_verses_added.append(verse_number)
-                        chapter_modified = True
-                        
-                # Add to the main tracking lists
-                if chapter_modified:
-                    modified_chapters.append(chapter_number)
-                    modified_verses.extend([f"{chapter_number}_{v}" for v in chapter_verses_modified])
-                    # Add newly added verses to existing chapters to the added_verses list
-                    added_verses.extend([f"{chapter_number}_{v}" for v in chapter_verses_added])
-                    chapter_entry.approved = False
-                else:
-                    # Only add to skipped if all verses were unchanged
-                    if skipped_verse_count == len(available_verses):
-                        skipped_chapters.append(chapter_number)
-                
-                # Update missing verses if needed
-                if len(missing_verses) > 0:
-                    chapter_entry.missing_verses = missing_verses
-                    db.commit()
-                else:
-                    chapter_entry.missing_verses = None
-                    db.commit()   
+                    )
+                    
+                    # Add to tracking lists
+                    chapter_verses_added.append(verse_number)
+                    chapter_modified = True
+                    
+            # Add to the main tracking lists
+            if chapter_modified:
+                modified_chapters.append(chapter_number)
+                modified_verses.extend([f"{chapter_number}_{v}" for v in chapter_verses_modified])
+                # Add newly added verses to existing chapters to the added_verses list
+                added_verses.extend([f"{chapter_number}_{v}" for v in chapter_verses_added])
+                chapter_entry.approved = False
             else:
-                # This is a new chapter - create it
-                # Move the chapter folder to target path
-                target_chapter_path = target_book_path / chapter_dir.name
-                shutil.move(str(chapter_dir), str(target_chapter_path))
-                logger.info(f"Added new chapter: {chapter_number}")
-                added_chapters.append(chapter_number)
-
-                # Add the chapter and its verses to the database
-                chapter_entry = Chapter(book_id=book_entry.book_id, 
-                                chapter=chapter_number, 
-                                approved=False, 
-                                missing_verses=missing_verses if missing_verses else None
-                            )
-                db.add(chapter_entry)
-                db.commit()
-                db.refresh(chapter_entry)
-                add_verses_to_db(target_chapter_path, chapter_entry, db)
+                # Only add to skipped if all verses were unchanged
+                if skipped_verse_count == len(available_verses):
+                    skipped_chapters.append(chapter_number)
+            
+            # Update missing verses if needed
+            if len(missing_verses) > 0:
+                chapter_entry.missing_verses = missing_verses
+            else:
+                chapter_entry.missing_verses = None
+        else:
+            # This is a new chapter - create it
+            # Move the chapter folder to target path
+            target_chapter_path = target_book_path / chapter_dir.name
+            operations.append(("move", chapter_dir, target_chapter_path))
+            operations.extend(
+                ("store", target_chapter_path / verse_info["name"], verse_info["digest"])
+                for verse_info in available_verses.values()
+            )
+            logger.info(f"Added new chapter: {chapter_number}")
+            added_chapters.append(chapter_number)
+
+            # Queue the chapter and its verses for insertion
+            new_chapter_rows.append({
+                "book_id": book_entry.book_id,
+                "chapter": chapter_number,
+                "missing_verses": missing_verses if missing_verses else None,
+                "verses": [
+                    verse_row(verse_number, target_chapter_path / verse_info["name"], verse_info["size"], verse_info["digest"])
+                    for verse_number, verse_info in available_verses.items()
+                ],
+            })
  
     # If no chapters were added or skipped, raise an error   
     if not added_chapters and not modified_chapters and not skipped_chapters:
@@ -1097,115 +1612,68 @@ def process_chapters(book_folder, project, book_entry, db,book_name):
             status_code=400,
             detail=f"No verse data found. Please upload valid ZIP file",
         ) 
-    db.commit()
+    try:
+        # Chapters touch disjoint folders, so their file work runs in parallel
+        run_chapter_operations(chapter_operations)
+        # Insert new chapters and verses set-based, then commit everything at once
+        bulk_insert_chapters(db, new_chapter_rows)
+        bulk_insert(db, Verse, new_verse_rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     return added_chapters, skipped_chapters, modified_chapters, added_verses, modified_verses, incompatible_chapters_verses 
 
 
 
 
-async def extract_and_validate_zip(file: UploadFile):
+async def extract_and_validate_zip(file: UploadFile, workspace: Path):
+    """
+    Saves the uploaded book ZIP into the upload workspace, then extracts and validates it.
+    Returns:
+        dict: See `extract_saved_book_zip`.
     """
-    Extracts and validates the structure of a ZIP file.
+    temp_zip_path = workspace / "upload.zip"
+    logger.debug(f"Temp ZIP path: {temp_zip_path}")
+    try:
+        # Save the uploaded ZIP file
+        await save_upload_to_disk(file, temp_zip_path)
+        logger.debug(f"Saved uploaded file to {temp_zip_path}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error during ZIP processing: {e}")
+        raise HTTPException(status_code=500, detail="An unexpected error occurred while extracting the ZIP file.")
+
+    # Validation and extraction block, so they run on the threadpool
+    return await run_in_threadpool(extract_saved_book_zip, workspace)
+
+
+def extract_saved_book_zip(workspace: Path):
+    """
+    Extracts and validates the structure of the book ZIP saved as upload.zip in the workspace.
     Checks audio files for 1MB size limit.
     Returns:
         dict: {
             "temp_extract_path": Path,
-            "book_folder": Path
+            "book_folder": Path,
+            "digests": {extracted file path: SHA-256 digest}
         }
     """
-    temp_zip_path = BASE_DIR / "temp" / file.filename.replace(" ", "_")
-    temp_extract_path = BASE_DIR / "temp" / "extracted_book"
-    logger.debug(f"Temp ZIP path: {temp_zip_path}")
+    temp_zip_path = workspace / "upload.zip"
+    temp_extract_path = workspace / "extracted_book"
     logger.debug(f"Temp extract path: {temp_extract_path}")
     try:
         # Create temporary directories
-        temp_zip_path.parent.mkdir(parents=True, exist_ok=True)
         temp_extract_path.mkdir(parents=True, exist_ok=True)
         logger.debug("Temporary directories created.")
 
-        # Save the uploaded ZIP file
-        with open(temp_zip_path, "wb") as buffer:
-            buffer.write(await file.read())
-            logger.debug(f"Saved uploaded file to {temp_zip_path}")
-
-        invalid_audio_files = []
-
-        # Extract the ZIP file
-        with zipfile.ZipFile(temp_zip_path, "r") as zip_ref:
-            for zip_info in zip_ref.infolist():
-                if zip_info.is_dir():
-                    continue
-                ext = Path(zip_info.filename).suffix.lower()
-                if ext in AUDIO_EXTENSIONS:
-                    size_mb = zip_info.file_size / (1024 * 1024)
-                    if size_mb > MAX_AUDIO_FILE_SIZE_MB:
-                        invalid_audio_files.append(
-                            f"{zip_info.filename} ({size_mb:.2f} MB)"
-                        )
-
-            if invalid_audio_files:
-                temp_zip_path.unlink(missing_ok=True)
-                shutil.rmtree(temp_extract_path, ignore_errors=True)
-                raise HTTPException(
-                    status_code=400,
-                    detail={
-                    "message": f"Book Upload Failed: Some audio files exceed the {MAX_AUDIO_FILE_SIZE_MB} MB limit",
-                    "invalid_files": invalid_audio_files,
-                    },
-                )
-            logger.debug(f"ZIP file content: {zip_ref.namelist()}")
-            # Extract after validation passes
-            zip_ref.extractall(temp_extract_path)
-            logger.debug(f"ZIP file extracted to {temp_extract_path}")
-
-        # Remove the ZIP file after extraction
-        temp_zip_path.unlink()
-        logger.debug(f"Deleted temporary ZIP file: {temp_zip_path}")
-
-        # Verify and normalize the extracted structure
-        extracted_items = list(temp_extract_path.iterdir())
-        logger.debug(f"Extracted items in root: {[item.name for item in extracted_items]}")
-
-        for item in extracted_items:
-            logger.debug(f"{item.name} - is_dir: {item.is_dir()}")
-        # Case 1: Direct single chapter folder in the ZIP root
-        if len(extracted_items) == 1 and extracted_items[0].is_dir() and extracted_items[0].name.isdigit():       
-            logger.info(f"Detected single chapter folder directly in ZIP root: {extracted_items[0]}")
-            book_folder = temp_extract_path
-        
-        # Case 2: Single folder encapsulating everything
-        elif len(extracted_items) == 1 and extracted_items[0].is_dir():       
-            primary_folder = extracted_items[0]
-            inner_items = list(primary_folder.iterdir())
-            logger.debug(f"Primary folder name: {primary_folder.name}")
-            logger.debug(f"Primary folder contents: {[item.name for item in inner_items]}")
-            for inner_item in inner_items:
-                logger.debug(f"{inner_item.name} - is_dir: {inner_item.is_dir()}")
-
-            if all(item.is_dir() and item.name.isdigit() for item in inner_items):
-                # Encapsulating folder directly contains chapter folders
-                logger.info(f"Detected encapsulating folder with chapters: {primary_folder}")
-                book_folder = primary_folder
-            elif len(inner_items) == 1 and inner_items[0].is_dir() and inner_items[0].name.isdigit():
-                # Encapsulating folder contains a single chapter folder
-                logger.info(f"Detected single chapter folder inside book folder: {inner_items[0]}")
-                book_folder = primary_folder
-            else:
-                logger.error("Unexpected structure inside primary folder.")
-                raise HTTPException(status_code=400, detail="Invalid book folder structure")
-        
-        # Case: Multiple chapter folders in the root of the ZIP
-        elif all(item.is_dir() and item.name.isdigit() for item in extracted_items):       
-            logger.info("Detected multiple chapter folders directly in the ZIP root.")
-            book_folder = temp_extract_path
-        else:
-            logger.error("Unexpected structure in the extracted ZIP file.")
-            raise HTTPException(status_code=400, detail="Invalid book folder structure")
-        
+        book_folder, digests = extract_book_zip(temp_zip_path, temp_extract_path)
         logger.debug(f"Book folder resolved: {book_folder}")
         return {
             "temp_extract_path": temp_extract_path,
-            "book_folder": book_folder
+            "book_folder": book_folder,
+            "digests": digests,
         }
 
     except HTTPException:
@@ -1222,32 +1690,118 @@ async def extract_and_validate_zip(file: UploadFile):
         shutil.rmtree(temp_extract_path, ignore_errors=True)
         raise HTTPException(status_code=500, detail="An unexpected error occurred while extracting the ZIP file.")
 
-async def process_book_zip(project_id: int, file: UploadFile, db: Session, current_user: dict):
+
+def extract_book_zip(temp_zip_path: Path, temp_extract_path: Path) -> Tuple[Path, dict]:
+    """
+    Check the audio file sizes of a saved book ZIP, extract it and locate the book folder.
+
+    Returns:
+        Tuple[Path, dict]: The folder holding the chapter folders, and the SHA-256
+        digest of every extracted file keyed by its path.
+    """
+    invalid_audio_files = find_oversized_audio_files(temp_zip_path)
+    if invalid_audio_files:
+        temp_zip_path.unlink(missing_ok=True)
+        shutil.rmtree(temp_extract_path, ignore_errors=True)
+        raise HTTPException(
+            status_code=400,
+            detail={
+            "message": f"Book Upload Failed: Some audio files exceed the {MAX_AUDIO_FILE_SIZE_MB} MB limit",
+            "invalid_files": invalid_audio_files,
+            },
+        )
+
+    # Extract after validation passes, hashing each file while it is streamed
+    digests = {}
+    with zipfile.ZipFile(temp_zip_path, "r") as zip_ref:
+        logger.debug(f"ZIP file content: {zip_ref.namelist()}")
+        for zip_info in zip_ref.infolist():
+            parts = zip_member_parts(zip_info.filename)
+            if not parts:
+                continue
+            target_path = temp_extract_path.joinpath(*parts)
+            if zip_info.is_dir():
+                target_path.mkdir(parents=True, exist_ok=True)
+                continue
+            digests[str(target_path)] = extract_member(zip_ref, zip_info, target_path)
+        logger.debug(f"ZIP file extracted to {temp_extract_path}")
+
+    # Remove the ZIP file after extraction
+    temp_zip_path.unlink()
+    logger.debug(f"Deleted temporary ZIP file: {temp_zip_path}")
+
+    # Verify and normalize the extracted structure
+    extracted_items = list(temp_extract_path.iterdir())
+    logger.debug(f"Extracted items in root: {[item.name for item in extracted_items]}")
+
+    for item in extracted_items:
+        logger.debug(f"{item.name} - is_dir: {item.is_dir()}")
+    # Case 1: Direct single chapter folder in the ZIP root
+    if len(extracted_items) == 1 and extracted_items[0].is_dir() and extracted_items[0].name.isdigit():       
+        logger.info(f"Detected single chapter folder directly in ZIP root: {extracted_items[0]}")
+        return temp_extract_path, digests
+    
+    # Case 2: Single folder encapsulating everything
+    if len(extracted_items) == 1 and extracted_items[0].is_dir():       
+        primary_folder = extracted_items[0]
+        inner_items = list(primary_folder.iterdir())
+        logger.debug(f"Primary folder name: {primary_folder.name}")
+        logger.debug(f"Primary folder contents: {[item.name for item in inner_items]}")
+        for inner_item in inner_items:
+            logger.debug(f"{inner_item.name} - is_dir: {inner_item.is_dir()}")
+
+        if all(item.is_dir() and item.name.isdigit() for item in inner_items):
+            # Encapsulating folder directly contains chapter folders
+            logger.info(f"Detected encapsulating folder with chapters: {primary_folder}")
+            return primary_folder, digests
+        if len(inner_items) == 1 and inner_items[0].is_dir() and inner_items[0].name.isdigit():
+            # Encapsulating folder contains a single chapter folder
+            logger.info(f"Detected single chapter folder inside book folder: {inner_items[0]}")
+            return primary_folder, digests
+        logger.error("Unexpected structure inside primary folder.")
+        raise HTTPException(status_code=400, detail="Invalid book folder structure")
+    
+    # Case: Multiple chapter folders in the root of the ZIP
+    if all(item.is_dir() and item.name.isdigit() for item in extracted_items):       
+        logger.info("Detected multiple chapter folders directly in the ZIP root.")
+        return temp_extract_path, digests
+    logger.error("Unexpected structure in the extracted ZIP file.")
+    raise HTTPException(status_code=400, detail="Invalid book folder structure")
+
+async def process_book_zip(project_id: int, file: UploadFile, db: Session, current_user: dict, workspace: Path):
     """
     Process the uploaded ZIP file: Extract, validate, and return paths.
     """
+    book_data = await run_in_threadpool(prepare_book_upload, project_id, file.filename, db, current_user)
+    # Extract and validate ZIP file structure
+    zip_data = await extract_and_validate_zip(file, workspace)
+    return {**book_data, **zip_data}
+
+
+def prepare_book_upload(project_id: int, file_name: str, db: Session, current_user: dict) -> dict:
+    """
+    Check the project and the book named by an uploaded book ZIP before it is extracted.
+
+    Returns:
+        dict: {"book": str, "project": Project, "versification_data": dict}
+    """
     # Check if the project exists
     project = get_project(project_id, db, current_user)
     versification_data = load_versification()
     valid_books = set(versification_data.get("maxVerses", {}).keys())
     # Extract book name from the file
-    book = file.filename.rsplit(".", 1)[0]
+    book = file_name.rsplit(".", 1)[0]
     # Validate book name
     if book not in valid_books:
         raise HTTPException(status_code=400, detail=f"Invalid book: {book}")
     # Ensure the uploaded file is a ZIP file
-    if not file.filename.endswith(".zip"):
+    if not file_name.endswith(".zip"):
         raise HTTPException(status_code=400, detail="Uploaded file is not a ZIP file")
-    # Extract and validate ZIP file structure
-    zip_data = await extract_and_validate_zip(file)
-    
     return {
-    "book": book,
-    "temp_extract_path":zip_data["temp_extract_path"],
-    "book_folder":  zip_data["book_folder"],
-    "project": project,
-    "versification_data": versification_data
-}
+        "book": book,
+        "project": project,
+        "versification_data": versification_data,
+    }
 
 
 
@@ -1258,9 +1812,11 @@ def save_book_to_project(
     temp_extract_path: Path,
     versification_data: dict,
     db: Session,
+    digests: dict = None,
 ):
     """
     Save the book to the project: Move files, validate, and store in DB.
+    `digests` holds the content digests recorded while the upload was extracted.
     """
     # Check if the book already exists in the project
     existing_book = (
@@ -1270,7 +1826,7 @@ def save_book_to_project(
     )
     if existing_book:
         # Perform chapter-level checks for the existing book
-        added_chapters, skipped_chapters, modified_chapters, added_verses, modified_verses, incompatible_verses = process_chapters(book_folder, project, existing_book, db,book)
+        added_chapters, skipped_chapters, modified_chapters, added_verses, modified_verses, incompatible_verses = process_chapters(book_folder, project, existing_book, db,book, digests)
         shutil.rmtree(temp_extract_path, ignore_errors=True)
         return {
             "message": "Book already exists. Additional chapters processed.",
@@ -1289,8 +1845,8 @@ def save_book_to_project(
             book=book,
         )
         db.add(book_entry)
-        db.commit()
-        db.refresh(book_entry)
+        # Flush only: the book, chapters and verses are committed together below
+        db.flush()
     # Dynamically locate the ingredients folder
     base_name = project.name.split("(")[0].strip()
     project_root_path = BASE_DIR / str(project.project_id) / "input" / base_name   
@@ -1309,7 +1865,6 @@ def save_book_to_project(
     if target_book_path.exists():
         shutil.rmtree(temp_extract_path, ignore_errors=True)
         raise HTTPException(status_code=400, detail="Book folder already exists in ingredients")
-    shutil.move(str(book_folder), str(target_book_path)) 
     max_verses_data = versification_data.get("maxVerses", {})   
     # Get maximum chapters for the book
     max_chapters = len(max_verses_data[book])
@@ -1317,113 +1872,87 @@ def save_book_to_project(
     # Initialize has_valid_chapters to track valid chapters
     has_valid_chapters = False   
     incompartible_verses_list = []
-    # Filter out invalid chapters first
-    for chapter_dir in target_book_path.iterdir():
-        if chapter_dir.is_dir() and chapter_dir.name.isdigit():
-            chapter_number = int(chapter_dir.name)
-            if chapter_number > max_chapters:
-                logger.error(f"Invalid chapter {chapter_number}: Exceeds maximum allowed chapters ({max_chapters})")
-                shutil.rmtree(target_book_path, ignore_errors=True)
-                db.delete(book_entry)
-                db.commit()
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"{book} should have {max_chapters} chapter(s) but found chapter {chapter_number}. "
-                        "Please upload the ZIP file with proper chapter count"
-                )               
-            chapter_max_verses = (
-                int(book_max_verses[chapter_number - 1])
-                if chapter_number <= len(book_max_verses)
-                else 0
+    new_chapter_rows = []
+    # Scan the extracted book once; validation and the DB rows both come from this manifest
+    manifest = build_book_manifest(book_folder, digests)
+    # Validate the chapters before anything is moved into the project
+    for chapter in manifest:
+        chapter_number = chapter["chapter"]
+        if chapter_number > max_chapters:
+            logger.error(f"Invalid chapter {chapter_number}: Exceeds maximum allowed chapters ({max_chapters})")
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"{book} should have {max_chapters} chapter(s) but found chapter {chapter_number}. "
+                    "Please upload the ZIP file with proper chapter count"
+            )               
+        chapter_max_verses = (
+            int(book_max_verses[chapter_number - 1])
+            if chapter_number <= len(book_max_verses)
+            else 0
+        )
+        # Validate verses
+        available_verses = chapter["verse_numbers"]
+        if available_verses and max(available_verses) > chapter_max_verses:
+            logger.error(
+                f"{book}: Chapter {chapter_number} should have {chapter_max_verses} verses "
+                f"but {max(available_verses)} verses found"
             )
-            # Get all available verses in the chapter
-            available_verses = set(
-                int(verse_digits.group(1))
-                for verse_file in chapter_dir.iterdir()
-                if verse_file.is_file() and "_" in verse_file.stem
-                for verse_digits in [re.match(r"^(\d+)", verse_file.stem.split("_")[1])]
-                if verse_digits
-            )           
-            print(f"available verses in chapter {chapter_number}", available_verses)
-            # If no verses are found, delete the empty chapter folder
-            if not available_verses:
-                logger.info(f"Empty chapter detected: {chapter_dir}, deleting it.")
-                shutil.rmtree(chapter_dir)
-                continue           
-            # Validate verses
-            if available_verses and max(available_verses) > chapter_max_verses:
-                logger.error(
-                    f"{book}: Chapter {chapter_number} should have {chapter_max_verses} verses "
-                    f"but {max(available_verses)} verses found"
-                )
-                # Clean up and raise immediate error
-                shutil.rmtree(target_book_path, ignore_errors=True)
-                db.delete(book_entry)
-                db.commit()
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"{book}: Chapter {chapter_number} has only {chapter_max_verses} verses "
-                        f"but {max(available_verses)} verses found. "
-                        "Please upload the ZIP file with correct verse count."
-                )               
+            db.rollback()
+            raise HTTPException(
+                status_code=400,
+                detail=f"{book}: Chapter {chapter_number} has only {chapter_max_verses} verses "
+                    f"but {max(available_verses)} verses found. "
+                    "Please upload the ZIP file with correct verse count."
+            )               
+    # Drop empty chapters and lower priority takes, then move the book folder into the ingredients folder
+    for chapter in manifest:
+        chapter_dir = book_folder / chapter["dir_name"]
+        if not chapter["verse_numbers"]:
+            logger.info(f"Empty chapter detected: {chapter_dir}, deleting it.")
+            shutil.rmtree(chapter_dir)
+            continue
+        remove_discarded_verse_files(chapter_dir, chapter)
+    shutil.move(str(book_folder), str(target_book_path)) 
     # Process the book structure (chapters and verses)
-    for chapter_dir in target_book_path.iterdir():
-        if chapter_dir.is_dir() and chapter_dir.name.isdigit():
-            chapter_number = int(chapter_dir.name)           
-            chapter_max_verses = (
-                int(book_max_verses[chapter_number - 1])
-                if chapter_number <= len(book_max_verses)
-                else 0
-            )
-            # Process verses, tracking and removing duplicates
-            verse_files, incompartible_verses = process_verse_files(chapter_dir, chapter_number)
-            incompartible_verses_list.extend(incompartible_verses)
-            # Finalize verse files after prioritization
-            selected_files = {verse: data['file'] for verse, data in verse_files.items()}         
-            # Get available verses after duplicate removal
-            available_verses = set(selected_files.keys())
-            # Determine missing verses
-            expected_verses = set(range(1, chapter_max_verses + 1))
-            missing_verses = list(expected_verses - available_verses)
-            # Create chapter entry in the database
-            chapter_entry = Chapter(
-                book_id=book_entry.book_id,
-                chapter=chapter_number,
-                approved=False,
-                missing_verses=missing_verses if missing_verses else None,
-            )
-            db.add(chapter_entry)
-            db.commit()
-            db.refresh(chapter_entry)
-            has_valid_chapters = True
-            # Add verse records
-            for verse_number, verse_file in selected_files.items():
-                verse = Verse(
-                    chapter_id=chapter_entry.chapter_id,
-                    verse=verse_number,
-                    name=verse_file.name,
-                    path=str(verse_file),
-                    size=verse_file.stat().st_size,
-                    format=verse_file.suffix.lstrip("."),
-                    stt=False,
-                    text="",
-                    modified=False,
-                    tts=False,
-                    tts_path="",
-                    stt_msg="",
-                    tts_msg="",
-                )
-                db.add(verse) 
+    for chapter in manifest:
+        if not chapter["verse_numbers"]:
+            continue
+        chapter_number = chapter["chapter"]
+        chapter_max_verses = (
+            int(book_max_verses[chapter_number - 1])
+            if chapter_number <= len(book_max_verses)
+            else 0
+        )
+        incompartible_verses_list.extend(chapter["incompartible_verses"])
+        chapter_path = target_book_path / chapter["dir_name"]
+        for verse_info in chapter["verses"].values():
+            store_blob(chapter_path / verse_info["name"], verse_info["digest"])
+        # Determine missing verses
+        expected_verses = set(range(1, chapter_max_verses + 1))
+        missing_verses = list(expected_verses - set(chapter["verses"]))
+        # Queue the chapter and its verse records for insertion
+        new_chapter_rows.append({
+            "book_id": book_entry.book_id,
+            "chapter": chapter_number,
+            "missing_verses": missing_verses if missing_verses else None,
+            "verses": [
+                verse_row(verse_number, chapter_path / verse_info["name"], verse_info["size"], verse_info["digest"])
+                for verse_number, verse_info in chapter["verses"].items()
+            ],
+        })
+        has_valid_chapters = True
     # After processing all chapters, check if there were any valid chapters
     if not has_valid_chapters:
         logger.error(f"No valid chapters with verses found for book: {book}. Removing the book folder.")
         shutil.rmtree(target_book_path, ignore_errors=True)
-        db.delete(book_entry)
-        db.commit()
+        db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"No verse data found in book: {book}",
         )
+    # Insert chapters and verses set-based, in the same transaction as the book
+    bulk_insert_chapters(db, new_chapter_rows)
     db.commit()
     # Clean up the temporary extraction folder
     if temp_extract_path:
@@ -1481,27 +2010,67 @@ def validate_tts_model(audio_lang: str):
             detail="The TTS model is not currently available for this language."
         )
 
-def test_stt_api(file_paths: List[str], script_lang: str):
+def verse_owner(db: Session, verse_id: int) -> Tuple[int, int]:
+    """
+    Return the owner and the project of a verse, which the AI scheduler shares slots between.
+    """
+    owner = (
+        db.query(Project.owner_id, Project.project_id)
+        .join(Book, Book.project_id == Project.project_id)
+        .join(Chapter, Chapter.book_id == Book.book_id)
+        .join(Verse, Verse.chapter_id == Chapter.chapter_id)
+        .filter(Verse.verse_id == verse_id)
+        .first()
+    )
+    if not owner:
+        raise HTTPException(status_code=404, detail=f"Project not found for verse {verse_id}.")
+    return owner.owner_id, owner.project_id
+
+
+def submit_preflight(call, user_id: int, project_id: int) -> dict:
+    """
+    Submit a preflight test job through the AI scheduler. It runs on the request
+    path, so it does not wait for a slot: without a free one the request fails
+    with 503 and the client retries later.
     """
-    Test the STT API with one file before processing all files.
+    try:
+        return ai_scheduler.submit(call, user_id, project_id, timeout=0)
+    except ai_scheduler.AIServiceBusy:
+        logger.warning(f"AI service busy, preflight job of user {user_id} for project {project_id} not admitted")
+        raise HTTPException(
+            status_code=503,
+            detail="The AI service is busy. Please try again in a few minutes.",
+            headers={"Retry-After": str(PREFLIGHT_RETRY_AFTER_SECONDS)},
+        )
+
+
+def test_stt_api(db: Session, verses: List[Verse], script_lang: str) -> str:
+    """
+    Test the STT API with one verse before processing all verses.
+
+    The test job is a real transcription of the first verse, so it is kept:
+    the verse gets an in-progress job that the job monitor completes, and the
+    transcription task skips the verse instead of submitting it again.
 
     Args:
-        file_paths (List[str]): List of file paths to transcribe.
+        db (Session): The database session.
+        verses (List[Verse]): The verses to transcribe, with their audio paths.
         script_lang (str): The script language for transcription.
 
     Raises:
         HTTPException: If no valid files are found or the STT API fails.
 
     Returns:
-        None: If the test is successful, the function completes silently.
+        str: The AI job id of the test job.
     """
-    if not file_paths:
+    if not verses:
         raise HTTPException(status_code=400, detail="No valid audio files found for transcription.")
     
-    test_file = file_paths[0]  # Pick the first file for testing
-    logger.info(f"[{current_time()}] Testing transcription API with file: {test_file}")
+    test_verse = verses[0]  # Pick the first verse for testing
+    logger.info(f"[{current_time()}] Testing transcription API with file: {test_verse.path}")
     
-    test_result = call_stt_api(test_file, script_lang)
+    user_id, project_id = verse_owner(db, test_verse.verse_id)
+    test_result = submit_preflight(lambda: call_stt_api([test_verse.path], script_lang), user_id, project_id)
 
     if "data" not in test_result or "jobId" not in test_result["data"]:
         logger.error(f"STT API test failed: {test_result}")
@@ -1510,139 +2079,512 @@ def test_stt_api(file_paths: List[str], script_lang: str):
             detail="STT API failed during testing. Not proceeding with transcription."
         )
 
-    logger.info(f"[{current_time()}] STT API test successful. Proceeding with transcription.")
+    ai_jobid = test_result["data"]["jobId"]
+    test_verse.stt = False
+    test_verse.stt_msg = ""
+    db.add(test_verse)
+    db.add(Job(verse_id=test_verse.verse_id, ai_jobid=ai_jobid, status="in_progress", kind="stt"))
+    db.commit()
+    job_monitor.watch(ai_jobid, "stt", model=ai_model_name(script_lang, "stt"), work=test_verse.size or 0)
+    logger.info(f"[{current_time()}] STT API test successful. Proceeding with transcription.")
+    return ai_jobid
+
+
+def test_tts_api(db: Session, verses: list, audio_lang: str, output_format: str) -> str:
+    """
+    Test the TTS API with one verse before proceeding with background processing.
+    The test job is kept as the first verse's job, see `test_stt_api`.
+
+    Returns:
+        str: The AI job id of the test job.
+    """
+    test_verse = verses[0]  # Pick the first verse for testing
+    logger.info(f"[{current_time()}] Testing TTS API with verse ID {test_verse.verse_id}")
+    user_id, project_id = verse_owner(db, test_verse.verse_id)
+    test_result = submit_preflight(
+        lambda: call_tts_api([test_verse.text], audio_lang, output_format), user_id, project_id
+    )
+    if "data" not in test_result or "jobId" not in test_result["data"]:
+        logger.error(f"TTS API test failed: {test_result}")
+        raise HTTPException(status_code=500, detail="TTS API failed during testing. Not proceeding with speech conversion.")
+    ai_jobid = test_result["data"]["jobId"]
+    if test_verse.tts_msg != "Text-to-speech completed":
+        test_verse.tts = False
+        test_verse.tts_msg = ""
+        db.add(test_verse)
+    db.add(Job(verse_id=test_verse.verse_id, ai_jobid=ai_jobid, status="in_progress", kind="tts"))
+    db.commit()
+    source_language = SCRIPT_LANGUAGES.get(audio_lang, audio_lang)
+    job_monitor.watch(
+        ai_jobid, "tts", model=ai_model_name(source_language, "tts"), work=len(test_verse.text or "")
+    )
+    logger.info(f"[{current_time()}] ✅ TTS API test successful. Proceeding with speech conversion.")
+    return ai_jobid
+
+
+def stt_batches(pending: list) -> list:
+    """
+    Split pending transcriptions into batches for the STT API.
+
+    A batch holds at most STT_BATCH_SIZE files with distinct file names, since
+    the transcriptions of a batch job are matched back to verses by file name.
+
+    Args:
+        pending (list): (verse_id, job_id, file_path) entries.
+
+    Returns:
+        list: Lists of (verse_id, job_id, file_path) entries, one per batch.
+    """
+    batches = []
+    batch, names = [], set()
+    for entry in pending:
+        name = os.path.basename(entry[2])
+        if len(batch) >= STT_BATCH_SIZE or name in names:
+            batches.append(batch)
+            batch, names = [], set()
+        batch.append(entry)
+        names.add(name)
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def submit_stt_jobs(batches: list, script_lang: str, user_id: int, project_id: int, interactive: bool = True) -> list:
+    """
+    Submit batches to the STT API with up to STT_SUBMIT_CONCURRENCY requests in
+    flight. The limit is shared by all transcriptions running in this process,
+    so a bulk transcription of many chapters does not multiply it.
+
+    Each batch is admitted by the AI scheduler first, which caps the AI jobs in
+    flight and shares them fairly between users and projects.
+
+    Args:
+        batches (list): Batches from `stt_batches`.
+        script_lang (str): The script language for transcription.
+        user_id (int): The owner of the project.
+        project_id (int): The project the verses belong to.
+        interactive (bool): False for bulk transcriptions, which yield to chapters triggered by users.
+
+    Returns:
+        list: The `call_stt_api` result of each batch, in the same order. A batch
+        whose submission raised gets an error result like `call_stt_api`'s.
+    """
+    if not batches:
+        return []
+    def upload(batch):
+        with _stt_submit_slots:
+            return call_stt_api([file_path for _, _, file_path in batch], script_lang)
+
+    def submit(batch):
+        try:
+            return ai_scheduler.submit(lambda: upload(batch), user_id, project_id, interactive=interactive)
+        except Exception as e:
+            # Keep the results of the other batches, which may have been accepted already
+            logger.error(f"Error submitting STT batch: {str(e)}")
+            return {"error": "Exception occurred", "details": str(e)}
+
+    workers = min(STT_SUBMIT_CONCURRENCY, len(batches))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt_submit") as executor:
+        return list(executor.map(submit, batches))
 
 
+def apply_transcriptions(batch: list, output: dict):
+    """
+    Store the transcriptions of a finished batch job on its verses and jobs.
+    Verses whose file is missing from the output are marked as failed.
+    """
+    transcriptions = {
+        os.path.basename(transcription["audioFile"]): transcription
+        for transcription in output.get("transcriptions", [])
+    }
+    transcription_time = output.get("transcription_time")
+    for verse, job, file_path in batch:
+        transcription = transcriptions.get(os.path.basename(file_path))
+        if transcription is None:
+            job.status = "failed"
+            verse.stt = False
+            verse.stt_msg = "AI transcription failed"
+            logger.error(f"[{router.current_time()}] No transcription returned for verse id {verse.verse_id}, audio file {file_path}.")
+            continue
+        verse.text = transcription["transcribedText"]
+        verse.stt = True
+        verse.stt_msg = "Transcription successful"
+        job.status = "completed"
+        logger.info(f"[{router.current_time()}] 🎉 Verse id {verse.verse_id}, audio file {transcription['audioFile']} finished in {transcription_time} seconds.")
 
 
+def watch_stt_jobs(active_jobs: dict, sizes: dict, model_name: str):
+    """
+    Hand submitted STT jobs to the job monitor, with the audio bytes of each job as its work.
 
-def test_tts_api(verses: list, audio_lang: str, output_format: str):
+    Args:
+        active_jobs (dict): {ai_jobid: [(verse_id, job_id, file_path)]}
+        sizes (dict): {verse_id: audio size in bytes}
+        model_name (str): The STT model the jobs run on.
     """
-    Test the TTS API with one verse before proceeding with background processing.
+    for ai_jobid, batch in active_jobs.items():
+        audio_bytes = sum(sizes[verse_id] for verse_id, _, _ in batch)
+        job_monitor.watch(ai_jobid, "stt", model=model_name, work=audio_bytes)
+
+
+def settle_failed_stt_run(db_session: Session, job_ids: list, active_jobs: dict) -> bool:
     """
-    test_verse = verses[0]  # Pick the first verse for testing
-    logger.info(f"[{current_time()}] Testing TTS API with verse ID {test_verse.verse_id}")
-    test_result = call_tts_api([test_verse.text], audio_lang, output_format)
-    if "data" not in test_result or "jobId" not in test_result["data"]:
-        logger.error(f"TTS API test failed: {test_result}")
-        raise HTTPException(status_code=500, detail="TTS API failed during testing. Not proceeding with speech conversion.")
-    logger.info(f"[{current_time()}] ✅ TTS API test successful. Proceeding with speech conversion.")
+    Clean up after a transcription run failed before its submissions were stored:
+    record the jobs the STT API accepted and mark the jobs that were never
+    submitted as failed, so a retry submits only those verses again.
 
+    Args:
+        db_session (Session): The session of the failed run, rolled back.
+        job_ids (list): The pending jobs the run created.
+        active_jobs (dict): {ai_jobid: [(verse_id, job_id, file_path)]} accepted by the STT API.
+
+    Returns:
+        bool: True if the jobs were updated.
+    """
+    try:
+        accepted = set()
+        for ai_jobid, batch in active_jobs.items():
+            batch_job_ids = [job_id for _, job_id, _ in batch]
+            db_session.query(Job).filter(Job.job_id.in_(batch_job_ids)).update(
+                {Job.ai_jobid: ai_jobid, Job.status: "in_progress"}, synchronize_session=False
+            )
+            accepted.update(batch_job_ids)
+        not_submitted = [job_id for job_id in job_ids if job_id not in accepted]
+        if not_submitted:
+            db_session.query(Job).filter(Job.job_id.in_(not_submitted), Job.status == "pending").update(
+                {Job.status: "failed"}, synchronize_session=False
+            )
+        db_session.commit()
+        return True
+    except Exception as e:
+        db_session.rollback()
+        logger.error(f"Failed to clean up the jobs of a failed transcription run: {str(e)}")
+        return False
 
 
-def transcribe_verses(file_paths: list[str], script_lang: str, db_session: Session):
+def transcribe_verses(verse_ids: List[int], script_lang: str, bulk: bool = False):
     """
-    Background task to transcribe verses with simplified concurrent processing.
+    Submit batched STT jobs for verses. The job monitor stores the
+    transcriptions once the jobs finish.
+
+    Works with its own session and changes state set-based: one query loads the
+    verses, one statement inserts all jobs and each batch is updated with one
+    statement per table. Errors are raised again so that the work queue
+    retries: jobs the STT API already accepted are stored and watched first and
+    the other pending jobs are marked as failed, so the retry skips the verses
+    whose jobs were submitted.
+    Bulk transcriptions of books and projects yield to chapters triggered by users.
     """
     chapter_start_time = time.time()
     logger.info(f"[{chapter_start_time}] 🟢 Transcription process started for chapter at OBT Backend")   
-    # Dictionary to store active jobs
-    active_jobs = {}  # Format: {ai_jobid: (verse, job, file_path)}  
+    db_session = SessionLocal()
+    # Dictionary to store submitted jobs
+    active_jobs = {}  # Format: {ai_jobid: [(verse_id, job_id, file_path)]}
+    # Jobs created by this run that are not stored as submitted or failed yet
+    unsettled_job_ids = []
     try:
-        # Step 1: Submit all transcription jobs first
-        for file_path in file_paths:
-            
-            verse = db_session.query(Verse).filter(Verse.path == file_path).first()
-            if not verse:
-                logger.error(f"Verse file not found for path: {file_path}")
-                continue
-            
+        # Step 1: Create a pending job for every verse that still needs transcription
+        verses = (
+            db_session.query(Verse.verse_id, Verse.path, Verse.size, Verse.stt_msg)
+            .filter(Verse.verse_id.in_(verse_ids))
+            .order_by(Verse.verse_id)
+            .all()
+        )
+        missing = set(verse_ids) - {verse.verse_id for verse in verses}
+        if missing:
+            logger.error(f"Verses not found for ids: {sorted(missing)}")
+        # A job that has an AI job id was accepted by the STT API, even if the run failed before storing its status
+        submitted = {
+            verse_id
+            for (verse_id,) in db_session.query(Job.verse_id).filter(
+                Job.verse_id.in_(verse_ids),
+                or_(
+                    Job.status == "in_progress",
+                    and_(Job.status == "pending", Job.ai_jobid.isnot(None)),
+                ),
+            )
+        }
+        to_submit = []
+        for verse in verses:
             # Skip if already transcribed successfully
             if verse.stt_msg == "Transcription successful":
                 logger.info(f"Skipping transcription for verse {verse.verse_id}: Already transcribed.")
-                continue        
-            # Reset verse status if needed
-            if verse.stt_msg != "Transcription successful":
-                logger.info(f"Resetting stt_msg for verse {verse.verse_id}.")
-                verse.stt_msg = ""
-                verse.stt = False  # Resetting stt flag as well
-                db_session.add(verse)
-                db_session.commit()  # Save the updates before calling STT API
-                
-                # Create and save job
-                job = Job(verse_id=verse.verse_id, ai_jobid=None, status="pending")
-                db_session.add(job)
-                db_session.commit()               
-                # Submit to STT API
-                result = call_stt_api(file_path, script_lang)               
-                if "error" in result:
-                    job.status = "failed"
-                    verse.stt = False
-                    verse.stt_msg = result.get("error", "Unknown error")
-                    logger.error(f"[{router.current_time()}] STT API error: {result.get('error', 'Unknown error')}")
-                    db_session.add(job)
-                    db_session.add(verse)
-                    db_session.commit()
-                else:
-                    ai_jobid = result.get("data", {}).get("jobId")
-                    job.ai_jobid = ai_jobid
-                    job.status = "in_progress"
-                    active_jobs[ai_jobid] = (verse, job, file_path)
-                    db_session.add(job)
-                    db_session.commit()
-                    logger.info(f"[{router.current_time()}] 🔄 STT AI Job ID {ai_jobid} received. Monitoring job status...")
+            # Skip if a job for the verse is still running on the AI service
+            elif verse.verse_id in submitted:
+                logger.info(f"Skipping transcription for verse {verse.verse_id}: Job already in progress.")
+            elif not verse.path:
+                logger.error(f"Verse file not found for verse {verse.verse_id}")
+            else:
+                to_submit.append(verse)
+        if not to_submit:
+            return
+
+        model_name = ai_model_name(script_lang, "stt")
+        sizes = {verse.verse_id: verse.size or 0 for verse in to_submit}
+        submit_ids = [verse.verse_id for verse in to_submit]
+        # Reset verse status before calling STT API
+        db_session.query(Verse).filter(Verse.verse_id.in_(submit_ids)).update(
+            {Verse.stt: False, Verse.stt_msg: ""}, synchronize_session=False
+        )
+        job_ids = dict(bulk_insert(
+            db_session,
+            Job,
+            [{"verse_id": verse_id, "ai_jobid": None, "status": "pending", "kind": "stt"} for verse_id in submit_ids],
+            returning=(Job.verse_id, Job.job_id),
+        ))
+        db_session.commit()
+        unsettled_job_ids = list(job_ids.values())
+        pending = [(verse.verse_id, job_ids[verse.verse_id], verse.path) for verse in to_submit]
+
+        # Submit the batches to STT API concurrently; the session is only used from this thread
+        submit_start_time = time.time()
+        batches = stt_batches(pending)
+        user_id, project_id = verse_owner(db_session, pending[0][0])
+        results = submit_stt_jobs(batches, script_lang, user_id, project_id, interactive=not bulk)
+        for batch, result in zip(batches, results):
+            batch_verse_ids = [verse_id for verse_id, _, _ in batch]
+            batch_job_ids = [job_id for _, job_id, _ in batch]
+            if "error" in result:
+                db_session.query(Job).filter(Job.job_id.in_(batch_job_ids)).update(
+                    {Job.status: "failed"}, synchronize_session=False
+                )
+                db_session.query(Verse).filter(Verse.verse_id.in_(batch_verse_ids)).update(
+                    {Verse.stt: False, Verse.stt_msg: result.get("error", "Unknown error")},
+                    synchronize_session=False,
+                )
+                logger.error(f"[{router.current_time()}] STT API error: {result.get('error', 'Unknown error')}")
+            else:
+                ai_jobid = result.get("data", {}).get("jobId")
+                db_session.query(Job).filter(Job.job_id.in_(batch_job_ids)).update(
+                    {Job.ai_jobid: ai_jobid, Job.status: "in_progress"}, synchronize_session=False
+                )
+                active_jobs[ai_jobid] = batch
+                logger.info(f"[{router.current_time()}] 🔄 STT AI Job ID {ai_jobid} received for {len(batch)} verses. Monitoring job status...")
+        db_session.commit()
+        unsettled_job_ids = []
+        logger.info(
+            f"[{router.current_time()}] Submitted {len(pending)} verses in {len(batches)} STT jobs in "
+            f"{time.time() - submit_start_time:.2f} seconds with concurrency {STT_SUBMIT_CONCURRENCY}"
+        )
         
-        # Step 2: Monitor all jobs until completion
-        while active_jobs:
-            jobs_to_remove = []  # Store jobs to remove after iteration
-            
-            # Check status for all active jobs
-            for ai_jobid, (verse, job, file_path) in active_jobs.items():
-                result = check_ai_job_status(ai_jobid)
-                job_status = result.get("data", {}).get("status")
-                logger.info(f"[{router.current_time()}] ⏳ AI Job {ai_jobid} Status: {job_status}")
-                
-                if job_status == "job finished":
-                    
-                    # Process successful transcription
-                    transcription = result["data"]["output"]["transcriptions"][0]
-                    transcription_time = result["data"]["output"]["transcription_time"]
+        # Step 2: Hand the jobs to the job monitor, which stores the transcriptions
+        watch_stt_jobs(active_jobs, sizes, model_name)
 
-                    audio_file = transcription["audioFile"]
-                    logger.info(f"[{router.current_time()}] 🎉 Verse id {verse.verse_id}, audio file {audio_file} finished in {transcription_time} seconds.")
-                    transcribed_text = transcription["transcribedText"]
-                    
-                    verse.text = transcribed_text
-                    verse.stt = True
-                    verse.stt_msg = "Transcription successful"
-                    job.status = "completed"
-                    
-                    # Update database immediately
-                    db_session.add(verse)
-                    db_session.add(job)
-                    db_session.commit()
-                    
-                    jobs_to_remove.append(ai_jobid)
-                    
-                
-                elif job_status in ["job failed", "Error"]:
-                    job.status = "failed"
-                    verse.stt = False
-                    verse.stt_msg = "AI transcription failed"
-                    
-                    # Update database immediately
-                    db_session.add(verse)
-                    db_session.add(job)
-                    db_session.commit()
-                    
-                    jobs_to_remove.append(ai_jobid)
-                    logger.error(f"[{router.current_time()}] AI Transcription failed for Job ID {ai_jobid}.")
-            
-            # Remove completed jobs from tracking
-            for ai_jobid in jobs_to_remove:
-                active_jobs.pop(ai_jobid)
-            
-            # Wait before next check if there are still active jobs
-            if active_jobs:
-                time.sleep(5)
-    
     except Exception as e:
+        db_session.rollback()
         logger.error(f"Error in transcribe_verses: {str(e)}")
+        if unsettled_job_ids and settle_failed_stt_run(db_session, unsettled_job_ids, active_jobs):
+            watch_stt_jobs(active_jobs, sizes, model_name)
+        raise
     
     finally:
         db_session.close()
         chapter_end_time = time.time()
-        logger.info(f"[{router.current_time()}] 🕒 Transcription process for chapter completed in {chapter_end_time - chapter_start_time:.2f} seconds at OBT Backend")
+        logger.info(f"[{router.current_time()}] 🕒 Transcription jobs for chapter submitted in {chapter_end_time - chapter_start_time:.2f} seconds at OBT Backend")
+
+
+def start_bulk_transcription(db: Session, project_id: int, script_lang: str, book_id: Optional[int] = None) -> dict:
+    """
+    Transcribe all verses of a project, or of one of its books, as one work set.
+
+    The model is checked and the STT API tested once first, so a refused run
+    changes nothing. Then the verses and chapter approvals are reset in one
+    statement per table and one work item per chapter is queued, all in a
+    single transaction. Verses edited by hand are not transcribed again.
+
+    Args:
+        db (Session): The database session.
+        project_id (int): The project to transcribe.
+        script_lang (str): The script language for transcription.
+        book_id (Optional[int]): Only transcribe this book of the project.
+
+    Returns:
+        dict: The number of chapters and verses queued and the work item ids.
+    """
+    query = (
+        db.query(Verse.verse_id, Verse.chapter_id)
+        .join(Chapter, Verse.chapter_id == Chapter.chapter_id)
+        .join(Book, Chapter.book_id == Book.book_id)
+        .filter(
+            Book.project_id == project_id,
+            or_(Verse.modified.is_(False), Verse.modified.is_(None)),
+            Verse.path.isnot(None),
+            Verse.path != "",
+        )
+    )
+    if book_id is not None:
+        query = query.filter(Book.book_id == book_id)
+    chapters = {}  # Format: {chapter_id: [verse_id]}
+    for verse_id, chapter_id in query.order_by(Book.book_id, Chapter.chapter, Verse.verse):
+        chapters.setdefault(chapter_id, []).append(verse_id)
+    if not chapters:
+        return {"chapters": 0, "verses": 0, "work_ids": []}
+
+    # Check the model before anything is reset, so a bulk run for an unmapped language changes nothing
+    if not is_model_served(script_lang, "stt"):
+        raise HTTPException(
+            status_code=400,
+            detail="The STT model is not currently available for this language."
+        )
+    verse_ids = [verse_id for chapter_verse_ids in chapters.values() for verse_id in chapter_verse_ids]
+    # One test job for the whole set, before anything is reset, so a run the STT API
+    # refuses changes nothing; the chapter task skips the tested verse
+    test_verse = db.query(Verse).filter(Verse.verse_id == verse_ids[0]).first()
+    test_stt_api(db, [test_verse], script_lang)
+
+    # Force a fresh run of the other verses and reset the approval of their chapters,
+    # committed together with the queued work
+    db.query(Verse).filter(Verse.verse_id.in_(verse_ids[1:])).update(
+        {Verse.stt: False, Verse.stt_msg: ""}, synchronize_session=False
+    )
+    db.query(Chapter).filter(Chapter.chapter_id.in_(list(chapters))).update(
+        {Chapter.approved: False}, synchronize_session=False
+    )
+    work_ids = work_queue.enqueue_many(
+        db,
+        "stt",
+        [
+            {"verse_ids": chapter_verse_ids, "script_lang": script_lang, "bulk": True}
+            for chapter_verse_ids in chapters.values()
+        ],
+        interactive=False,
+    )
+    logger.info(
+        f"[{current_time()}] Bulk transcription of project {project_id} queued: "
+        f"{len(verse_ids)} verses in {len(chapters)} chapters"
+    )
+    return {"chapters": len(chapters), "verses": len(verse_ids), "work_ids": work_ids}
+
+
+def transcription_progress(db: Session, project_id: int, book_id: Optional[int] = None) -> dict:
+    """
+    Aggregate the transcription progress of a project, or of one of its books,
+    per chapter and in total.
+
+    A verse counts as transcribed or failed by its STT message. Otherwise the
+    newest STT job of the verse decides: a running job, or a pending one whose
+    work item is still queued or held by a live worker, counts as in progress; a
+    failed job, or a pending one left behind by a work item that died or ended,
+    counts as failed. Verses without a job are pending.
+    """
+    newest_jobs = (
+        db.query(func.max(Job.job_id).label("job_id"))
+        .filter(or_(Job.kind == "stt", Job.kind.is_(None)))
+        .group_by(Job.verse_id)
+        .subquery()
+    )
+    latest_job = (
+        db.query(Job.verse_id, Job.status)
+        .join(newest_jobs, newest_jobs.c.job_id == Job.job_id)
+        .subquery()
+    )
+    # Verses of STT work items that are queued, or running under a lock that is still renewed
+    active_verse_ids = db.query(
+        cast(func.jsonb_array_elements_text(cast(WorkItem.payload, JSONB)["verse_ids"]), Integer)
+    ).filter(
+        WorkItem.kind == "stt",
+        or_(
+            WorkItem.status == "queued",
+            and_(WorkItem.status == "running", WorkItem.locked_until >= datetime.datetime.utcnow()),
+        ),
+    )
+    not_processed = or_(Verse.stt_msg == "", Verse.stt_msg.is_(None))
+    queued = latest_job.c.verse_id.in_(active_verse_ids)
+    running = or_(
+        latest_job.c.status == "in_progress",
+        and_(latest_job.c.status == "pending", queued),
+    )
+    abandoned = or_(
+        latest_job.c.status == "failed",
+        and_(latest_job.c.status == "pending", ~queued),
+    )
+    query = (
+        db.query(
+            Book.book,
+            Chapter.chapter,
+            func.count(Verse.verse_id),
+            func.sum(case((Verse.stt_msg == "Transcription successful", 1), else_=0)),
+            func.sum(case(
+                (and_(Verse.stt_msg != "", Verse.stt_msg != "Transcription successful"), 1),
+                (and_(not_processed, abandoned), 1),
+                else_=0,
+            )),
+            func.sum(case((and_(not_processed, running), 1), else_=0)),
+        )
+        .join(Chapter, Verse.chapter_id == Chapter.chapter_id)
+        .join(Book, Chapter.book_id == Book.book_id)
+        .outerjoin(latest_job, latest_job.c.verse_id == Verse.verse_id)
+        .filter(Book.project_id == project_id)
+        .group_by(Book.book_id, Book.book, Chapter.chapter)
+        .order_by(Book.book_id, Chapter.chapter)
+    )
+    if book_id is not None:
+        query = query.filter(Book.book_id == book_id)
+    totals = {"verses": 0, "transcribed": 0, "failed": 0, "in_progress": 0, "pending": 0}
+    chapters = []
+    for book, chapter, verses, transcribed, failed, in_progress in query:
+        progress = {
+            "verses": verses,
+            "transcribed": int(transcribed or 0),
+            "failed": int(failed or 0),
+            "in_progress": int(in_progress or 0),
+        }
+        progress["pending"] = verses - progress["transcribed"] - progress["failed"] - progress["in_progress"]
+        for key, value in progress.items():
+            totals[key] += value
+        chapters.append({"book": book, "chapter": chapter, **progress})
+    totals["percent_done"] = (
+        round((totals["transcribed"] + totals["failed"]) * 100 / totals["verses"], 1) if totals["verses"] else 0
+    )
+    return {**totals, "chapters": chapters}
+
+
+def run_stt_work(script_lang: str, verse_ids: List[int] = None, file_paths: List[str] = None, bulk: bool = False):
+    """
+    Work queue task "stt": transcribe the verses of a chapter. Items queued
+    before verse ids were used carry file paths instead.
+    """
+    if verse_ids is None:
+        db_session = SessionLocal()
+        try:
+            verse_ids = [
+                verse_id for (verse_id,) in
+                db_session.query(Verse.verse_id).filter(Verse.path.in_(file_paths or []))
+            ]
+        finally:
+            db_session.close()
+    transcribe_verses(verse_ids, script_lang, bulk=bulk)
+
+
+def handle_stt_job(ai_jobid: str, result: dict):
+    """
+    Job monitor handler for STT jobs: store the transcriptions of a finished
+    batch job on its verses, or mark the verses as failed.
+    """
+    db_session = SessionLocal()
+    try:
+        batch = [
+            (verse, job, verse.path)
+            for job, verse in db_session.query(Job, Verse)
+            .join(Verse, Job.verse_id == Verse.verse_id)
+            .filter(Job.ai_jobid == ai_jobid, Job.status == "in_progress")
+            .all()
+        ]
+        if result.get("data", {}).get("status") == "job finished":
+            # Fan the transcriptions out to the verses of the batch
+            apply_transcriptions(batch, result["data"]["output"])
+        else:
+            for verse, job, file_path in batch:
+                job.status = "failed"
+                verse.stt = False
+                verse.stt_msg = "AI transcription failed"
+            logger.error(f"[{router.current_time()}] AI Transcription failed for Job ID {ai_jobid}.")
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        raise
+    finally:
+        db_session.close()
 
 
 def check_ai_job_status(ai_jobid: str) -> dict:
@@ -1652,7 +2594,7 @@ def check_ai_job_status(ai_jobid: str) -> dict:
     job_status_url =  f"{BASE_URL}/model/job?job_id={ai_jobid}"
     headers = {"Authorization": f"Bearer {API_TOKEN}"}
     try:
-        response = requests.get(job_status_url, headers=headers, timeout=120) #it will wait 120 seconds for response
+        response = ai_client.get("job_status", job_status_url, headers=headers)
 
         if response.status_code == 200:
             return response.json()
@@ -1695,9 +2637,29 @@ def check_ai_job_status(ai_jobid: str) -> dict:
         }
 
 
+def fetch_served_models() -> set:
+    """
+    Fetch the names of the models served by the AI service.
+
+    Returns:
+        set: The served model names.
+
+    Raises:
+        HTTPException: If the AI service does not return the list.
+    """
+    SERVED_MODELS_URL = f"{BASE_URL}/model/served-models"
+    headers = {"Authorization": f"Bearer {API_TOKEN}"}
+    response = ai_client.get("served_models", SERVED_MODELS_URL, headers=headers, read_timeout=60)
+    if response.status_code != 200:
+        logger.error(f" Error fetching served models: {response.status_code} - {response.text}")
+        raise HTTPException(status_code=500, detail="Failed to fetch served models")
+    return {model["modelName"] for model in response.json()}
+
+
 def is_model_served(lang: str, model_type: str) -> bool:
     """
     Check if the STT or TTS model is currently available for the given language.
+    The served models come from a cache that is refreshed in the background.
 
     Args:
         lang (str): The spoken language to check.
@@ -1706,49 +2668,38 @@ def is_model_served(lang: str, model_type: str) -> bool:
     Returns:
         bool: True if the model is available, False otherwise.
     """
-    SERVED_MODELS_URL = f"{BASE_URL}/model/served-models"
     logger.info(f"Checking if {model_type.upper()} model is served for language: {lang}")
 
     try:
-        headers = {"Authorization": f"Bearer {API_TOKEN}"}
-        response = requests.get(SERVED_MODELS_URL, headers=headers, timeout=60) #it will wait 60 seconds for response
-        if response.status_code != 200:
-            logger.error(f" Error fetching served models: {response.status_code} - {response.text}")
-            raise HTTPException(status_code=500, detail="Failed to fetch served models")
-        
-        served_models = response.json()
-        served_model_names = {model["modelName"] for model in served_models}
-        logger.info(f" Available models: {served_model_names}")
-
-        # Determine the correct source language
-        source_language = next(
-            (entry["script_language"] for entry in source_languages if entry["language_name"] == lang),
-            lang  # Default to original language if no mapping is found
-        )
-        logger.info(f"Mapped '{lang}' to source language '{source_language}'")
+        served_model_names = served_models.model_names()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Request error checking served models: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to check served models")
 
-        # Fetch the correct model mapping (STT/TTS)
-        model_mapping = language_codes.get(source_language, {}).get(model_type, {})
+    # Determine the correct source language, defaulting to the original language if no mapping is found
+    source_language = SCRIPT_LANGUAGES.get(lang, lang)
+    logger.info(f"Mapped '{lang}' to source language '{source_language}'")
 
-        if not model_mapping:
-            logger.error(f"❌ No {model_type.upper()} model found for language: {source_language}")
-            return False
+    # Fetch the correct model mapping (STT/TTS)
+    model_mapping = language_codes.get(source_language, {}).get(model_type, {})
 
-        # Check if any mapped model is served
-        for model_name in model_mapping.keys():
-            if model_name in served_model_names:
-                logger.info(f"✅ Model '{model_name}' is available for {model_type.upper()}.")
-                return True
+    if not model_mapping:
+        logger.error(f"❌ No {model_type.upper()} model found for language: {source_language}")
+        return False
 
-        logger.warning(f"⚠ No matching {model_type.upper()} model found in served models for '{source_language}'.")
-        raise HTTPException(
-            status_code=400,
-            detail=f"The {model_type.upper()} model is not currently available for this language: {source_language}"
-        )
+    # Check if any mapped model is served
+    for model_name in model_mapping.keys():
+        if model_name in served_model_names:
+            logger.info(f"✅ Model '{model_name}' is available for {model_type.upper()}.")
+            return True
 
-    except requests.exceptions.RequestException as e:
-        logger.error(f"❌ Request error checking served models: {str(e)}")
-        raise HTTPException(status_code=500, detail="Failed to check served models")
+    logger.warning(f"⚠ No matching {model_type.upper()} model found in served models for '{source_language}'.")
+    raise HTTPException(
+        status_code=400,
+        detail=f"The {model_type.upper()} model is not currently available for this language: {source_language}"
+    )
 
 
 def fetch_and_validate_verse(verse_id: int, db: Session, current_user: User) -> dict:
@@ -1824,9 +2775,17 @@ def mark_chapter_unapproved(chapter: Chapter, db: Session):
 
 
 
-def call_stt_api(file_path: str, script_lang: str) -> dict:
+def ai_model_name(lang: str, model_type: str) -> Optional[str]:
+    """
+    Return the name of the model the AI API is called with for a language,
+    i.e. the first "stt" or "tts" model mapped to it, or None if there is none.
+    """
+    return next(iter(language_codes.get(lang, {}).get(model_type, {})), None)
+
+
+def call_stt_api(file_paths: List[str], script_lang: str) -> dict:
     """
-     Calls the AI API to transcribe the given audio file.
+     Calls the AI API to transcribe the given audio files in one batch job.
     """
     
     # AI API Base URL (model_name will be dynamic)
@@ -1851,14 +2810,18 @@ def call_stt_api(file_path: str, script_lang: str) -> dict:
  
     # Prepare API URL
     ai_api_url = f"{TRANSCRIBE_API_URL}?model_name={model_name}&device={device_type}&transcription_language={lang_code}"
-    file_name = os.path.basename(file_path)
     try:
-        with open(file_path, "rb") as audio_file:
-            files_payload = {"files": (file_name, audio_file, "audio/wav")}
+        with ExitStack() as stack:
+            files_payload = [
+                ("files", (os.path.basename(file_path), stack.enter_context(open(file_path, "rb")), "audio/wav"))
+                for file_path in file_paths
+            ]
             headers = {"Authorization": f"Bearer {API_TOKEN}"}
 
             # Send batch request
-            response = requests.post(ai_api_url, files=files_payload, headers=headers)
+            response = ai_client.post(
+                "transcribe", ai_api_url, files=files_payload, headers=headers, read_timeout=STT_SUBMIT_TIMEOUT_SECONDS
+            )
             logger.info(f"AI API Response: {response.status_code} - {response.text}")  
             # Handle API response
             if response.status_code == 201:
@@ -1873,28 +2836,30 @@ def call_stt_api(file_path: str, script_lang: str) -> dict:
 
 
 
-def generate_speech_for_verses(project_id: int, book_code: str, verses, audio_lang: str, db,output_format):
+def generate_speech_for_verses(project_id: int, book_code: str, verse_ids: List[int], audio_lang: str, output_format: str):
     """
-    Generate speech for each verse and update the database, saving files in the appropriate output directory.
+    Work queue task "tts": submit a TTS job for each verse. The job monitor
+    saves the generated audio in the project's output directory once the jobs
+    finish.
     """
     start_time = time.time()
     logger.info(f"[{router.current_time()}] 🟢 TTS conversion started at OBT Backend")
     db_session = SessionLocal()
-    extracted_folder = None
-    temp_audio_dirs = []
     try:
-        # Fetch the project name for creating the output path
+        # Make sure the project exists before submitting any work
         project = db_session.query(Project).filter(Project.project_id == project_id).first()
         if not project:
             raise HTTPException(status_code=404, detail=f"Project {project_id} not found.")
 
-        base_name = project.name.split("(")[0].strip()
-        # Base directory for output
-        output_base_dir = BASE_DIR / str(project_id) / "output" / base_name
-        ingredients_audio_dir = output_base_dir / "audio" / "ingredients"
-        ingredients_audio_dir.mkdir(parents=True, exist_ok=True)
-        temp_audio_dirs = []
-        
+        verses = db_session.query(Verse).filter(Verse.verse_id.in_(verse_ids)).order_by(Verse.verse_id).all()
+        # Skip verses whose job from an earlier attempt is still running on the AI service
+        submitted = {
+            verse_id
+            for (verse_id,) in db_session.query(Job.verse_id).filter(
+                Job.verse_id.in_(verse_ids), Job.status == "in_progress"
+            )
+        }
+        verses = [verse for verse in verses if verse.verse_id not in submitted]
         for verse in verses:
             if verse.tts_msg != "Text-to-speech completed":
                 logger.info(f"Resetting tts_msg for verse {verse.verse_id}.")
@@ -1903,23 +2868,21 @@ def generate_speech_for_verses(project_id: int, book_code: str, verses, audio_la
                 db_session.add(verse)
                 db_session.commit()
  
+        source_language = SCRIPT_LANGUAGES.get(audio_lang, audio_lang)
+        model_name = ai_model_name(source_language, "tts")
         for verse in verses:
             try:
-                chapter = db_session.query(Chapter).filter(Chapter.chapter_id == verse.chapter_id).first()
-                if not chapter:
-                    logger.error(f"Chapter not found for verse ID {verse.verse_id}")
-                    continue
- 
                 # Create a job entry linked to the verse
-                job = Job(verse_id=verse.verse_id, ai_jobid=None, status="pending")
+                job = Job(verse_id=verse.verse_id, ai_jobid=None, status="pending", kind="tts")
                 db_session.add(job)
                 db_session.commit()
                 db_session.refresh(job)
  
                 # Call AI API for text-to-speech
                 logger.info(f"[{router.current_time()}]  Calling TTS AI API for Verse ID {verse.verse_id}")
-                ai_api_start_time = time.time()
-                result = call_tts_api([verse.text], audio_lang,output_format)
+                result = ai_scheduler.submit(
+                    lambda: call_tts_api([verse.text], audio_lang, output_format), project.owner_id, project_id
+                )
                 
                 if "error" in result:
                     # Handle API error
@@ -1932,66 +2895,14 @@ def generate_speech_for_verses(project_id: int, book_code: str, verses, audio_la
                     ai_jobid = result.get("data", {}).get("jobId")
                     job.ai_jobid = ai_jobid
                     job.status = "in_progress"
-                    db_session.add(job)
-                    db_session.commit()
                     logger.info(f"[{router.current_time()}] 🔄 TTS AI Job ID {ai_jobid} received. Monitoring job status...")
  
-                    # Poll AI job status until it's finished
-                    while True:
-                        job_result = check_ai_job_status(ai_jobid)
-                        job_status = job_result.get("data", {}).get("status")
- 
-                        if job_status == "job finished":
-                            ai_api_end_time = time.time()
-                            logger.info(f"[{router.current_time()}]  TTS Conversion for verse completed in {ai_api_end_time - ai_api_start_time:.2f} seconds at AI side")
-                            # Download and extract the audio ZIP file
-                            audio_zip_url = f"{BASE_URL}/assets?job_id={ai_jobid}"
-                            extracted_folder = download_and_extract_audio_zip(audio_zip_url)
-                            if extracted_folder:
-                                temp_audio_dirs.append(extracted_folder)
-                                book_folder = ingredients_audio_dir / book_code
-                                chapter_folder = book_folder / str(chapter.chapter)
-                                os.makedirs(chapter_folder, exist_ok=True)
-
-                                supported_formats = ["wav", "mp3"]
-                                # Find and move the audio file to the appropriate folder
-                                for root, _, files in os.walk(extracted_folder):
-                                    for file in files:
-                                        # if file == "audio_0.wav":
-                                        file_extension = file.split(".")[-1].lower()
-                                        if file.startswith("audio_0") and file_extension in supported_formats:
-                                            # Update filename based on the verse
-                                            base_name = os.path.splitext(verse.name)[0]  # Strip existing extension
-                                            # new_audio_filename = f"{base_name}.wav"  # Add .wav extension
-                                            new_audio_filename = f"{base_name}.{file_extension}"
-                                            new_audio_path = chapter_folder / new_audio_filename
-                                            shutil.move(os.path.join(root, file), new_audio_path)
-                                            new_audio_path = validate_and_resample_wav(str(new_audio_path))
-                                            # Update verse information
-                                            verse.tts_path = str(new_audio_path)
-                                            verse.tts = True
-                                            verse.tts_msg = "Text-to-speech completed"
-                                            job.status = "completed"
-                                            break
-                            else:
-                                verse.tts = False
-                                verse.tts_msg = "Failed to download or extract audio ZIP"
-                                job.status = "failed"
-                            break
-                        elif job_status in ["job failed", "Error"]:
-                            job.status = "failed"
-                            verse.tts = False
-                            verse.tts_msg = "AI TTS job failed"
-                            logger.error(f"[{router.current_time()}]  TTS AI conversion failed for Job ID {ai_jobid}.")
-                            break
-                        time.sleep(5)
- 
                 # Save the updated job and verse statuses
                 db_session.add(job)
                 db_session.add(verse)
                 db_session.commit()
-                end_time = time.time()
-                logger.info(f"[{router.current_time()}] 🕒 TTS conversion for verse completed in {end_time - start_time:.2f} seconds at OBT Backend")
+                if job.status == "in_progress":
+                    job_monitor.watch(job.ai_jobid, "tts", model=model_name, work=len(verse.text or ""))
  
             except Exception as e:
                 # Handle errors during TTS
@@ -2009,27 +2920,185 @@ def generate_speech_for_verses(project_id: int, book_code: str, verses, audio_la
  
     finally:
         db_session.close()
-        
-        # Cleanup temporary directories
-        if temp_audio_dirs:  # Check if temp directories exist
-            for temp_dir in temp_audio_dirs:
-                if os.path.exists(temp_dir):
-                    try:
-                        shutil.rmtree(temp_dir, ignore_errors=True)
-                        logger.info(f"Deleted temporary folder: {temp_dir}")
-                    except Exception as e:
-                        logger.warning(f"Failed to delete temporary folder {temp_dir}: {str(e)}")
- 
-        # Ensure extracted_folder is valid before referencing
-        if extracted_folder and os.path.exists(extracted_folder):
-            input_folder = os.path.dirname(extracted_folder)  # Get parent folder of extracted folder
+        end_time = time.time()
+        logger.info(f"[{router.current_time()}] 🕒 TTS jobs for chapter submitted in {end_time - start_time:.2f} seconds at OBT Backend")
+
+
+def save_tts_audio(extracted_folder: str, verse: Verse, chapter_folder: Path) -> Optional[str]:
+    """
+    Move the generated audio of a verse from the extracted TTS assets into its chapter folder.
+
+    Returns:
+        Optional[str]: Path of the saved audio, or None if the assets hold no audio.
+    """
+    supported_formats = ["wav", "mp3"]
+    for root, _, files in os.walk(extracted_folder):
+        for file in files:
+            file_extension = file.split(".")[-1].lower()
+            if file.startswith("audio_0") and file_extension in supported_formats:
+                os.makedirs(chapter_folder, exist_ok=True)
+                # Update filename based on the verse
+                base_name = os.path.splitext(verse.name)[0]  # Strip existing extension
+                new_audio_path = chapter_folder / f"{base_name}.{file_extension}"
+                shutil.move(os.path.join(root, file), new_audio_path)
+                return validate_and_resample_wav(str(new_audio_path))
+    return None
+
+
+def handle_tts_job(ai_jobid: str, result: dict):
+    """
+    Job monitor handler for TTS jobs: download the generated audio of a finished
+    job into the project's output directory, or mark the verse as failed.
+    """
+    db_session = SessionLocal()
+    try:
+        rows = (
+            db_session.query(Job, Verse, Chapter, Book, Project)
+            .join(Verse, Job.verse_id == Verse.verse_id)
+            .join(Chapter, Verse.chapter_id == Chapter.chapter_id)
+            .join(Book, Chapter.book_id == Book.book_id)
+            .join(Project, Book.project_id == Project.project_id)
+            .filter(Job.ai_jobid == ai_jobid, Job.status == "in_progress")
+            .all()
+        )
+        for job, verse, chapter, book, project in rows:
+            if result.get("data", {}).get("status") != "job finished":
+                job.status = "failed"
+                verse.tts = False
+                verse.tts_msg = "AI TTS job failed"
+                logger.error(f"[{router.current_time()}]  TTS AI conversion failed for Job ID {ai_jobid}.")
+                continue
+            extracted_folder = None
             try:
-                shutil.rmtree(input_folder, ignore_errors=True)
-                logger.info(f"Deleted Input folder: {input_folder}")
+                # Download and extract the audio ZIP file
+                extracted_folder = download_and_extract_audio_zip(f"{BASE_URL}/assets?job_id={ai_jobid}")
+                if not extracted_folder:
+                    verse.tts = False
+                    verse.tts_msg = "Failed to download or extract audio ZIP"
+                    job.status = "failed"
+                    continue
+                base_name = project.name.split("(")[0].strip()
+                chapter_folder = (
+                    BASE_DIR / str(project.project_id) / "output" / base_name
+                    / "audio" / "ingredients" / book.book / str(chapter.chapter)
+                )
+                new_audio_path = save_tts_audio(extracted_folder, verse, chapter_folder)
+                if new_audio_path:
+                    verse.tts_path = str(new_audio_path)
+                    verse.tts = True
+                    verse.tts_msg = "Text-to-speech completed"
+                    job.status = "completed"
+                    logger.info(f"[{router.current_time()}] TTS audio for verse {verse.verse_id} saved at {new_audio_path}")
+                else:
+                    job.status = "failed"
+                    verse.tts = False
+                    verse.tts_msg = "No audio found in the TTS output"
+                    logger.error(f"[{router.current_time()}] TTS output of Job ID {ai_jobid} holds no audio for verse {verse.verse_id}")
             except Exception as e:
-                logger.warning(f"Failed to delete Input folder {input_folder}: {str(e)}")
-        else:
-            logger.info("No extracted_folder found for cleanup.")
+                job.status = "failed"
+                verse.tts = False
+                verse.tts_msg = f"Error during TTS: {str(e)}"
+                logger.error(f"Error during TTS for verse {verse.verse_id}: {str(e)}")
+            finally:
+                if extracted_folder:
+                    shutil.rmtree(extracted_folder, ignore_errors=True)
+        db_session.commit()
+    except Exception:
+        db_session.rollback()
+        raise
+    finally:
+        db_session.close()
+
+
+def handle_legacy_job(ai_jobid: str, result: dict):
+    """
+    Job monitor handler for jobs recorded before jobs had a kind. A finished
+    STT job carries transcriptions in its output; any other finished job is TTS.
+    """
+    job_status = result.get("data", {}).get("status")
+    output = result.get("data", {}).get("output") or {}
+    if job_status == "job finished" and "transcriptions" in output:
+        handle_stt_job(ai_jobid, result)
+    elif job_status == "job finished":
+        handle_tts_job(ai_jobid, result)
+    else:
+        db_session = SessionLocal()
+        try:
+            db_session.query(Job).filter(Job.ai_jobid == ai_jobid, Job.status == "in_progress").update(
+                {Job.status: "failed"}, synchronize_session=False
+            )
+            db_session.commit()
+        finally:
+            db_session.close()
+        logger.error(f"[{router.current_time()}] AI job {ai_jobid} failed.")
+
+
+def recover_ai_jobs() -> dict:
+    """
+    Resume monitoring the AI jobs that were in progress when the app last
+    stopped. The jobs are not submitted again: the job monitor checks the
+    existing AI job ids and its handlers store the transcriptions or download
+    the generated audio as usual.
+
+    Returns:
+        dict: The number of recovered AI jobs per kind.
+    """
+    db_session = SessionLocal()
+    try:
+        in_progress = (
+            db_session.query(Job.ai_jobid, Job.kind)
+            .filter(Job.status == "in_progress", Job.ai_jobid.isnot(None))
+            .distinct()
+            .all()
+        )
+    finally:
+        db_session.close()
+    recovered = {}
+    for ai_jobid, kind in in_progress:
+        kind = kind or "legacy"
+        job_monitor.watch(ai_jobid, kind)
+        recovered[kind] = recovered.get(kind, 0) + 1
+    logger.info(f"Recovered {len(in_progress)} in-progress AI jobs: {recovered}")
+    return recovered
+
+
+def ai_job_kind(ai_jobid: str) -> Optional[str]:
+    """
+    Return the kind of an AI job that is in progress according to the jobs table,
+    "legacy" for jobs recorded without a kind, or None if no job is in progress
+    under the id.
+    """
+    db_session = SessionLocal()
+    try:
+        jobs = (
+            db_session.query(Job.kind)
+            .filter(Job.ai_jobid == ai_jobid, Job.status == "in_progress")
+            .distinct()
+            .all()
+        )
+    finally:
+        db_session.close()
+    if not jobs:
+        return None
+    return jobs[0].kind or "legacy"
+
+
+def settled_ai_jobs(ai_jobids: List[str]) -> set:
+    """
+    Return the AI job ids among the given ones that have no job in progress
+    anymore, e.g. because another process handled their callback.
+    """
+    db_session = SessionLocal()
+    try:
+        in_progress = {
+            ai_jobid
+            for (ai_jobid,) in db_session.query(Job.ai_jobid)
+            .filter(Job.ai_jobid.in_(ai_jobids), Job.status == "in_progress")
+            .distinct()
+        }
+    finally:
+        db_session.close()
+    return set(ai_jobids) - in_progress
 
 
 def download_and_extract_audio_zip(audio_zip_url: str) -> str:
@@ -2037,23 +3106,29 @@ def download_and_extract_audio_zip(audio_zip_url: str) -> str:
     Downloads the audio ZIP file, extracts it, and returns the folder path where files are extracted.
     """
     headers = {"Authorization": f"Bearer {API_TOKEN}"}
-    response = requests.get(audio_zip_url, stream=True,headers=headers)
-    if response.status_code == 200:
-        # Save the ZIP file locally
-        zip_file_path = f"{UPLOAD_DIR}/audio_temp.zip"
-        with open(zip_file_path, "wb") as zip_file:
-            for chunk in response.iter_content(chunk_size=1024):
-                zip_file.write(chunk)
-        # Extract the ZIP file
-        extract_path = f"{UPLOAD_DIR}/temp_audio"
-        os.makedirs(extract_path, exist_ok=True)
-        with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
-            zip_ref.extractall(extract_path)
-        os.remove(zip_file_path)
-        return extract_path
-    else:
-        logger.error(f"Failed to download audio ZIP file: {response.status_code} - {response.text}")
-        return None
+    # Closing the response hands its connection back to the pool, also when the download fails
+    with ai_client.get("download_audio", audio_zip_url, stream=True, headers=headers) as response:
+        if response.status_code != 200:
+            logger.error(f"Failed to download audio ZIP file: {response.status_code} - {response.text}")
+            return None
+        # Save the ZIP file locally, in a folder of its own so that concurrent downloads do not collide
+        os.makedirs(UPLOAD_DIR, exist_ok=True)
+        download_dir = tempfile.mkdtemp(prefix="tts_", dir=UPLOAD_DIR)
+        zip_file_path = os.path.join(download_dir, "audio_temp.zip")
+        try:
+            with open(zip_file_path, "wb") as zip_file:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    zip_file.write(chunk)
+            # Extract the ZIP file
+            extract_path = os.path.join(download_dir, "temp_audio")
+            os.makedirs(extract_path, exist_ok=True)
+            with zipfile.ZipFile(zip_file_path, "r") as zip_ref:
+                zip_ref.extractall(extract_path)
+            os.remove(zip_file_path)
+        except Exception:
+            shutil.rmtree(download_dir, ignore_errors=True)
+            raise
+        return download_dir
 
 def call_tts_api(text: str, audio_lang: str ,output_format:str) -> dict:
     """
@@ -2065,11 +3140,7 @@ def call_tts_api(text: str, audio_lang: str ,output_format:str) -> dict:
     device_type = os.getenv("TTS_DEVICE", "cpu")
  
     # Map audio_lang to source_language
-    source_language = None
-    for item in source_languages:
-        if item["language_name"] == audio_lang:
-            source_language = item["script_language"]
-            break
+    source_language = SCRIPT_LANGUAGES.get(audio_lang)
  
     if not source_language:
         logger.error(f"No source language found for audio_lang: {audio_lang}")
@@ -2084,7 +3155,7 @@ def call_tts_api(text: str, audio_lang: str ,output_format:str) -> dict:
         
         # Select the first available model dynamically
         model_name, lang_code = next(iter(tts_mapping.items()))
-        print("MODELNAME,LANGUAGECODE",model_name, lang_code)
+        logger.debug(f"TTS model {model_name}, language code {lang_code}")
         if not lang_code:
             logger.error(f"No language code found for source_language: {source_language}")
             return {"error": f"No language code found for source_language: {source_language}"}
@@ -2104,7 +3175,7 @@ def call_tts_api(text: str, audio_lang: str ,output_format:str) -> dict:
  
     try:
         # Make the API request
-        response = requests.post(ai_api_url,  json=data_payload, headers=headers)
+        response = ai_client.post("generate_audio", ai_api_url, json=data_payload, headers=headers)
         logger.info(f"AI API Response: {response.status_code} - {response.text}")
  
         # Handle API response
@@ -2284,9 +3355,6 @@ def prepare_project_for_zipping(project: Project):
         temp_audio_dir.mkdir(parents=True, exist_ok=True)
         temp_text_dir.mkdir(parents=True, exist_ok=True)
  
-        # Step 2: Copy the output folder into the temporary directory
-        shutil.copytree(output_dir, temp_dir / "output", dirs_exist_ok=True)
- 
         # Step 3: Process audio files
         input_audio_dir = input_dir / "audio" / "ingredients"
         if not input_audio_dir.exists():
@@ -2322,11 +3390,11 @@ def prepare_project_for_zipping(project: Project):
                                 # Use the output file if it exists, otherwise retain the input file
                                 output_file = output_files.get(input_file.stem)
                                 if output_file:
-                                    shutil.copy(
+                                    link_or_copy(
                                         output_file, temp_chapter_dir / output_file.name
                                     )
                                 else:
-                                    shutil.copy(
+                                    link_or_copy(
                                         input_file, temp_chapter_dir / input_file.name
                                     )
         for additional_file in input_audio_dir.iterdir():
@@ -2368,8 +3436,6 @@ def prepare_project_for_zipping(project: Project):
             shutil.copy(metadata_file, temp_dir / "metadata.json")
             shutil.copy(metadata_file, metadata_text_dir / "metadata.json")
  
-        # Step 6: Remove unnecessary directories
-        shutil.rmtree(temp_dir / "output", ignore_errors=True)
         # Step 7: Rename and zip the directory
         final_dir = base_dir / project.name
         shutil.move(temp_dir, final_dir)
@@ -2392,4 +3458,85 @@ def create_zip_and_return_response(final_dir: Path, zip_path: str, project_name:
         zip_path,
         media_type="application/zip",
         filename=f"{project_name}.zip",
-    )
\ No newline at end of file
+    )
+
+def create_usfm_file(project_id: int, book: str, chapter: Optional[int], db: Session, current_user: User):
+    """
+    Generate a USFM file for a book or specific chapter, replacing missing chapters or verses with placeholders.
+    Blocking; route handlers run it on the export executor.
+    """
+    # Validate project
+    project = get_project(project_id, db, current_user)
+    book_obj = get_book(db, project_id, book)
+    book= book_obj.book 
+    book_id = book_obj.book_id
+    project_id = project.project_id
+    project_base_path = BASE_DIR / str(project_id)
+    input_path = project_base_path / "input"
+    # Load `versification.json`
+    project_input_path = next(input_path.iterdir(), None)
+    if not project_input_path or not project_input_path.is_dir():
+        logger.error("Project directory not found under input path.")
+        raise HTTPException(
+            status_code=400, detail="Project directory not found under input path"
+        )
+    # # Locate versification.json  
+    versification_data = load_versification()   
+    book_metadata = load_metadata()
+    book_info = fetch_book_metadata(book, book_metadata)
+
+    # Fetch chapters and verses
+    if chapter is not None:
+        chapters = (
+        db.query(Chapter)
+        .filter(Chapter.book_id == book_id, Chapter.chapter == chapter)
+        .all()
+        )
+        if not chapters:
+            raise HTTPException(
+            status_code=404,
+            detail=f"Chapter {chapter} not found in book {book}"
+        )
+    else:
+        chapters = db.query(Chapter).filter(Chapter.book_id == book_id).all()
+
+    # Prepare chapter map for downstream USFM generation
+    chapter_map = {ch.chapter: ch for ch in chapters}
+    # Generate USFM content
+    usfm_text = generate_usfm_content(book, book_info, chapter_map, versification_data, db, single_chapter=chapter)
+    return save_and_return_usfm_file(project, book, usfm_text)
+
+
+def create_processed_project_zip(project_id: int, db: Session, current_user: User):
+    """
+    Generate USFM files for every book of a project, then zip the project and return the ZIP.
+    Blocking; route handlers run it on the export executor.
+    """
+    project = db.query(Project).filter(Project.project_id == project_id).first()
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found.")   
+    if current_user.role not in ["AI", "Admin"]  and project.owner_id != current_user.user_id:
+        raise HTTPException(status_code=403, detail="Access denied. Only the project owner or users with the AI role can download the ZIP file")
+     # Step 2: Fetch all books in the project
+    books = db.query(Book).filter(Book.project_id == project_id).all()
+    if not books:
+        raise HTTPException(
+            status_code=404, detail="No books found for the project."
+        )
+    # Step 3: Generate USFM files for all books
+    for book in books:
+        try:
+            create_usfm_file(project_id, book.book, None, db, current_user)
+        except HTTPException as e:
+            # Log the error and proceed with the next book
+            logger.error(f"Failed to generate USFM for book '{book.book}': {e.detail}")
+    final_dir, zip_path = prepare_project_for_zipping(project)
+    # Create and return the ZIP file
+    return create_zip_and_return_response(final_dir, zip_path, project.name)
+
+
+job_monitor.register_handler("stt", handle_stt_job)
+job_monitor.register_handler("tts", handle_tts_job)
+job_monitor.register_handler("legacy", handle_legacy_job)
+work_queue.register_task("stt", run_stt_work)
+work_queue.register_task("tts", generate_speech_for_verses)
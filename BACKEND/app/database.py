@@ -82,6 +82,7 @@ class Verse(Base):
     name = Column(String, nullable=False)  
     path = Column(String, nullable=False)  
     size = Column(Integer, nullable=False)  
+    digest = Column(String, nullable=True)  # SHA-256 of the audio content
     format = Column(String, nullable=False)  
     stt = Column(Boolean, default=False)  
     text = Column(String, default="")  
@@ -98,8 +99,29 @@ class Job(Base):
 
     job_id = Column(Integer, primary_key=True, autoincrement=True)  
     verse_id = Column(Integer, ForeignKey("verse.verse_id"))  
-    ai_jobid = Column(String, unique=True)  
+    ai_jobid = Column(String, index=True)  # shared by all verses of a batch job
     status = Column(String, default="pending") 
+    kind = Column(String, nullable=True)  # "stt" or "tts"
+    created_date = Column(DateTime, default=datetime.datetime.utcnow, nullable=True)
+
+# Durable queue of STT/TTS work, claimed by workers with SELECT ... FOR UPDATE SKIP LOCKED
+class WorkItem(Base):
+    __tablename__ = "work_queue"
+
+    work_id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)  # task name, e.g. "stt" or "tts"
+    payload = Column(JSON, nullable=False)  # keyword arguments of the task
+    status = Column(String, default="queued", nullable=False, index=True)  # queued, running, done, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    max_attempts = Column(Integer, default=3, nullable=False)
+    # Items triggered by a user are claimed before bulk work queued earlier
+    interactive = Column(Boolean, default=True, server_default=text("true"), nullable=False)
+    available_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
+    locked_until = Column(DateTime, nullable=True)  # a running item past this time is claimed again
+    locked_by = Column(String, nullable=True)
+    last_error = Column(String, nullable=True)
+    created_date = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_date = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
 
 # Create Tables in Database
 def init_db():
@@ -0,0 +1,114 @@
+"""
+In-memory registry of the project ingestion jobs started by POST /projects.
+
+The API runs as a single uvicorn process, so the status of each ingestion is
+kept in this process. Finished entries are dropped after
+INGESTION_STATUS_TTL_SECONDS.
+"""
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+from dotenv import load_dotenv
+
+from dependency import logger
+
+load_dotenv()
+
+INGESTION_STATUS_TTL_SECONDS = int(os.getenv("INGESTION_STATUS_TTL_SECONDS", "86400"))
+
+# Ingestion phases, in the order a successful ingestion goes through them
+PHASES = ("queued", "validating", "extracting", "inserting", "done")
+
+_ingestions = {}
+_lock = threading.Lock()
+
+
+def _prune_finished():
+    """Drop finished ingestions older than the TTL. Call with the lock held."""
+    cutoff = time.time() - INGESTION_STATUS_TTL_SECONDS
+    expired = [
+        ingestion_id
+        for ingestion_id, entry in _ingestions.items()
+        if entry["status"] in ("completed", "failed") and entry["updated_at"] < cutoff
+    ]
+    for ingestion_id in expired:
+        del _ingestions[ingestion_id]
+
+
+def create_ingestion(user_id: int, file_name: str) -> str:
+    """
+    Register a new ingestion for an uploaded project ZIP.
+
+    Returns:
+        str: The ingestion id.
+    """
+    ingestion_id = uuid.uuid4().hex
+    now = time.time()
+    with _lock:
+        _prune_finished()
+        _ingestions[ingestion_id] = {
+            "ingestion_id": ingestion_id,
+            "user_id": user_id,
+            "file_name": file_name,
+            "status": "queued",
+            "phase": "queued",
+            "project_id": None,
+            # Planned totals and progress so far
+            "totals": {"books": 0, "chapters": 0, "verses": 0, "files": 0},
+            "processed": {"books": 0, "chapters": 0, "verses": 0, "files": 0},
+            "incompartible_verses": [],
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+    logger.info(f"Ingestion {ingestion_id} queued for {file_name}")
+    return ingestion_id
+
+
+def update_ingestion(ingestion_id: str, totals: dict = None, processed: dict = None, **fields):
+    """
+    Update an ingestion entry. `totals` and `processed` are merged into the
+    existing counters; any other keyword replaces the field of the same name.
+    """
+    with _lock:
+        entry = _ingestions.get(ingestion_id)
+        if entry is None:
+            return
+        if totals:
+            entry["totals"].update(totals)
+        if processed:
+            entry["processed"].update(processed)
+        entry.update(fields)
+        entry["updated_at"] = time.time()
+
+
+def complete_ingestion(ingestion_id: str, incompartible_verses: list):
+    """Mark an ingestion as completed."""
+    update_ingestion(
+        ingestion_id, status="completed", phase="done", incompartible_verses=incompartible_verses
+    )
+    logger.info(f"Ingestion {ingestion_id} completed")
+
+
+def fail_ingestion(ingestion_id: str, status_code: int, detail):
+    """Mark an ingestion as failed, keeping the HTTP status and detail of the error."""
+    update_ingestion(
+        ingestion_id, status="failed", error={"status_code": status_code, "detail": detail}
+    )
+    logger.error(f"Ingestion {ingestion_id} failed: {detail}")
+
+
+def get_ingestion(ingestion_id: str) -> Optional[dict]:
+    """Return a snapshot of an ingestion entry, or None if it is unknown or expired."""
+    with _lock:
+        entry = _ingestions.get(ingestion_id)
+        if entry is None:
+            return None
+        return {
+            **entry,
+            "totals": dict(entry["totals"]),
+            "processed": dict(entry["processed"]),
+            "incompartible_verses": list(entry["incompartible_verses"]),
+        }
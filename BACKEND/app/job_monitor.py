@@ -0,0 +1,362 @@
+"""
+Central monitor for the jobs submitted to the AI service.
+
+STT and TTS pipelines submit their work, hand the returned AI job ids to
+`watch` and finish. One poller thread checks the jobs that are due, with the
+status requests spread over a pool of JOB_MONITOR_WORKERS threads. Checks do
+not wait for each other: a status request stuck on its read timeout only holds
+back its own job. When a job finishes or fails, the handler registered for its kind is called with the job
+status response and the job is no longer watched. The number of threads is
+fixed, however many chapters are being processed.
+
+Each job has its own polling schedule:
+- The first check is at the job's expected duration, learned per kind and
+  model as an average of seconds per unit of work (audio bytes for STT, text
+  characters for TTS). Without history the job is checked after
+  JOB_MONITOR_MIN_POLL_SECONDS.
+- A job still running past that is checked again after a quarter of its age,
+  so long jobs in a queue are polled less and less often.
+- Failed status requests back off exponentially. After JOB_MONITOR_MAX_ERRORS
+  failures in a row the job is handed to its handler as failed.
+All intervals stay between JOB_MONITOR_MIN_POLL_SECONDS and
+JOB_MONITOR_MAX_POLL_SECONDS and get ±20% jitter, so jobs submitted together
+do not poll in lockstep.
+
+When AI_CALLBACK_TOKEN is set, the AI service reports completions to
+POST /ai-callback, which hands them to `complete`. Polling is then only a
+safety net for lost callbacks and runs at most every
+JOB_MONITOR_SAFETY_POLL_SECONDS.
+
+Jobs submitted by work queue workers are watched in the worker's process, but
+their callbacks reach the API process. There `complete` finds the job in the
+jobs table and runs the handler of its kind. The worker's monitor checks the
+jobs table every SETTLED_CHECK_SECONDS and drops the jobs handled elsewhere,
+which frees their AI slots. Handlers only update jobs still in progress, so a
+job handled twice is stored once.
+"""
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+import ai_scheduler
+import crud
+from dependency import logger
+
+load_dotenv()
+
+JOB_MONITOR_MIN_POLL_SECONDS = float(os.getenv("JOB_MONITOR_MIN_POLL_SECONDS", "2"))
+JOB_MONITOR_MAX_POLL_SECONDS = float(os.getenv("JOB_MONITOR_MAX_POLL_SECONDS", "60"))
+JOB_MONITOR_MAX_ERRORS = int(os.getenv("JOB_MONITOR_MAX_ERRORS", "5"))
+JOB_MONITOR_WORKERS = int(os.getenv("JOB_MONITOR_WORKERS", "8"))
+JOB_MONITOR_SAFETY_POLL_SECONDS = float(os.getenv("JOB_MONITOR_SAFETY_POLL_SECONDS", "300"))
+# Shared secret the AI service sends with completion callbacks; callbacks are disabled without it
+AI_CALLBACK_TOKEN = os.getenv("AI_CALLBACK_TOKEN")
+
+# Job statuses after which the AI service does no more work on a job
+FINAL_STATUSES = ("job finished", "job failed", "Error")
+# Weight of the latest job in the average duration per unit of work
+HISTORY_WEIGHT = 0.3
+# Seconds between checks for watched jobs whose callback another process handled
+SETTLED_CHECK_SECONDS = 10
+
+_handlers = {}  # Format: {kind: handler(ai_jobid, result)}
+_jobs = {}  # Format: {ai_jobid: entry}, see `watch`
+_checks = {}  # Format: {ai_jobid: future of the status check running for the job}
+_seconds_per_unit = {}  # Format: {(kind, model): average seconds per unit of work}
+# Counters reported by `stats`
+_stats = {"busy": 0, "checks": 0, "failed_checks": 0, "completed": 0, "callbacks": 0}
+_lock = threading.Lock()
+_wakeup = threading.Event()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def register_handler(kind: str, handler: Callable[[str, dict], None]):
+    """
+    Register the function that handles finished jobs of a kind, e.g. "stt" or "tts".
+    The handler receives the AI job id and the job status response.
+    """
+    _handlers[kind] = handler
+
+
+def watch(ai_jobid: str, kind: str, model: Optional[str] = None, work: float = 0):
+    """
+    Start monitoring an AI job until it finishes or fails.
+
+    Args:
+        ai_jobid (str): The job id returned by the AI service.
+        kind (str): The kind of job, which selects its handler.
+        model (Optional[str]): The AI model running the job; jobs of the same
+            kind and model share their duration history.
+        work (float): Size of the job, e.g. audio bytes or text characters.
+    """
+    now = time.time()
+    with _lock:
+        rate = _seconds_per_unit.get((kind, model))
+        entry = {
+            "kind": kind,
+            "model": model,
+            "work": work,
+            "expected": rate * work if rate is not None and work else None,
+            "errors": 0,
+            "checks": 0,
+            "watched_at": now,
+        }
+        entry["next_check"] = now + _next_interval(entry, now)
+        _jobs[ai_jobid] = entry
+    _wakeup.set()
+    start()
+
+
+def watched_jobs() -> dict:
+    """Return the number of monitored jobs per kind."""
+    with _lock:
+        counts = {}
+        for entry in _jobs.values():
+            counts[entry["kind"]] = counts.get(entry["kind"], 0) + 1
+        return counts
+
+
+def stats() -> dict:
+    """
+    Saturation metrics of the monitor: how busy its workers are and how far
+    status checks lag behind their schedule. A growing lag means the workers
+    cannot keep up with the number of watched jobs.
+    """
+    now = time.time()
+    with _lock:
+        overdue = [now - entry["next_check"] for entry in _jobs.values() if entry["next_check"] < now]
+        counters = dict(_stats)
+        watched = len(_jobs)
+    return {
+        "workers": JOB_MONITOR_WORKERS,
+        "busy": counters["busy"],
+        "utilization": counters["busy"] / JOB_MONITOR_WORKERS,
+        "watched": watched,
+        "watched_by_kind": watched_jobs(),
+        "overdue": len(overdue),
+        "max_lag_seconds": max(overdue, default=0),
+        "checks": counters["checks"],
+        "failed_checks": counters["failed_checks"],
+        "completed": counters["completed"],
+        "callbacks": counters["callbacks"],
+    }
+
+
+def start():
+    """Start the poller thread if it is not running yet."""
+    global _thread, _executor
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop.clear()
+        _executor = ThreadPoolExecutor(max_workers=JOB_MONITOR_WORKERS, thread_name_prefix="job_monitor")
+        _thread = threading.Thread(target=_run, name="job_monitor_poller", daemon=True)
+        _thread.start()
+    logger.info(
+        f"AI job monitor started: polling every {JOB_MONITOR_MIN_POLL_SECONDS}-{JOB_MONITOR_MAX_POLL_SECONDS} "
+        f"seconds with {JOB_MONITOR_WORKERS} workers"
+    )
+
+
+def stop():
+    """Stop polling. Jobs still running on the AI service stay recorded as in progress."""
+    global _thread, _executor
+    _stop.set()
+    _wakeup.set()
+    if _thread is not None:
+        _thread.join()
+        _thread = None
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _next_interval(entry: dict, now: float) -> float:
+    """Seconds until the next status check of a job."""
+    elapsed = now - entry["watched_at"]
+    if entry["errors"]:
+        interval = JOB_MONITOR_MIN_POLL_SECONDS * 2 ** entry["errors"]
+    elif entry["expected"] is not None and elapsed < entry["expected"]:
+        interval = entry["expected"] - elapsed
+    else:
+        interval = elapsed / 4
+    interval = min(max(interval, JOB_MONITOR_MIN_POLL_SECONDS), JOB_MONITOR_MAX_POLL_SECONDS)
+    if AI_CALLBACK_TOKEN and not entry["errors"]:
+        # Completions arrive by callback; polling only catches the ones that got lost
+        interval = max(interval, JOB_MONITOR_SAFETY_POLL_SECONDS)
+    return interval * random.uniform(0.8, 1.2)
+
+
+def _record_duration(entry: dict, duration: float):
+    """Fold the duration of a finished job into the history of its kind and model."""
+    if not entry["work"]:
+        return
+    key = (entry["kind"], entry["model"])
+    rate = duration / entry["work"]
+    with _lock:
+        previous = _seconds_per_unit.get(key)
+        _seconds_per_unit[key] = rate if previous is None else (
+            HISTORY_WEIGHT * rate + (1 - HISTORY_WEIGHT) * previous
+        )
+
+
+def _check(ai_jobid: str, entry: dict):
+    """Check one job, and reschedule it or hand it to its handler once it is final."""
+    with _lock:
+        _stats["busy"] += 1
+    try:
+        _check_status(ai_jobid, entry)
+    finally:
+        with _lock:
+            _stats["busy"] -= 1
+
+
+def _check_status(ai_jobid: str, entry: dict):
+    result = crud.check_ai_job_status(ai_jobid)
+    job_status = result.get("data", {}).get("status")
+    now = time.time()
+    logger.info(f"⏳ AI Job {ai_jobid} Status: {job_status}")
+    entry["checks"] += 1
+    # check_ai_job_status sets "error" when the status itself could not be fetched
+    failed_request = "error" in result
+    if failed_request:
+        entry["errors"] += 1
+    else:
+        entry["errors"] = 0
+    with _lock:
+        _stats["checks"] += 1
+        _stats["failed_checks"] += failed_request
+    if job_status not in FINAL_STATUSES or (failed_request and entry["errors"] < JOB_MONITOR_MAX_ERRORS):
+        with _lock:
+            entry["next_check"] = now + _next_interval(entry, now)
+        return
+
+    with _lock:
+        if _jobs.pop(ai_jobid, None) is None:
+            # Already completed by a callback
+            return
+    _finish(ai_jobid, entry, result, now)
+
+
+def complete(ai_jobid: str, result: dict) -> bool:
+    """
+    Complete a job from a callback of the AI service. The handler runs on the
+    monitor's workers. A job watched by another process, e.g. a work queue
+    worker, is found in the jobs table.
+
+    Args:
+        ai_jobid (str): The AI job id.
+        result (dict): The job in the shape of a job status response.
+
+    Returns:
+        bool: False if the job is not in progress, e.g. because it already completed.
+    """
+    with _lock:
+        entry = _jobs.pop(ai_jobid, None)
+    if entry is None:
+        kind = crud.ai_job_kind(ai_jobid)
+        if kind is None:
+            return False
+        entry = {
+            "kind": kind,
+            "model": None,
+            "work": 0,
+            "expected": None,
+            "errors": 0,
+            "checks": 0,
+            "watched_at": time.time(),
+        }
+    with _lock:
+        _stats["callbacks"] += 1
+    start()
+    _executor.submit(_finish, ai_jobid, entry, result, time.time())
+    return True
+
+
+def _finish(ai_jobid: str, entry: dict, result: dict, now: float):
+    """Free the AI slot of a final job, record its duration and hand it to the handler of its kind."""
+    ai_scheduler.finished(ai_jobid)
+    job_status = result.get("data", {}).get("status")
+    duration = now - entry["watched_at"]
+    with _lock:
+        _stats["completed"] += 1
+    if job_status == "job finished":
+        _record_duration(entry, duration)
+    logger.info(
+        f"AI {entry['kind'].upper()} job {ai_jobid} ended with '{job_status}' after {duration:.2f} seconds "
+        f"and {entry['checks']} status checks (expected {entry['expected'] or 0:.2f} seconds)"
+    )
+    handler = _handlers.get(entry["kind"])
+    if handler is None:
+        logger.error(f"No handler registered for AI job kind '{entry['kind']}'")
+        return
+    try:
+        handler(ai_jobid, result)
+    except Exception as e:
+        logger.error(f"Error handling AI job {ai_jobid}: {str(e)}")
+
+
+def _drop_settled_jobs():
+    """Stop watching the jobs whose callback another process handled and free their AI slots."""
+    with _lock:
+        watched = list(_jobs)
+    if not watched:
+        return
+    try:
+        settled = crud.settled_ai_jobs(watched)
+    except Exception as e:
+        logger.error(f"Failed to check for AI jobs completed elsewhere: {str(e)}")
+        return
+    for ai_jobid in settled:
+        with _lock:
+            entry = _jobs.pop(ai_jobid, None)
+        if entry is None:
+            continue
+        ai_scheduler.finished(ai_jobid)
+        logger.info(f"AI {entry['kind'].upper()} job {ai_jobid} was completed by another process")
+
+
+def _check_done(ai_jobid: str):
+    with _lock:
+        _checks.pop(ai_jobid, None)
+    # The job has a new next check, or is gone
+    _wakeup.set()
+
+
+def _run():
+    next_settled_check = time.time() + SETTLED_CHECK_SECONDS
+    while not _stop.is_set():
+        # Cleared before looking at the jobs, so a job watched from now on cuts the wait short
+        _wakeup.clear()
+        now = time.time()
+        if AI_CALLBACK_TOKEN and now >= next_settled_check:
+            _drop_settled_jobs()
+            next_settled_check = now + SETTLED_CHECK_SECONDS
+        with _lock:
+            # A job whose check is still running is not checked again until that check is done
+            due = [
+                (ai_jobid, entry) for ai_jobid, entry in _jobs.items()
+                if entry["next_check"] <= now and ai_jobid not in _checks
+            ]
+            # Each check runs on its own, so a slow status request delays no other job
+            started = [(ai_jobid, _executor.submit(_check, ai_jobid, entry)) for ai_jobid, entry in due]
+            _checks.update(started)
+        for ai_jobid, future in started:
+            future.add_done_callback(lambda _, ai_jobid=ai_jobid: _check_done(ai_jobid))
+        with _lock:
+            next_check = min(
+                (entry["next_check"] for ai_jobid, entry in _jobs.items() if ai_jobid not in _checks),
+                default=None,
+            )
+            watching = bool(_jobs)
+        timeout = JOB_MONITOR_MAX_POLL_SECONDS if next_check is None else max(next_check - time.time(), 0)
+        if AI_CALLBACK_TOKEN and watching:
+            timeout = min(timeout, max(next_settled_check - time.time(), 0))
+        _wakeup.wait(timeout)
@@ -1,7 +1,15 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 import logging
+import threading
 from database import init_db
 import router
+import crud
+import workers
+import uploads
+import job_monitor
+import served_models
+import work_queue
 from fastapi.middleware.cors import CORSMiddleware
 
 logging.basicConfig(level=logging.INFO)
@@ -15,6 +23,47 @@ init_db()
 app = FastAPI(version="1.0.9")
 
 
+@app.on_event("startup")
+async def configure_workers():
+    workers.configure_threadpool()
+
+
+@app.on_event("startup")
+def prune_storage():
+    # Blobs of deleted books and projects, and abandoned upload sessions, are reclaimed off the request path
+    threading.Thread(target=crud.prune_blob_store, name="blob_prune", daemon=True).start()
+    threading.Thread(target=uploads.prune_upload_sessions, name="upload_prune", daemon=True).start()
+
+
+@app.on_event("startup")
+def start_job_monitor():
+    served_models.start()
+    job_monitor.start()
+    # Pick up AI jobs submitted before the restart instead of submitting them again
+    crud.recover_ai_jobs()
+    work_queue.start()
+
+
+@app.on_event("shutdown")
+def shutdown_workers():
+    work_queue.stop()
+    job_monitor.stop()
+    served_models.stop()
+    workers.shutdown()
+
+
+# Reject oversized uploads from the Content-Length header before the body is read.
+# Registered before CORS so that the rejection still carries CORS headers.
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    if crud.upload_too_large(request.headers.get("content-length")):
+        return JSONResponse(
+            status_code=413,
+            content={"detail": f"Uploaded file exceeds the {crud.MAX_UPLOAD_SIZE_MB} MB limit"},
+        )
+    return await call_next(request)
+
+
 # ToDo: Add CORS when deploying to server to allow only UI origin
 
 app.add_middleware(
@@ -1,6 +1,7 @@
 from typing import Optional
 from fastapi import Depends, File, UploadFile, HTTPException, APIRouter, Query,BackgroundTasks
 from fastapi.responses import FileResponse ,StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 from pathlib import Path
@@ -12,6 +13,15 @@ import logging
 import auth
 import dependency
 import crud
+import ingestion
+import uploads
+import workers
+import work_queue
+import job_monitor
+import ai_client
+import ai_scheduler
+import served_models
+import hmac
 import shutil
 import datetime
 from pydantic import EmailStr
@@ -25,7 +35,7 @@ import shutil, time, uuid, os
 from pathlib import Path
 from typing import List, Optional, Tuple
 from typing import List, Optional, Literal
-from fastapi import APIRouter, Body, Depends, HTTPException, File, UploadFile, Form, Query
+from fastapi import APIRouter, Body, Depends, HTTPException, File, UploadFile, Form, Query, Request, Response, Header
 from pydantic import BaseModel,Field
 
 
@@ -58,7 +68,7 @@ router = APIRouter()
 
 
 @router.get("/admin/logs", tags=["Admin"])
-async def get_logs(current_user: dict = Depends(auth.get_current_user)):
+def get_logs(current_user: dict = Depends(auth.get_current_user)):
     """
     Return the main log file. Restricted to admin users.
     """
@@ -76,6 +86,52 @@ async def get_logs(current_user: dict = Depends(auth.get_current_user)):
 
 
 
+@router.get("/admin/workers", tags=["Admin"])
+async def get_worker_stats(
+    db: Session = Depends(dependency.get_db),
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Report how busy the worker pools of this process are. Restricted to admin users.
+
+    Covers the request threadpool, the export executor, the STT/TTS work queue
+    (including the backlog shared by all worker processes), the AI job monitor,
+    the AI scheduler's queue per user and the latency of the calls to the AI service.
+    """
+    if current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Access denied")
+    work_queue_stats = await run_in_threadpool(work_queue.stats, db)
+    return {
+        "message": "Worker statistics retrieved successfully",
+        "data": {
+            **workers.stats(),
+            "work_queue": work_queue_stats,
+            "job_monitor": job_monitor.stats(),
+            "ai_scheduler": ai_scheduler.stats(),
+            "ai_client": ai_client.stats(),
+        },
+    }
+
+
+@router.post("/admin/served-models/refresh", tags=["Admin"])
+def refresh_served_models(current_user: User = Depends(auth.get_current_user)):
+    """
+    Drop the cached list of models served by the AI service and fetch it again,
+    e.g. after models were deployed or removed. Restricted to admin users.
+    """
+    if current_user.role != "Admin":
+        raise HTTPException(status_code=403, detail="Access denied")
+    try:
+        cache = served_models.refresh()
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to refresh served models: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to fetch served models")
+    logger.info(f"Served models cache refreshed by admin {current_user.username}")
+    return {"message": "Served models refreshed successfully", "data": cache}
+
+
 # Create User API
 @router.post("/user/signup/", tags=["User"])
 async def user_signup(
@@ -92,28 +148,8 @@ async def user_signup(
             status_code=400,
             detail="All fields (username, email, password) are required.",
         )
-    # Check if the username already exists
-    existing_user = db.query(User).filter(User.username == username).first()
-    if existing_user:
-        logger.warning(f"Signup failed: Username '{username}' already exists")
-        raise HTTPException(
-            status_code=400,
-            detail=f"Username '{username}' already exists. Please choose a different username.",
-        )
-    # Check if the email already exists
-    existing_email = db.query(User).filter(User.email == email).first()
-    if existing_email:
-        logger.warning(f"Signup failed: Email '{email}' already exists")
-        raise HTTPException(
-            status_code=400,
-            detail=f"Email '{email}' already exists. Please use a different email.",
-        )
-    # Hash the password and create the user
-    hashed_password = auth.get_password_hash(password)
-    new_user = User(username=username, email=email, hashed_password=hashed_password)
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    # Checking, hashing and inserting block, so they run on the threadpool
+    new_user = await run_in_threadpool(crud.create_user, db, username, email, password)
     logger.info(f"User created successfully: {username}")
      # --- Send welcome/signup email ---
     subject = "Welcome to AIOBT!"
@@ -143,7 +179,7 @@ async def user_signup(
 
 
 @router.put("/user/updatePassword/", tags=["User"])
-async def update_password(
+def update_password(
     current_password: str,
     new_password: str,
     db: Session = Depends(dependency.get_db),
@@ -199,7 +235,7 @@ async def forgot_password(email: EmailStr, db: Session = Depends(dependency.get_
     """
     logger.info(f"Forgot password request initiated for email: {email}")
     
-    user = db.query(User).filter(User.email == email).first()
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email).first())
     if not user:
         logger.warning(f"Forgot password failed: Email '{email}' not found")
         raise HTTPException(status_code=404, detail="Email not registered")
@@ -243,7 +279,7 @@ async def forgot_password(email: EmailStr, db: Session = Depends(dependency.get_
         )
 
 @router.post("/user/reset_password/", tags=["User"])
-async def reset_password(
+def reset_password(
     token: str,
     new_password: str,
     db: Session = Depends(dependency.get_db),
@@ -271,7 +307,7 @@ async def reset_password(
 
 
 @router.post("/user/logout/", tags=["User"])
-async def logout(
+def logout(
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
 ):
@@ -289,7 +325,7 @@ async def logout(
 
 
 @router.get("/user/", tags=["User"])
-async def get_user_details(
+def get_user_details(
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
 ):
@@ -311,8 +347,20 @@ async def get_user_details(
 
 
 
+@router.get("/user/ai-queue", tags=["User"])
+def get_user_ai_queue(current_user: User = Depends(auth.get_current_user)):
+    """
+    Report the current user's AI jobs in flight, the submissions waiting for a
+    slot and how long they waited.
+    """
+    return {
+        "message": "AI queue retrieved successfully",
+        "data": ai_scheduler.stats(current_user.user_id),
+    }
+
+
 @router.get("/users/", tags=["User"])
-async def get_all_users(
+def get_all_users(
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
 ):
@@ -347,7 +395,7 @@ async def get_all_users(
 
 
 @router.put("/user/", tags=["User"])
-async def update_user(
+def update_user(
     user_id: int,
     role: Optional[str] = None,
     active: Optional[bool] = True,
@@ -379,54 +427,76 @@ async def update_user(
 
 
 
-@router.post("/projects", tags=["Project"])
+@router.post("/projects", tags=["Project"], status_code=202)
 async def upload_zip(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    db: Session = Depends(dependency.get_db),
     current_user: dict = Depends(auth.get_current_user),
 ):
     """
-    Upload a ZIP file, create a project entry, and store the files in the appropriate folder structure.
+    Upload a project ZIP file and start its ingestion in the background.
+
+    The upload is validated and persisted before responding with 202 and an
+    ingestion id; creating the project, writing its files and populating the
+    books, chapters and verses then runs as a tracked job whose progress is
+    reported by `/ingestion-status/{ingestion_id}`.
     """
+    workspace = await run_in_threadpool(crud.create_upload_workspace)
     try:
-        # Process the uploaded ZIP file (validate, save, extract)
-        temp_extract_path = await crud.process_uploaded_zip(file)
-        # Locate metadata.json and read its content
-        metadata_content = crud.read_metadata(temp_extract_path)
-        # Generate a unique project name
-        project_name = crud.generate_unique_project_name(metadata_content, db)
-        # Insert the project into the database
-        project = crud.create_project_entry(project_name, current_user, db)
-        project_id = project.project_id
-        # Create required project directories
-        input_path, output_path = crud.create_project_folders(project, metadata_content)
-        # Move extracted files to the input folder
-        crud.move_extracted_files(temp_extract_path, input_path)
-        # Process the project files (e.g., books, chapters, verses)
-        result = crud.process_project_files(input_path, output_path, db, project)
-        return {
-            "message": "Project uploaded successfully",
-            "project_id": project_id,
-            "result": result,
-        }
+        # Validate and save the uploaded ZIP file into the workspace
+        zip_path = await crud.process_uploaded_zip(file, workspace)
     except zipfile.BadZipFile:
+        await run_in_threadpool(crud.remove_upload_workspace, workspace)
         raise HTTPException(
             status_code=400, detail="The file is not a valid ZIP archive"
         )
-        
-    except HTTPException as e:
-        # Clean up any partially created project folder or DB entries
-        if 'project' in locals() and project:
-            db.delete(project)
-            db.commit()
-            project_base_path = BASE_DIR / str(project.project_id)
-            if project_base_path.exists():
-                shutil.rmtree(project_base_path)
-        raise e
-    
+    except HTTPException:
+        await run_in_threadpool(crud.remove_upload_workspace, workspace)
+        raise
     except Exception as e:
+        await run_in_threadpool(crud.remove_upload_workspace, workspace)
         logger.error(f"An error occurred: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+    return queue_project_ingestion(background_tasks, workspace, zip_path, current_user, file.filename)
+
+
+def queue_project_ingestion(
+    background_tasks: BackgroundTasks, workspace: Path, zip_path: Path, current_user: User, file_name: str
+) -> dict:
+    """
+    Register an ingestion for a saved project ZIP and run it after the response is sent.
+    The background job owns the workspace from here on.
+    """
+    ingestion_id = ingestion.create_ingestion(current_user.user_id, file_name)
+    background_tasks.add_task(
+        crud.ingest_project, ingestion_id, workspace, zip_path, current_user.user_id
+    )
+    return {
+        "message": "Project upload accepted for processing",
+        "ingestion_id": ingestion_id,
+    }
+
+
+@router.get("/ingestion-status/{ingestion_id}", tags=["Project"])
+async def get_ingestion_status(
+    ingestion_id: str,
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    API to check the progress of a project ingestion started by POST /projects.
+
+    Reports the status (queued, in_progress, completed, failed), the phase
+    (validating, extracting, inserting, done), the planned and processed counts
+    of books, chapters, verses and files, and on completion the project id and
+    the incompatible verse files that were skipped.
+    """
+    entry = ingestion.get_ingestion(ingestion_id)
+    if not entry or (
+        entry["user_id"] != current_user.user_id
+        and getattr(current_user, "role", None) not in ["Admin"]
+    ):
+        raise HTTPException(status_code=404, detail="Ingestion not found")
+    return {"message": "Ingestion status retrieved successfully", "data": entry}
     
 
 
@@ -446,12 +516,14 @@ async def add_new_book_zip(
     - file: The uploaded ZIP file containing the book structure.
     """
     try:
-        # Step 1: Process the ZIP file (Extract, Validate)
-        book_data  = await crud.process_book_zip(
-            project_id, file, db, current_user
-        )
-        # Step 2: Save book data to project (Move, Validate, Store in DB)
-        return crud.save_book_to_project(**book_data, db=db)
+        # Each upload gets its own workspace, removed once processing ends
+        async with crud.async_upload_workspace() as workspace:
+            # Step 1: Process the ZIP file (Extract, Validate)
+            book_data  = await crud.process_book_zip(
+                project_id, file, db, current_user, workspace
+            )
+            # Step 2: Save book data to project (Move, Validate, Store in DB) on the threadpool
+            return await run_in_threadpool(crud.save_book_to_project, **book_data, db=db)
     except HTTPException as http_exc:
         logger.error(f"HTTP Exception: {http_exc.detail}")
         raise
@@ -460,8 +532,134 @@ async def add_new_book_zip(
         raise HTTPException(status_code=500, detail="An error occurred while adding the book")
 
  
+class UploadSessionRequest(BaseModel):
+    file_name: str
+    total_size: int = Field(..., gt=0)
+    checksum: str = Field(..., description="SHA-256 hex digest of the whole file")
+    kind: Literal["project", "book"] = "project"
+    project_id: Optional[int] = None
+
+
+@router.post("/uploads", tags=["Upload"], status_code=201)
+def create_upload_session(
+    upload_request: UploadSessionRequest,
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Start a resumable upload of a project ZIP (kind "project") or of a book ZIP
+    for an existing project (kind "book", with project_id).
+
+    Send the file with PUT /uploads/{upload_id}?offset=N in any number of chunks,
+    check the offset with GET /uploads/{upload_id} after an interruption, and
+    finish with POST /uploads/{upload_id}/complete.
+    """
+    session = uploads.create_upload_session(
+        user_id=current_user.user_id,
+        file_name=upload_request.file_name,
+        total_size=upload_request.total_size,
+        checksum=upload_request.checksum,
+        kind=upload_request.kind,
+        max_size=crud.MAX_UPLOAD_SIZE_BYTES,
+        project_id=upload_request.project_id,
+    )
+    return {"message": "Upload session created", "data": session}
+
+
+@router.get("/uploads/{upload_id}", tags=["Upload"])
+def get_upload_session(
+    upload_id: str,
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Return an upload session; its `offset` is where the next chunk must start.
+    """
+    session = uploads.get_upload_session(upload_id, current_user.user_id)
+    return {"message": "Upload session retrieved successfully", "data": session}
+
+
+@router.put("/uploads/{upload_id}", tags=["Upload"])
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    chunk_checksum: Optional[str] = Query(None, description="Optional SHA-256 hex digest of this chunk"),
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Append the raw request body to an upload session at `offset`.
+    A wrong offset is answered with 409 and the offset to resume from.
+    """
+    session = await uploads.append_chunk(
+        upload_id, current_user.user_id, offset, request, chunk_checksum
+    )
+    return {"message": "Chunk received", "data": session}
+
+
+@router.post("/uploads/{upload_id}/complete", tags=["Upload"])
+def complete_upload(
+    upload_id: str,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(dependency.get_db),
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Verify a finished upload against its checksum and process it like a direct upload:
+    a project ZIP starts a background ingestion (202 with an ingestion id, as
+    POST /projects), a book ZIP is added to its project (as /projects/{project_id}/add-book).
+    """
+    session = uploads.get_upload_session(upload_id, current_user.user_id)
+    if session["kind"] == "project":
+        workspace = crud.create_upload_workspace()
+        try:
+            zip_path = workspace / "upload.zip"
+            uploads.complete_upload_session(upload_id, current_user.user_id, zip_path)
+            crud.validate_project_zip(zip_path)
+        except zipfile.BadZipFile:
+            crud.remove_upload_workspace(workspace)
+            raise HTTPException(
+                status_code=400, detail="The file is not a valid ZIP archive"
+            )
+        except HTTPException:
+            crud.remove_upload_workspace(workspace)
+            raise
+        except Exception as e:
+            crud.remove_upload_workspace(workspace)
+            logger.error(f"An error occurred: {str(e)}")
+            raise HTTPException(status_code=500, detail=str(e))
+        response.status_code = 202
+        return queue_project_ingestion(background_tasks, workspace, zip_path, current_user, session["file_name"])
+
+    try:
+        with crud.upload_workspace() as workspace:
+            book_data = crud.prepare_book_upload(
+                session["project_id"], session["file_name"], db, current_user
+            )
+            uploads.complete_upload_session(upload_id, current_user.user_id, workspace / "upload.zip")
+            zip_data = crud.extract_saved_book_zip(workspace)
+            return crud.save_book_to_project(**book_data, **zip_data, db=db)
+    except HTTPException as http_exc:
+        logger.error(f"HTTP Exception: {http_exc.detail}")
+        raise
+    except Exception as e:
+        logger.error(f"Unexpected error: {str(e)}")
+        raise HTTPException(status_code=500, detail="An error occurred while adding the book")
+
+
+@router.delete("/uploads/{upload_id}", tags=["Upload"])
+def delete_upload_session(
+    upload_id: str,
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Abort an upload session and discard the received data.
+    """
+    uploads.delete_upload_session(upload_id, current_user.user_id)
+    return {"message": "Upload session deleted"}
+
+
 @router.delete("/projects/{project_id}/books/{book}", tags=["Project"])
-async def delete_book(
+def delete_book(
     project_id: int,
     book: str,
     db: Session = Depends(dependency.get_db),
@@ -479,7 +677,7 @@ async def delete_book(
 
 
 @router.get("/project/details", tags=["Project"])
-async def get_project_details(
+def get_project_details(
     project_id: int = Query(None),
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
@@ -499,7 +697,7 @@ async def get_project_details(
 
 
 @router.get("/projects/", tags=["Project"])
-async def get_user_projects(
+def get_user_projects(
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
 ):
@@ -520,7 +718,7 @@ async def get_user_projects(
 
 
 @router.put("/projects/{project_id}/script_language/{script_lang:path}", tags=["Project"])
-async def update_script_lang(
+def update_script_lang(
     project_id: int,
     script_lang: str,
     db: Session = Depends(dependency.get_db),
@@ -549,7 +747,7 @@ async def update_script_lang(
 
 
 @router.put("/projects/{project_id}/audio_language/{audio_lang:path}", tags=["Project"])
-async def update_audio_lang(
+def update_audio_lang(
     project_id: int,
     audio_lang: str,
     db: Session = Depends(dependency.get_db),
@@ -578,7 +776,7 @@ async def update_audio_lang(
 
 
 @router.put("/projects/{project_id}/archive/", tags=["Project"])
-async def update_project_archive(
+def update_project_archive(
     project_id: int,
     archive: bool,
     db: Session = Depends(dependency.get_db),
@@ -615,11 +813,10 @@ async def update_project_archive(
 
 
 @router.post("/project/chapter/stt", tags=["Project"])
-async def convert_to_text(
+def convert_to_text(
     project_id: int,
     book: str,
     chapter: int,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
 ):
@@ -667,7 +864,7 @@ async def convert_to_text(
     db.add_all(to_process)
     db.commit()
     ids = [v.verse_id for v in to_process]
-    print("TO_PROCESS verse_ids:", ids)
+    logger.debug(f"Verses to transcribe: {ids}")
     # Build clean path list (ignore missing paths)
     file_paths = [v.path for v in to_process if getattr(v, "path", None)]
     if not file_paths:
@@ -690,23 +887,90 @@ async def convert_to_text(
 
     crud.is_model_served(script_lang, "stt")
     # Call the separate function to test STT API
-    crud.test_stt_api(file_paths, script_lang)
+    # The test job transcribes the first verse; the queued task skips that verse
+    verses_with_audio = [v for v in to_process if getattr(v, "path", None)]
+    crud.test_stt_api(db, verses_with_audio, script_lang)
     logger.info(f"[{current_time()}] STT API test successful. Proceeding with transcription.")
-    logger.info(f"[{current_time()}] Adding transcription task to background queue")
-    background_tasks.add_task(crud.transcribe_verses, file_paths, script_lang, db)
+    logger.info(f"[{current_time()}] Adding transcription task to the work queue")
+    verse_ids = [v.verse_id for v in verses_with_audio]
+    work_item = work_queue.enqueue(db, "stt", {"verse_ids": verse_ids, "script_lang": script_lang})
     return {
         "message": "Transcription started for all verses in the chapter",
         "project_id": project_id,
         "book": book,
         "chapter": chapter,
         "script_lang": script_lang,
+        "work_id": work_item.work_id,
+    }
+
+
+
+
+@router.post("/project/book/stt", tags=["Project"])
+def convert_book_to_text(
+    project_id: int,
+    book: str,
+    db: Session = Depends(dependency.get_db),
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Transcribe all chapters of a book with one model check and one test job.
+    Verses edited by hand are skipped. Progress is reported by GET /project/stt/progress.
+    """
+    logger.info(f"[{current_time()}] Bulk transcription triggered for project {project_id}, book {book}")
+    crud.get_project(project_id, db, current_user)
+    book = crud.get_book(db, project_id, book)
+    script_lang = crud.get_script_lang(db, project_id, current_user)
+    queued = crud.start_bulk_transcription(db, project_id, script_lang, book_id=book.book_id)
+    return {
+        "message": "Transcription started for all chapters in the book" if queued["verses"] else "No verses to transcribe",
+        "project_id": project_id,
+        "book": book.book,
+        "script_lang": script_lang,
+        **queued,
+    }
+
+
+@router.post("/project/stt", tags=["Project"])
+def convert_project_to_text(
+    project_id: int,
+    db: Session = Depends(dependency.get_db),
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Transcribe all books of a project with one model check and one test job.
+    Verses edited by hand are skipped. Progress is reported by GET /project/stt/progress.
+    """
+    logger.info(f"[{current_time()}] Bulk transcription triggered for project {project_id}")
+    crud.get_project(project_id, db, current_user)
+    script_lang = crud.get_script_lang(db, project_id, current_user)
+    queued = crud.start_bulk_transcription(db, project_id, script_lang)
+    return {
+        "message": "Transcription started for all books in the project" if queued["verses"] else "No verses to transcribe",
+        "project_id": project_id,
+        "script_lang": script_lang,
+        **queued,
     }
 
 
+@router.get("/project/stt/progress", tags=["Project"])
+def get_transcription_progress(
+    project_id: int,
+    book: Optional[str] = None,
+    db: Session = Depends(dependency.get_db),
+    current_user: User = Depends(auth.get_current_user),
+):
+    """
+    Report the transcription progress of a project, or of one of its books, per chapter and in total.
+    """
+    crud.get_project(project_id, db, current_user)
+    book_id = crud.get_book(db, project_id, book).book_id if book else None
+    progress = crud.transcription_progress(db, project_id, book_id=book_id)
+    return {"message": "Transcription progress retrieved successfully", "data": progress}
 
 
 @router.get("/job-status/{job_id}", tags=["Project"])
-async def get_job_status(
+def get_job_status(
     job_id: int,
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
@@ -729,8 +993,47 @@ async def get_job_status(
 
 
 
+class AIJobCallback(BaseModel):
+    job_id: str
+    status: str = Field(..., description='Final job status: "job finished", "job failed" or "Error"')
+    output: Optional[dict] = Field(None, description="The job output, as in the job status response")
+
+
+def verify_ai_callback(authorization: Optional[str] = Header(None)):
+    """
+    Authenticate a callback of the AI service by the shared AI_CALLBACK_TOKEN.
+    """
+    if not job_monitor.AI_CALLBACK_TOKEN:
+        raise HTTPException(status_code=404, detail="AI callbacks are not enabled")
+    if not authorization or not hmac.compare_digest(authorization, f"Bearer {job_monitor.AI_CALLBACK_TOKEN}"):
+        raise HTTPException(status_code=401, detail="Invalid callback token")
+
+
+@router.post("/ai-callback", tags=["AI"], status_code=202, dependencies=[Depends(verify_ai_callback)])
+def ai_job_callback(callback: AIJobCallback):
+    """
+    Callback for the AI service to report a finished or failed STT/TTS job.
+
+    The body carries the job id, its final status and its output as in the job
+    status response. The verses of the job are updated right away instead of on
+    the next status poll. Requires `Authorization: Bearer <AI_CALLBACK_TOKEN>`.
+    """
+    if callback.status not in job_monitor.FINAL_STATUSES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Job status must be one of {', '.join(job_monitor.FINAL_STATUSES)}",
+        )
+    if callback.status == "job finished" and callback.output is None:
+        raise HTTPException(status_code=400, detail="A finished job must include its output")
+    result = {"data": {"jobId": callback.job_id, "status": callback.status, "output": callback.output}}
+    if not job_monitor.complete(callback.job_id, result):
+        raise HTTPException(status_code=404, detail="Job is not being monitored")
+    logger.info(f"[{current_time()}] Callback received for AI job {callback.job_id}: {callback.status}")
+    return {"message": "Job completion accepted", "job_id": callback.job_id}
+
+
 @router.get("/project/{project_id}/{book}/{chapter}", tags=["Project"])
-async def get_chapter_status(
+def get_chapter_status(
     project_id: int,
     book: str,
     chapter: int,
@@ -768,7 +1071,7 @@ async def get_chapter_status(
 
 
 @router.put("/chapter/approve", tags=["Project"])
-async def update_chapter_approval(
+def update_chapter_approval(
     project_id: int,
     book: str,
     chapter: int,
@@ -798,7 +1101,7 @@ async def update_chapter_approval(
 
 
 @router.put("/project/verse/{verse_id}", tags=["Project"])
-async def update_verse_text(
+def update_verse_text(
     verse_id: int,
     verse_text: str = Query(...),
     db: Session = Depends(dependency.get_db),
@@ -868,9 +1171,8 @@ async def update_verse_text(
 
 
 @router.put("/project/chapter/{chapter_id}/tts", tags=["Project"])
-async def convert_to_speech(
+def convert_to_speech(
     chapter_id: int,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
 ):
@@ -888,31 +1190,34 @@ async def convert_to_speech(
     output_format = crud.get_output_format(verses)
     # Validate TTS model availability
     crud.validate_tts_model(project.audio_lang)
-    # Test TTS API with one verse before background processing
-    crud.test_tts_api(verses, project.audio_lang, output_format)
-    logger.info(f"[{current_time()}] ⏳ Adding TTS conversion task for Chapter {chapter.chapter} to background queue")
-    # Start the text-to-speech generation task
-    background_tasks.add_task(
-        crud.generate_speech_for_verses,
-        project.project_id,
-        book.book,
-        verses,
-        project.audio_lang,
+    # Test TTS API with one verse before background processing; the queued task skips that verse
+    crud.test_tts_api(db, verses, project.audio_lang, output_format)
+    logger.info(f"[{current_time()}] ⏳ Adding TTS conversion task for Chapter {chapter.chapter} to the work queue")
+    # Queue the text-to-speech generation task
+    work_item = work_queue.enqueue(
         db,
-        output_format
+        "tts",
+        {
+            "project_id": project.project_id,
+            "book_code": book.book,
+            "verse_ids": [verse.verse_id for verse in verses],
+            "audio_lang": project.audio_lang,
+            "output_format": output_format,
+        },
     )
     return {
         "message": "Text-to-speech conversion started for the chapter",
         "project_id": project.project_id,
         "book": book.book,
         "chapter_number": chapter.chapter,
+        "work_id": work_item.work_id,
     }
 
 
 
 
 @router.get("/project/verse/audio", tags=["Project"])
-async def stream_audio(
+def stream_audio(
     verse_id: int,
     db: Session = Depends(dependency.get_db),
 ):
@@ -965,48 +1270,7 @@ async def generate_usfm(
     """
     Generate a USFM file for a book or specific chapter, replacing missing chapters or verses with placeholders.
     """
-    # Validate project
-    project = crud.get_project(project_id, db, current_user)
-    book_obj = crud.get_book(db, project_id, book)
-    book= book_obj.book 
-    book_id = book_obj.book_id
-    project_id = project.project_id
-    project_base_path = BASE_DIR / str(project_id)
-    input_path = project_base_path / "input"
-    # Load `versification.json`
-    project_input_path = next(input_path.iterdir(), None)
-    if not project_input_path or not project_input_path.is_dir():
-        logger.error("Project directory not found under input path.")
-        raise HTTPException(
-            status_code=400, detail="Project directory not found under input path"
-        )
-    # # Locate versification.json  
-    versification_data = crud.load_versification()   
-    book_metadata = crud.load_metadata()
-    book_info = crud.fetch_book_metadata(book, book_metadata)
-
-    # Validate if the book exists in metadata
-    
-    # Fetch chapters and verses
-    if chapter is not None:
-        chapters = (
-        db.query(Chapter)
-        .filter(Chapter.book_id == book_id, Chapter.chapter == chapter)
-        .all()
-        )
-        if not chapters:
-            raise HTTPException(
-            status_code=404,
-            detail=f"Chapter {chapter} not found in book {book}"
-        )
-    else:
-        chapters = db.query(Chapter).filter(Chapter.book_id == book_id).all()
-
-    # Prepare chapter map for downstream USFM generation
-    chapter_map = {ch.chapter: ch for ch in chapters}
-    # Generate USFM content
-    usfm_text = crud.generate_usfm_content(book, book_info, chapter_map, versification_data, db, single_chapter=chapter)
-    return crud.save_and_return_usfm_file(project, book, usfm_text)
+    return await workers.run_export(crud.create_usfm_file, project_id, book, chapter, db, current_user)
 
 
 
@@ -1018,33 +1282,7 @@ async def download_processed_project_zip(
     db: Session = Depends(dependency.get_db),
     current_user: User = Depends(auth.get_current_user),
 ): 
-    project = db.query(Project).filter(Project.project_id == project_id).first()
-    if current_user.role not in ["AI", "Admin"]  and project.owner_id != current_user.user_id:
-        raise HTTPException(status_code=403, detail="Access denied. Only the project owner or users with the AI role can download the ZIP file")
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found.")   
-     # Step 2: Fetch all books in the project
-    books = db.query(Book).filter(Book.project_id == project_id).all()
-    if not books:
-        raise HTTPException(
-            status_code=404, detail="No books found for the project."
-        )
-    # Step 3: Generate USFM files for all books
-    for book in books:
-        try:
-            # Call the `generate_usfm` function for each book
-            await generate_usfm(
-                project_id=project_id,
-                book=book.book,
-                db=db,
-                current_user=current_user,
-            )
-        except HTTPException as e:
-            # Log the error and proceed with the next book
-            logger.error(f"Failed to generate USFM for book '{book.book}': {e.detail}")
-    final_dir, zip_path =crud.prepare_project_for_zipping(project)
-    # Create and return the ZIP file
-    return crud.create_zip_and_return_response(final_dir, zip_path, project.name)
+    return await workers.run_export(crud.create_processed_project_zip, project_id, db, current_user)
 
 
 
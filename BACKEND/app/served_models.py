@@ -0,0 +1,106 @@
+"""
+Cache of the models served by the AI service.
+
+Checking whether a language's STT or TTS model is served used to fetch
+/model/served-models on every transcription and speech request. The list is
+now cached for SERVED_MODELS_TTL_SECONDS and refreshed in the background every
+SERVED_MODELS_REFRESH_SECONDS, so requests normally answer from memory.
+
+When the cache has expired, e.g. because the AI service was unreachable for a
+while, the first caller fetches the list and concurrent callers wait for that
+fetch instead of sending their own. Admins can drop the cache with
+POST /admin/served-models/refresh after models are deployed or removed.
+"""
+import os
+import threading
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+import crud
+from dependency import logger
+
+load_dotenv()
+
+SERVED_MODELS_TTL_SECONDS = float(os.getenv("SERVED_MODELS_TTL_SECONDS", "300"))
+SERVED_MODELS_REFRESH_SECONDS = float(os.getenv("SERVED_MODELS_REFRESH_SECONDS", "60"))
+
+_cache = None  # Format: {"models": frozenset of model names, "fetched_at": epoch seconds}
+_refresh_lock = threading.Lock()
+_stop = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+def _fresh(cache: Optional[dict]) -> bool:
+    return cache is not None and time.time() - cache["fetched_at"] < SERVED_MODELS_TTL_SECONDS
+
+
+def _refresh() -> dict:
+    """Fetch the served models and replace the cache. The caller holds `_refresh_lock`."""
+    global _cache
+    _cache = {"models": frozenset(crud.fetch_served_models()), "fetched_at": time.time()}
+    logger.info(f"Served models refreshed: {sorted(_cache['models'])}")
+    return _cache
+
+
+def model_names() -> frozenset:
+    """
+    Return the names of the models served by the AI service.
+
+    Raises:
+        Exception: If the cache has expired and the list cannot be fetched.
+    """
+    cache = _cache
+    if _fresh(cache):
+        return cache["models"]
+    with _refresh_lock:
+        # Another caller may have refreshed the cache while this one waited
+        cache = _cache
+        if _fresh(cache):
+            return cache["models"]
+        return _refresh()["models"]
+
+
+def refresh() -> dict:
+    """
+    Drop the cache and fetch the served models again.
+
+    Returns:
+        dict: The served models and the time they were fetched.
+    """
+    global _cache
+    with _refresh_lock:
+        _cache = None
+        cache = _refresh()
+    return {"models": sorted(cache["models"]), "fetched_at": cache["fetched_at"]}
+
+
+def _run():
+    while not _stop.is_set():
+        try:
+            with _refresh_lock:
+                _refresh()
+        except Exception as e:
+            # Callers keep the previous list until it expires
+            logger.error(f"Failed to refresh served models: {str(e)}")
+        _stop.wait(SERVED_MODELS_REFRESH_SECONDS)
+
+
+def start():
+    """Start the background refresh if it is not running yet."""
+    global _thread
+    if _thread is not None and _thread.is_alive():
+        return
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="served_models_refresh", daemon=True)
+    _thread.start()
+
+
+def stop():
+    """Stop the background refresh."""
+    global _thread
+    _stop.set()
+    if _thread is not None:
+        _thread.join()
+        _thread = None
@@ -0,0 +1,270 @@
+"""
+Resumable upload sessions for large project and book archives.
+
+A client creates a session with the file name, total size and SHA-256 of the
+archive, then appends chunks at the offset the server reports. After a dropped
+connection it asks for the current offset and continues from there. Once all
+bytes are in, the session is completed: size and checksum are verified and the
+file is handed to the regular project or book processing.
+
+Sessions live under BASE_DIR/temp/uploads/<upload_id> as a `session.json` and
+the partial `data` file, so they survive restarts. Sessions without activity
+for UPLOAD_SESSION_TTL_HOURS are removed.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from dependency import logger
+
+load_dotenv()
+
+BASE_DIRECTORY = os.getenv("BASE_DIRECTORY")
+if not BASE_DIRECTORY:
+    raise ValueError("The environment variable 'BASE_DIRECTORY' is not set.")
+UPLOAD_SESSION_DIR = Path(BASE_DIRECTORY) / "temp" / "uploads"
+UPLOAD_SESSION_TTL_HOURS = int(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+UPLOAD_KINDS = ("project", "book")
+# Seconds between attempts of a chunk request to take its session's lock
+LOCK_POLL_SECONDS = 0.05
+
+# One lock per session so concurrent requests cannot interleave writes, or
+# complete or delete a session while a chunk is still being written. These are
+# thread locks because completing and deleting run in the threadpool.
+_session_locks = {}
+_session_locks_lock = threading.Lock()
+
+
+def _session_lock(upload_id: str) -> threading.Lock:
+    with _session_locks_lock:
+        return _session_locks.setdefault(upload_id, threading.Lock())
+
+
+def _session_dir(upload_id: str) -> Path:
+    # Upload ids are uuid4 hex strings; reject anything else before touching the disk
+    if len(upload_id) != 32 or not all(c in "0123456789abcdef" for c in upload_id):
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return UPLOAD_SESSION_DIR / upload_id
+
+
+def _read_session(upload_id: str) -> dict:
+    session_file = _session_dir(upload_id) / "session.json"
+    try:
+        with open(session_file, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+
+
+def _write_session(session: dict):
+    session_dir = _session_dir(session["upload_id"])
+    temp_file = session_dir / "session.json.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump(session, f)
+    os.replace(temp_file, session_dir / "session.json")
+
+
+def _data_size(upload_id: str) -> int:
+    try:
+        return (_session_dir(upload_id) / "data").stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def prune_upload_sessions():
+    """
+    Remove upload sessions that have seen no activity for UPLOAD_SESSION_TTL_HOURS.
+    """
+    if not UPLOAD_SESSION_DIR.exists():
+        return
+    cutoff = time.time() - UPLOAD_SESSION_TTL_HOURS * 3600
+    for entry in os.scandir(UPLOAD_SESSION_DIR):
+        if not entry.is_dir():
+            continue
+        session_file = Path(entry.path) / "session.json"
+        try:
+            with open(session_file, "r", encoding="utf-8") as f:
+                updated_at = json.load(f)["updated_at"]
+        except (OSError, ValueError, KeyError):
+            # Half-created session: fall back to the folder's modification time
+            updated_at = entry.stat().st_mtime
+        if updated_at < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            with _session_locks_lock:
+                _session_locks.pop(entry.name, None)
+            logger.info(f"Removed expired upload session {entry.name}")
+
+
+def create_upload_session(
+    user_id: int,
+    file_name: str,
+    total_size: int,
+    checksum: str,
+    kind: str,
+    max_size: int,
+    project_id: Optional[int] = None,
+) -> dict:
+    """
+    Start a resumable upload session.
+
+    Args:
+        file_name (str): Name of the archive; for books it carries the book code.
+        total_size (int): Size of the archive in bytes.
+        checksum (str): SHA-256 hex digest of the whole archive.
+        kind (str): "project" for a new project, "book" to add a book to project_id.
+        max_size (int): Largest accepted archive in bytes.
+
+    Returns:
+        dict: The session, including its `upload_id` and `offset`.
+    """
+    if kind not in UPLOAD_KINDS:
+        raise HTTPException(status_code=400, detail=f"Upload kind must be one of {', '.join(UPLOAD_KINDS)}")
+    if kind == "book" and project_id is None:
+        raise HTTPException(status_code=400, detail="project_id is required for book uploads")
+    if not file_name.endswith(".zip"):
+        raise HTTPException(status_code=400, detail="Uploaded file is not a ZIP file")
+    if total_size <= 0:
+        raise HTTPException(status_code=400, detail="total_size must be positive")
+    if total_size > max_size:
+        raise HTTPException(
+            status_code=413, detail=f"Uploaded file exceeds the {max_size // (1024 * 1024)} MB limit"
+        )
+    checksum = checksum.lower()
+    if len(checksum) != 64 or not all(c in "0123456789abcdef" for c in checksum):
+        raise HTTPException(status_code=400, detail="checksum must be a SHA-256 hex digest")
+
+    prune_upload_sessions()
+    upload_id = uuid.uuid4().hex
+    session_dir = UPLOAD_SESSION_DIR / upload_id
+    session_dir.mkdir(parents=True)
+    (session_dir / "data").touch()
+    now = time.time()
+    session = {
+        "upload_id": upload_id,
+        "user_id": user_id,
+        "kind": kind,
+        "project_id": project_id,
+        "file_name": file_name,
+        "total_size": total_size,
+        "checksum": checksum,
+        "created_at": now,
+        "updated_at": now,
+    }
+    _write_session(session)
+    logger.info(f"Upload session {upload_id} created for {file_name} ({total_size} bytes)")
+    return {**session, "offset": 0}
+
+
+def get_upload_session(upload_id: str, user_id: int) -> dict:
+    """
+    Return a session of the given user with its current offset, i.e. the number of bytes received.
+    """
+    session = _read_session(upload_id)
+    if session["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return {**session, "offset": _data_size(upload_id)}
+
+
+async def append_chunk(
+    upload_id: str, user_id: int, offset: int, request: Request, chunk_checksum: Optional[str] = None
+) -> dict:
+    """
+    Append the request body to a session at the given offset.
+
+    The offset must equal the number of bytes already received; otherwise 409 is
+    returned with the current offset so the client can resume from it. When
+    chunk_checksum is given, a chunk whose SHA-256 does not match is discarded.
+
+    Returns:
+        dict: The session with its new offset.
+    """
+    lock = _session_lock(upload_id)
+    # Poll instead of blocking so a waiting request neither blocks the event loop
+    # nor leaves the lock held when it is cancelled
+    while not lock.acquire(blocking=False):
+        await asyncio.sleep(LOCK_POLL_SECONDS)
+    try:
+        session = await run_in_threadpool(get_upload_session, upload_id, user_id)
+        if offset != session["offset"]:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Offset does not match the bytes received", "offset": session["offset"]},
+            )
+        data_path = _session_dir(upload_id) / "data"
+        checksum = hashlib.sha256()
+        received = 0
+        with open(data_path, "r+b") as data_file:
+            data_file.seek(offset)
+            try:
+                async for chunk in request.stream():
+                    received += len(chunk)
+                    if offset + received > session["total_size"]:
+                        raise HTTPException(status_code=400, detail="Chunk goes past the declared total_size")
+                    checksum.update(chunk)
+                    await run_in_threadpool(data_file.write, chunk)
+                if chunk_checksum and checksum.hexdigest() != chunk_checksum.lower():
+                    raise HTTPException(status_code=400, detail="Chunk checksum mismatch")
+            except BaseException:
+                # Drop the partial chunk so the client can resend it from the same offset
+                data_file.truncate(offset)
+                raise
+        session["updated_at"] = time.time()
+        await run_in_threadpool(_write_session, session)
+        return {**session, "offset": offset + received}
+    finally:
+        lock.release()
+
+
+def complete_upload_session(upload_id: str, user_id: int, target_path: Path) -> dict:
+    """
+    Verify that a session holds the complete archive with the declared checksum and
+    move the archive to target_path. The session is removed afterwards.
+    Waits for a chunk that is still being written to the session.
+
+    Returns:
+        dict: The completed session.
+    """
+    with _session_lock(upload_id):
+        session = get_upload_session(upload_id, user_id)
+        if session["offset"] != session["total_size"]:
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "Upload is incomplete", "offset": session["offset"]},
+            )
+        data_path = _session_dir(upload_id) / "data"
+        checksum = hashlib.sha256()
+        with open(data_path, "rb") as data_file:
+            while chunk := data_file.read(1024 * 1024):
+                checksum.update(chunk)
+        if checksum.hexdigest() != session["checksum"]:
+            _remove_session(upload_id)
+            raise HTTPException(status_code=400, detail="Checksum mismatch, please upload the file again")
+        shutil.move(str(data_path), str(target_path))
+        _remove_session(upload_id)
+    logger.info(f"Upload session {upload_id} completed ({session['total_size']} bytes)")
+    return session
+
+
+def _remove_session(upload_id: str):
+    """Remove a session's files. The caller holds the session lock."""
+    shutil.rmtree(_session_dir(upload_id), ignore_errors=True)
+    with _session_locks_lock:
+        _session_locks.pop(upload_id, None)
+
+
+def delete_upload_session(upload_id: str, user_id: int):
+    """Abort a session and remove everything it received, after a chunk still being written."""
+    with _session_lock(upload_id):
+        get_upload_session(upload_id, user_id)
+        _remove_session(upload_id)
@@ -0,0 +1,391 @@
+"""
+Durable queue for STT and TTS work, stored in the `work_queue` table.
+
+Routes enqueue a work item with the task name and its keyword arguments and
+return. Workers claim items with `SELECT ... FOR UPDATE SKIP LOCKED`, so any
+number of worker threads, processes or nodes can share the queue without
+taking the same item. Interactive items, e.g. a chapter transcription a user
+started, are claimed before bulk items, then items are claimed in the order they
+became available. Queued work survives restarts and deploys.
+
+A claimed item is locked for WORK_QUEUE_VISIBILITY_SECONDS, and its worker
+renews the lock every third of that time while the task runs, e.g. while it
+waits for an AI slot. If its worker dies, the item becomes claimable again once
+the lock runs out. A task that raises is
+retried with exponential backoff from WORK_QUEUE_RETRY_SECONDS, up to
+WORK_QUEUE_MAX_ATTEMPTS attempts; after that the item is marked as failed.
+
+The API process runs WORK_QUEUE_WORKERS worker threads. More workers, e.g. on
+other nodes sharing the database and BASE_DIRECTORY, are started with:
+
+    python work_queue.py
+"""
+import datetime
+import os
+import socket
+import threading
+import time
+from typing import Callable, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, WorkItem
+from dependency import logger
+
+load_dotenv()
+
+WORK_QUEUE_WORKERS = int(os.getenv("WORK_QUEUE_WORKERS", "2"))
+WORK_QUEUE_VISIBILITY_SECONDS = int(os.getenv("WORK_QUEUE_VISIBILITY_SECONDS", "600"))
+WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "3"))
+WORK_QUEUE_RETRY_SECONDS = int(os.getenv("WORK_QUEUE_RETRY_SECONDS", "30"))
+WORK_QUEUE_RETENTION_DAYS = int(os.getenv("WORK_QUEUE_RETENTION_DAYS", "7"))
+# Seconds an idle worker waits before looking for new work
+IDLE_WAIT_SECONDS = 2
+
+_tasks = {}  # Format: {kind: task(**payload)}
+_threads = []
+# Counters of the workers in this process, reported by `stats`
+_stats = {"busy": 0, "done": 0, "retried": 0, "failed": 0, "run_seconds": 0.0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+_stats_lock = threading.Lock()
+_stop = threading.Event()
+_wakeup = threading.Event()
+
+
+def register_task(kind: str, task: Callable):
+    """Register the function that runs work items of a kind with their payload as keyword arguments."""
+    _tasks[kind] = task
+
+
+def enqueue(
+    db: Session, kind: str, payload: dict, max_attempts: Optional[int] = None, interactive: bool = True
+) -> WorkItem:
+    """
+    Add a work item to the queue and commit it.
+
+    Args:
+        db (Session): The database session.
+        kind (str): The task to run, as registered with `register_task`.
+        payload (dict): JSON serializable keyword arguments of the task.
+        max_attempts (Optional[int]): Attempts before the item fails, WORK_QUEUE_MAX_ATTEMPTS by default.
+        interactive (bool): False for bulk work, which is claimed after interactive work.
+
+    Returns:
+        WorkItem: The queued item.
+    """
+    if kind not in _tasks:
+        raise ValueError(f"Unknown work item kind: {kind}")
+    item = WorkItem(
+        kind=kind,
+        payload=payload,
+        status="queued",
+        max_attempts=max_attempts or WORK_QUEUE_MAX_ATTEMPTS,
+        interactive=interactive,
+        available_at=datetime.datetime.utcnow(),
+    )
+    db.add(item)
+    db.commit()
+    db.refresh(item)
+    _wakeup.set()
+    logger.info(f"Work item {item.work_id} ({kind}) queued")
+    return item
+
+
+def enqueue_many(
+    db: Session, kind: str, payloads: List[dict], max_attempts: Optional[int] = None, interactive: bool = True
+) -> List[int]:
+    """
+    Add several work items of a kind to the queue in one transaction, see `enqueue`.
+
+    Returns:
+        List[int]: The ids of the queued items, in the order of the payloads.
+    """
+    if kind not in _tasks:
+        raise ValueError(f"Unknown work item kind: {kind}")
+    now = datetime.datetime.utcnow()
+    items = [
+        WorkItem(
+            kind=kind,
+            payload=payload,
+            status="queued",
+            max_attempts=max_attempts or WORK_QUEUE_MAX_ATTEMPTS,
+            interactive=interactive,
+            available_at=now,
+        )
+        for payload in payloads
+    ]
+    db.add_all(items)
+    db.flush()
+    work_ids = [item.work_id for item in items]
+    db.commit()
+    _wakeup.set()
+    logger.info(f"{len(work_ids)} work items ({kind}) queued")
+    return work_ids
+
+
+def claim(db: Session, worker_name: str) -> Optional[WorkItem]:
+    """
+    Claim the next available work item, skipping items locked by other workers.
+    Interactive items go before bulk items, then the item available longest. Running items whose visibility timeout has expired are claimed again, or
+    failed once they have used up their attempts.
+
+    Returns:
+        Optional[WorkItem]: The claimed item, or None if there is no work.
+    """
+    while True:
+        now = datetime.datetime.utcnow()
+        item = (
+            db.query(WorkItem)
+            .filter(
+                or_(
+                    and_(WorkItem.status == "queued", WorkItem.available_at <= now),
+                    and_(WorkItem.status == "running", WorkItem.locked_until < now),
+                )
+            )
+            .order_by(WorkItem.interactive.desc(), WorkItem.available_at, WorkItem.work_id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if item is None:
+            db.commit()
+            return None
+        if item.status == "running" and item.attempts >= item.max_attempts:
+            item.status = "failed"
+            item.locked_until = None
+            item.last_error = f"Worker {item.locked_by} did not finish within {WORK_QUEUE_VISIBILITY_SECONDS} seconds"
+            db.commit()
+            logger.error(f"Work item {item.work_id} failed: {item.last_error}")
+            continue
+        item.status = "running"
+        item.attempts += 1
+        item.locked_by = worker_name
+        item.locked_until = now + datetime.timedelta(seconds=WORK_QUEUE_VISIBILITY_SECONDS)
+        db.commit()
+        return item
+
+
+def _finish(work_id: int, worker_name: str, error: Optional[Exception] = None) -> Optional[str]:
+    """
+    Record the outcome of a work item, unless another worker has claimed it since.
+
+    Returns:
+        Optional[str]: "done", "retried" or "failed", or None if the item was reclaimed.
+    """
+    db = SessionLocal()
+    try:
+        item = db.query(WorkItem).filter(WorkItem.work_id == work_id).with_for_update().first()
+        if item is None or item.locked_by != worker_name or item.status != "running":
+            logger.warning(f"Work item {work_id} was reclaimed before {worker_name} finished it")
+            return None
+        item.locked_until = None
+        if error is None:
+            item.status = "done"
+            item.last_error = None
+            outcome = "done"
+        elif item.attempts < item.max_attempts:
+            item.status = "queued"
+            item.last_error = str(error)
+            item.available_at = datetime.datetime.utcnow() + datetime.timedelta(
+                seconds=WORK_QUEUE_RETRY_SECONDS * 2 ** (item.attempts - 1)
+            )
+            logger.warning(f"Work item {work_id} attempt {item.attempts} failed, retrying at {item.available_at}: {error}")
+            outcome = "retried"
+        else:
+            item.status = "failed"
+            item.last_error = str(error)
+            logger.error(f"Work item {work_id} failed after {item.attempts} attempts: {error}")
+            outcome = "failed"
+        db.commit()
+        return outcome
+    finally:
+        db.close()
+
+
+def _renew_lease(work_id: int, worker_name: str) -> bool:
+    """
+    Extend the lock of a running work item by WORK_QUEUE_VISIBILITY_SECONDS.
+
+    Returns:
+        bool: False if the item is no longer running under this worker.
+    """
+    db = SessionLocal()
+    try:
+        renewed = (
+            db.query(WorkItem)
+            .filter(WorkItem.work_id == work_id, WorkItem.locked_by == worker_name, WorkItem.status == "running")
+            .update(
+                {WorkItem.locked_until: datetime.datetime.utcnow() + datetime.timedelta(seconds=WORK_QUEUE_VISIBILITY_SECONDS)},
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        return bool(renewed)
+    finally:
+        db.close()
+
+
+def _keep_lease(work_id: int, worker_name: str, finished: threading.Event):
+    """Renew the lock of a work item every third of the visibility timeout until it is finished."""
+    while not finished.wait(WORK_QUEUE_VISIBILITY_SECONDS / 3):
+        try:
+            if not _renew_lease(work_id, worker_name):
+                logger.warning(f"Work item {work_id} was reclaimed while {worker_name} was running it")
+                return
+        except Exception as e:
+            logger.warning(f"{worker_name} could not renew the lock of work item {work_id}: {str(e)}")
+
+
+def _run(work_id: int, kind: str, payload: dict, worker_name: str) -> str:
+    """
+    Run a claimed work item, keeping it locked while the task runs, and record the outcome.
+
+    Returns:
+        str: "done", "retried" or "failed".
+    """
+    finished = threading.Event()
+    heartbeat = threading.Thread(
+        target=_keep_lease, args=(work_id, worker_name, finished), name=f"{worker_name}/lease", daemon=True
+    )
+    heartbeat.start()
+    error = None
+    try:
+        task = _tasks.get(kind)
+        if task is None:
+            raise ValueError(f"No task registered for work item kind '{kind}'")
+        task(**payload)
+    except Exception as e:
+        error = e
+    finally:
+        finished.set()
+        heartbeat.join()
+    if error is None:
+        _finish(work_id, worker_name)
+        return "done"
+    return _finish(work_id, worker_name, error) or "failed"
+
+
+def _work(worker_name: str):
+    while not _stop.is_set():
+        db = SessionLocal()
+        try:
+            item = claim(db, worker_name)
+            if item is not None:
+                work_id, kind, payload = item.work_id, item.kind, dict(item.payload)
+                waited = max((datetime.datetime.utcnow() - item.available_at).total_seconds(), 0)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"{worker_name} could not claim work: {str(e)}")
+            item = None
+        finally:
+            db.close()
+        if item is None:
+            _wakeup.wait(IDLE_WAIT_SECONDS)
+            _wakeup.clear()
+            continue
+
+        logger.info(f"{worker_name} running work item {work_id} ({kind}) after waiting {waited:.2f} seconds")
+        with _stats_lock:
+            _stats["busy"] += 1
+            _stats["wait_seconds"] += waited
+            _stats["max_wait_seconds"] = max(_stats["max_wait_seconds"], waited)
+        started = time.time()
+        outcome = "failed"
+        try:
+            outcome = _run(work_id, kind, payload, worker_name)
+        finally:
+            with _stats_lock:
+                _stats["busy"] -= 1
+                _stats["run_seconds"] += time.time() - started
+                _stats[outcome] += 1
+
+
+def prune_finished(db: Session) -> int:
+    """Delete done and failed work items older than WORK_QUEUE_RETENTION_DAYS."""
+    cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=WORK_QUEUE_RETENTION_DAYS)
+    removed = (
+        db.query(WorkItem)
+        .filter(WorkItem.status.in_(["done", "failed"]), WorkItem.updated_date < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.commit()
+    return removed
+
+
+def queue_counts(db: Session) -> dict:
+    """Return the number of work items per status."""
+    return dict(db.query(WorkItem.status, func.count(WorkItem.work_id)).group_by(WorkItem.status).all())
+
+
+def stats(db: Session) -> dict:
+    """
+    Saturation metrics of the work queue: the workers of this process, how busy
+    they are, how long items waited and ran, and the backlog shared by all workers.
+    """
+    with _stats_lock:
+        counters = dict(_stats)
+    started = counters["done"] + counters["retried"] + counters["failed"] + counters["busy"]
+    finished = started - counters["busy"]
+    oldest_queued = (
+        db.query(func.min(WorkItem.available_at))
+        .filter(WorkItem.status == "queued", WorkItem.available_at <= datetime.datetime.utcnow())
+        .scalar()
+    )
+    return {
+        "workers": len(_threads),
+        "busy": counters["busy"],
+        "utilization": counters["busy"] / len(_threads) if _threads else 0,
+        "done": counters["done"],
+        "retried": counters["retried"],
+        "failed": counters["failed"],
+        "avg_wait_seconds": counters["wait_seconds"] / started if started else 0,
+        "max_wait_seconds": counters["max_wait_seconds"],
+        "avg_run_seconds": counters["run_seconds"] / finished if finished else 0,
+        "items": queue_counts(db),
+        "oldest_queued_seconds": (
+            (datetime.datetime.utcnow() - oldest_queued).total_seconds() if oldest_queued else 0
+        ),
+    }
+
+
+def start(workers: int = WORK_QUEUE_WORKERS):
+    """Start worker threads that claim and run queued work."""
+    if _threads:
+        return
+    _stop.clear()
+    db = SessionLocal()
+    try:
+        removed = prune_finished(db)
+        if removed:
+            logger.info(f"Removed {removed} finished work items")
+    finally:
+        db.close()
+    host = f"{socket.gethostname()}:{os.getpid()}"
+    for number in range(workers):
+        thread = threading.Thread(
+            target=_work, args=(f"{host}/worker-{number}",), name=f"work_queue_{number}", daemon=True
+        )
+        thread.start()
+        _threads.append(thread)
+    logger.info(f"Started {workers} work queue workers on {host}")
+
+
+def stop():
+    """Let the workers finish their current item and stop."""
+    _stop.set()
+    _wakeup.set()
+    for thread in _threads:
+        thread.join()
+    _threads.clear()
+
+
+if __name__ == "__main__":
+    # Importing crud registers the STT/TTS tasks and the job monitor handlers
+    import crud  # noqa: F401
+    import work_queue
+
+    work_queue.start()
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        work_queue.stop()
@@ -0,0 +1,96 @@
+"""
+Executors for blocking work started from route handlers.
+
+Route handlers that only do blocking work (SQLAlchemy, file system, bcrypt,
+`requests`) are plain `def` functions, which FastAPI runs on the shared AnyIO
+threadpool sized by API_THREADPOOL_SIZE. Handlers that must await (uploads,
+email) stay `async def` and hand their blocking steps to that threadpool with
+`run_in_threadpool`.
+
+Project exports (USFM generation, copying and zipping a whole project) can run
+for minutes, so they get their own executor of EXPORT_WORKERS threads. Slow
+exports then queue behind each other instead of taking the threads that serve
+audio streaming and status requests.
+
+STT and TTS work never runs on these pools: it runs on the work queue workers
+(work_queue.py), and AI job status checks on the job monitor's workers
+(job_monitor.py). GET /admin/workers reports how busy each of them is.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import anyio.to_thread
+from dotenv import load_dotenv
+
+from dependency import logger
+
+load_dotenv()
+
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", "2"))
+
+export_executor = ThreadPoolExecutor(max_workers=EXPORT_WORKERS, thread_name_prefix="export")
+# Exports submitted to and running on the export executor, reported by `stats`
+_exports = {"pending": 0, "running": 0}
+_exports_lock = threading.Lock()
+
+
+def configure_threadpool():
+    """
+    Size the AnyIO threadpool used for sync route handlers, dependencies,
+    `run_in_threadpool` and sync streaming responses. Must run inside the
+    event loop, e.g. from a startup handler.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
+    logger.info(f"API threadpool size: {API_THREADPOOL_SIZE}, export workers: {EXPORT_WORKERS}")
+
+
+async def run_export(func, *args, **kwargs):
+    """
+    Run a blocking export function on the export executor and await its result.
+    """
+    def run():
+        with _exports_lock:
+            _exports["running"] += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with _exports_lock:
+                _exports["running"] -= 1
+                _exports["pending"] -= 1
+
+    with _exports_lock:
+        _exports["pending"] += 1
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(export_executor, run)
+
+
+def stats() -> dict:
+    """
+    Saturation metrics of the request threadpool and the export executor.
+    Must run inside the event loop, e.g. from an async route.
+    """
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    limiter_stats = limiter.statistics()
+    with _exports_lock:
+        exports = dict(_exports)
+    return {
+        "request_threadpool": {
+            "size": limiter.total_tokens,
+            "busy": limiter_stats.borrowed_tokens,
+            "waiting": limiter_stats.tasks_waiting,
+            "utilization": limiter_stats.borrowed_tokens / limiter.total_tokens,
+        },
+        "exports": {
+            "workers": EXPORT_WORKERS,
+            "running": exports["running"],
+            "queued": exports["pending"] - exports["running"],
+        },
+    }
+
+
+def shutdown():
+    """Stop accepting export work and wait for running exports to finish."""
+    export_executor.shutdown(wait=True)
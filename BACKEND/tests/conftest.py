@@ -0,0 +1,143 @@
+"""
+Shared fixtures for the backend tests.
+
+The tests run against a PostgreSQL database of their own, named by
+AI_OBT_TEST_POSTGRES_DATABASE (default "ai_obt_test") on the server set with
+the usual AI_OBT_POSTGRES_* variables. All tables of that database are emptied
+after every test and recreated per run, so never point it at a database holding real data.
+"""
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parents[1] / "app"
+# The app writes logs to ../logs and temporary files to ./Input relative to the working directory
+WORK_DIR = Path(tempfile.mkdtemp(prefix="obt_tests_")) / "run"
+WORK_DIR.mkdir()
+# Data files the app opens relative to its folder
+for data_file in ("versification.json", "metadatainfo.json"):
+    shutil.copy(APP_DIR / data_file, WORK_DIR)
+os.chdir(WORK_DIR)
+
+os.environ["AI_OBT_POSTGRES_DATABASE"] = os.getenv("AI_OBT_TEST_POSTGRES_DATABASE", "ai_obt_test")
+os.environ["BASE_DIRECTORY"] = str(WORK_DIR.parent / "data")
+for name, value in {
+    "MAIL_USERNAME": "tests",
+    "MAIL_PASSWORD": "tests",
+    "MAIL_FROM": "tests@example.com",
+    "MAIL_SERVER": "localhost",
+    "MAIL_FROM_NAME": "AI OBT tests",
+    "BASE_URL": "http://ai.invalid",
+}.items():
+    os.environ.setdefault(name, value)
+sys.path.insert(0, str(APP_DIR))
+
+import database  # noqa: E402
+import router  # noqa: E402,F401  router is imported before crud, as in main.py
+import crud  # noqa: E402,F401
+
+
+def project_zip(name: str, books: dict, extra: dict = None) -> bytes:
+    """
+    Build a project ZIP as exported by Scribe: a project folder with metadata.json
+    and the verse audio under audio/ingredients.
+
+    Args:
+        books (dict): {book: {chapter: {file name: content}}}
+        extra (dict): {member name: content} added as-is.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        archive.writestr(f"{name}/metadata.json", json.dumps({"identification": {"name": {"en": name}}}))
+        for book, chapters in books.items():
+            for chapter, files in chapters.items():
+                for file_name, content in files.items():
+                    archive.writestr(f"{name}/audio/ingredients/{book}/{chapter}/{file_name}", content)
+        for member, content in (extra or {}).items():
+            archive.writestr(member, content)
+    return buffer.getvalue()
+
+
+def book_zip(book: str, chapters: dict) -> bytes:
+    """Build a book ZIP for /projects/{project_id}/add-book; chapters as in `project_zip`."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED) as archive:
+        for chapter, files in chapters.items():
+            for file_name, content in files.items():
+                archive.writestr(f"{book}/{chapter}/{file_name}", content)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def tables():
+    # Recreate the tables so they match the models after schema changes
+    database.Base.metadata.drop_all(bind=database.engine)
+    database.init_db()
+
+
+@pytest.fixture
+def db():
+    session = database.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        tables = ", ".join(f'"{table.name}"' for table in database.Base.metadata.sorted_tables)
+        with database.engine.begin() as connection:
+            connection.exec_driver_sql(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
+
+@pytest.fixture
+def user(db):
+    user = database.User(username="tester", hashed_password="x", email="tester@example.com", role="User", active=True)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+@pytest.fixture
+def chapter(db, user):
+    """A project with one book and one chapter of three verses with audio files."""
+    project = database.Project(name="Test project", owner_id=user.user_id, script_lang="Kannada", audio_lang="Kannada")
+    db.add(project)
+    db.flush()
+    book = database.Book(project_id=project.project_id, book="MRK")
+    db.add(book)
+    db.flush()
+    chapter = database.Chapter(book_id=book.book_id, chapter=1, approved=False)
+    db.add(chapter)
+    db.flush()
+    audio_dir = Path(os.environ["BASE_DIRECTORY"]) / "audio"
+    audio_dir.mkdir(parents=True, exist_ok=True)
+    for number in range(1, 4):
+        path = audio_dir / f"1_{number}.wav"
+        path.write_bytes(b"RIFF" + bytes(100))
+        db.add(database.Verse(
+            chapter_id=chapter.chapter_id, verse=number, name=path.stem, path=str(path), size=104,
+            format="wav", stt=False, text=f"verse {number}", modified=False, tts=False, stt_msg="", tts_msg="",
+        ))
+    db.commit()
+    return chapter
+
+
+@pytest.fixture
+def client(user):
+    """An HTTP client for the app, authenticated as `user`. Startup events do not run."""
+    from fastapi.testclient import TestClient
+
+    import auth
+    import main
+
+    main.app.dependency_overrides[auth.get_current_user] = lambda: user
+    try:
+        yield TestClient(main.app)
+    finally:
+        main.app.dependency_overrides.clear()
@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+import textwrap
+import time
+
+import pytest
+
+import conftest
+import database
+import job_monitor
+
+TOKEN = "callback-secret"
+
+# Submits the chapter's verses like a `python work_queue.py` worker, with the STT API faked
+WORKER = textwrap.dedent("""
+    import sys
+    import router
+    import crud
+
+    crud.call_stt_api = lambda file_paths, script_lang: {"data": {"jobId": "ai-worker-1"}}
+    crud.transcribe_verses([int(verse_id) for verse_id in sys.argv[1:]], "Kannada")
+""")
+
+
+@pytest.fixture
+def callbacks(monkeypatch):
+    monkeypatch.setattr(job_monitor, "AI_CALLBACK_TOKEN", TOKEN)
+
+
+def wait_for(condition, timeout: float = 10):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "condition not met in time"
+        time.sleep(0.05)
+
+
+def test_callback_for_job_submitted_by_another_process(db, chapter, client, callbacks):
+    verses = db.query(database.Verse).order_by(database.Verse.verse).all()
+    env = {**os.environ, "PYTHONPATH": str(conftest.APP_DIR), "AI_CALLBACK_TOKEN": TOKEN}
+    subprocess.run(
+        [sys.executable, "-c", WORKER, *[str(verse.verse_id) for verse in verses]],
+        env=env, check=True, timeout=60,
+    )
+    assert "ai-worker-1" not in job_monitor._jobs
+
+    response = client.post(
+        "/ai-callback",
+        headers={"Authorization": f"Bearer {TOKEN}"},
+        json={
+            "job_id": "ai-worker-1",
+            "status": "job finished",
+            "output": {
+                "transcriptions": [
+                    {"audioFile": os.path.basename(verse.path), "transcribedText": f"text {verse.verse}"}
+                    for verse in verses
+                ],
+                "transcription_time": 1,
+            },
+        },
+    )
+
+    assert response.status_code == 202, response.text
+
+    def transcribed():
+        db.expire_all()
+        return all(verse.stt for verse in db.query(database.Verse))
+
+    wait_for(transcribed)
+    assert [verse.text for verse in db.query(database.Verse).order_by(database.Verse.verse)] == [
+        "text 1", "text 2", "text 3"
+    ]
+    assert {job.status for job in db.query(database.Job)} == {"completed"}
+
+
+def test_callback_for_unknown_job(client, callbacks):
+    response = client.post(
+        "/ai-callback",
+        headers={"Authorization": f"Bearer {TOKEN}"},
+        json={"job_id": "ai-unknown", "status": "job failed"},
+    )
+
+    assert response.status_code == 404
+
+
+def test_monitor_drops_jobs_completed_elsewhere(db, chapter, monkeypatch):
+    verse = db.query(database.Verse).first()
+    db.add(database.Job(verse_id=verse.verse_id, ai_jobid="ai-elsewhere", status="completed", kind="stt"))
+    db.commit()
+    monkeypatch.setitem(job_monitor._jobs, "ai-elsewhere", {"kind": "stt"})
+    released = []
+    monkeypatch.setattr(job_monitor.ai_scheduler, "finished", released.append)
+
+    job_monitor._drop_settled_jobs()
+
+    assert "ai-elsewhere" not in job_monitor._jobs
+    assert released == ["ai-elsewhere"]
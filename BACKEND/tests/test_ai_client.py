@@ -0,0 +1,72 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import ai_client
+
+
+class FlakyAIService(BaseHTTPRequestHandler):
+    """Answers 503 to the first `failures` requests of each method, then 200; records every request."""
+
+    protocol_version = "HTTP/1.1"
+    failures = 2
+    requests = []
+
+    def respond(self):
+        method_calls = [method for method, _ in self.requests if method == self.command]
+        self.requests.append((self.command, self.client_address[1]))
+        status = 503 if len(method_calls) < self.failures else 200
+        body = b'{"data": {"status": "job running"}}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.respond()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def ai_service(monkeypatch):
+    monkeypatch.setattr(FlakyAIService, "requests", [])
+    # Retry at once instead of backing off
+    monkeypatch.setattr(ai_client._retry, "backoff_factor", 0)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyAIService)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_get_is_retried_on_unavailable_service(ai_service):
+    response = ai_client.get("test_status", f"{ai_service}/job/1")
+
+    assert response.status_code == 200
+    assert [method for method, _ in FlakyAIService.requests] == ["GET"] * 3
+
+
+def test_post_is_never_retried(ai_service):
+    response = ai_client.post("test_submit", f"{ai_service}/transcribe", data=b"audio")
+
+    assert response.status_code == 503
+    assert [method for method, _ in FlakyAIService.requests] == ["POST"]
+    assert ai_client.stats()["test_submit"]["errors"] >= 1
+
+
+def test_requests_reuse_a_kept_alive_connection(ai_service, monkeypatch):
+    monkeypatch.setattr(FlakyAIService, "failures", 0)
+
+    for _ in range(3):
+        assert ai_client.get("test_status", f"{ai_service}/job/1").status_code == 200
+
+    assert len({port for _, port in FlakyAIService.requests}) == 1
@@ -0,0 +1,114 @@
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException
+
+import ai_scheduler
+import crud
+
+
+@pytest.fixture
+def full(monkeypatch):
+    """An AI scheduler whose only slot is taken."""
+    monkeypatch.setattr(ai_scheduler, "AI_MAX_IN_FLIGHT", 1)
+    ai_scheduler.submit(lambda: {"data": {"jobId": "ai-busy"}}, user_id=1, project_id=1)
+    yield
+    ai_scheduler.finished("ai-busy")
+
+
+def test_preflight_fails_fast_without_free_slot(full):
+    calls = []
+    started = time.perf_counter()
+
+    with pytest.raises(HTTPException) as error:
+        crud.submit_preflight(lambda: calls.append(1), user_id=2, project_id=2)
+
+    assert time.perf_counter() - started < 1
+    assert error.value.status_code == 503
+    assert error.value.headers["Retry-After"] == str(crud.PREFLIGHT_RETRY_AFTER_SECONDS)
+    assert calls == []
+    assert ai_scheduler.stats()["waiting"] == 0
+
+
+def test_preflight_takes_free_slot():
+    result = crud.submit_preflight(lambda: {"data": {"jobId": "ai-preflight"}}, user_id=2, project_id=2)
+    try:
+        assert result["data"]["jobId"] == "ai-preflight"
+    finally:
+        ai_scheduler.finished("ai-preflight")
+
+
+@pytest.fixture
+def slots(monkeypatch):
+    """Two AI slots, one held by user 9 until `release` is called; submissions are cleaned up afterwards."""
+    monkeypatch.setattr(ai_scheduler, "AI_MAX_IN_FLIGHT", 2)
+    held, threads = ["held"], []
+    ai_scheduler.submit(lambda: {"data": {"jobId": "held"}}, user_id=9, project_id=9)
+
+    def hold(name, user_id, project_id):
+        ai_scheduler.submit(lambda: {"data": {"jobId": name}}, user_id=user_id, project_id=project_id)
+        held.append(name)
+
+    def wait(name, user_id, project_id, interactive=True):
+        waiting = ai_scheduler.stats()["waiting"]
+        thread = threading.Thread(
+            target=ai_scheduler.submit,
+            args=(lambda: granted.append(name) or {"data": {"jobId": name}}, user_id, project_id, interactive),
+        )
+        thread.start()
+        threads.append(thread)
+        held.append(name)
+        while ai_scheduler.stats()["waiting"] == waiting:
+            time.sleep(0.01)
+
+    def release():
+        ai_scheduler.finished("held")
+        while not granted:
+            time.sleep(0.01)
+        return granted[0]
+
+    granted = []
+    yield hold, wait, release
+    while any(thread.is_alive() for thread in threads):
+        for name in held:
+            ai_scheduler.finished(name)
+        time.sleep(0.01)
+    for name in held:
+        ai_scheduler.finished(name)
+
+
+def test_interactive_submission_is_admitted_before_earlier_bulk(slots):
+    hold, wait, release = slots
+    hold("running", user_id=1, project_id=1)
+    wait("bulk", user_id=2, project_id=2, interactive=False)
+    wait("chapter", user_id=1, project_id=1)
+
+    assert release() == "chapter"
+
+
+def test_user_with_fewest_jobs_in_flight_goes_first(slots):
+    hold, wait, release = slots
+    hold("running", user_id=1, project_id=1)
+    wait("busy user", user_id=1, project_id=2)
+    wait("idle user", user_id=2, project_id=3)
+
+    assert release() == "idle user"
+
+
+def test_project_with_fewest_jobs_in_flight_goes_first(slots):
+    hold, wait, release = slots
+    hold("running", user_id=1, project_id=1)
+    wait("busy project", user_id=1, project_id=1)
+    wait("idle project", user_id=1, project_id=2)
+
+    assert release() == "idle project"
+
+
+def test_oldest_submission_goes_first_otherwise(slots):
+    hold, wait, release = slots
+    hold("running", user_id=1, project_id=1)
+    wait("older", user_id=2, project_id=2)
+    wait("newer", user_id=3, project_id=3)
+
+    assert release() == "older"
@@ -0,0 +1,83 @@
+import os
+
+import pytest
+
+import crud
+
+CHAPTERS = 40
+VERSES = 30
+
+
+def walk_book(book_folder):
+    """The per-chapter iterdir walk that build_book_manifest replaced, kept as the reference."""
+    manifest = []
+    for chapter_dir in book_folder.iterdir():
+        if chapter_dir.is_dir() and chapter_dir.name.isdigit():
+            chapter_number = int(chapter_dir.name)
+            candidates = [(verse_file.name, verse_file) for verse_file in chapter_dir.iterdir() if verse_file.is_file()]
+            verse_files, incompartible_verses, discarded = crud.select_verse_files(candidates, chapter_number)
+            manifest.append({
+                "chapter": chapter_number,
+                "verses": {
+                    verse: {"name": data["file"].name, "size": data["file"].stat().st_size}
+                    for verse, data in verse_files.items()
+                },
+                "discarded": [verse_file.name for verse_file in discarded],
+                "incompartible_verses": incompartible_verses,
+            })
+    return manifest
+
+
+@pytest.fixture
+def book_folder(tmp_path):
+    """A book of CHAPTERS chapters with VERSES verses, alternative takes and an invalid file."""
+    for chapter in range(1, CHAPTERS + 1):
+        chapter_dir = tmp_path / str(chapter)
+        chapter_dir.mkdir()
+        for verse in range(1, VERSES + 1):
+            (chapter_dir / f"{chapter}_{verse}.mp3").write_bytes(bytes(verse))
+            if verse % 5 == 0:
+                (chapter_dir / f"{chapter}_{verse}_default.mp3").write_bytes(bytes(verse + 1))
+            if verse % 7 == 0:
+                (chapter_dir / f"{chapter}_{verse}_1.mp3").write_bytes(bytes(verse + 2))
+        (chapter_dir / "notes.mp3").write_bytes(b"x")
+    (tmp_path / "metadata.json").write_text("{}")
+    return tmp_path
+
+
+def by_chapter(manifest):
+    return {
+        chapter["chapter"]: (
+            {verse: (data["name"], data["size"]) for verse, data in chapter["verses"].items()},
+            chapter["discarded"],
+            chapter["incompartible_verses"],
+        )
+        for chapter in manifest
+    }
+
+
+def test_manifest_matches_walk(book_folder):
+    assert by_chapter(crud.build_book_manifest(book_folder)) == by_chapter(walk_book(book_folder))
+
+
+def test_manifest_needs_no_stat_calls(book_folder, monkeypatch):
+    calls = {"count": 0}
+    real_stat = os.stat
+
+    def counting_stat(*args, **kwargs):
+        calls["count"] += 1
+        return real_stat(*args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", counting_stat)
+    # The rotating log file handler stats its file for every record
+    monkeypatch.setattr(crud.logger, "disabled", True)
+
+    walk_book(book_folder)
+    walk_stats, calls["count"] = calls["count"], 0
+    crud.build_book_manifest(book_folder)
+    scan_stats = calls["count"]
+
+    # The walk stats every entry to learn its type; the scan takes types and sizes from the directory entries
+    files = len(list(book_folder.glob("*/*")))
+    assert walk_stats >= files
+    assert scan_stats == 0
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+import crud
+import database
+from conftest import book_zip
+
+VERSES = {1: b"verse one", 2: b"verse two", 3: b"verse one"}
+
+
+@pytest.fixture
+def project(db, user):
+    project = database.Project(name="Reupload project", owner_id=user.user_id, script_lang="", audio_lang="")
+    db.add(project)
+    db.commit()
+    yield project
+    # Project ids restart with every test, so its files must not outlive it
+    shutil.rmtree(crud.BASE_DIR / str(project.project_id), ignore_errors=True)
+
+
+def add_book(client, project, verses: dict) -> dict:
+    payload = book_zip("MRK", {1: {f"1_{number}.wav": content for number, content in verses.items()}})
+    response = client.post(
+        f"/projects/{project.project_id}/add-book", files={"file": ("MRK.zip", payload, "application/zip")}
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def stored_verses(db, project) -> dict:
+    db.expire_all()
+    rows = (
+        db.query(database.Verse)
+        .join(database.Chapter, database.Verse.chapter_id == database.Chapter.chapter_id)
+        .join(database.Book, database.Chapter.book_id == database.Book.book_id)
+        .filter(database.Book.project_id == project.project_id)
+    )
+    return {verse.verse: verse for verse in rows}
+
+
+def test_unchanged_reupload_is_skipped(db, client, project):
+    add_book(client, project, VERSES)
+
+    result = add_book(client, project, VERSES)
+
+    assert result["modified_verses"] == []
+    assert result["added_verses"] == []
+    assert result["modified_chapters"] == []
+
+
+def test_same_size_change_is_detected(db, client, project):
+    add_book(client, project, VERSES)
+
+    result = add_book(client, project, {**VERSES, 2: b"verse 2!!"})
+
+    assert result["modified_verses"] == ["1_2"]
+    verse = stored_verses(db, project)[2]
+    assert Path(verse.path).read_bytes() == b"verse 2!!"
+    assert verse.digest == hashlib.sha256(b"verse 2!!").hexdigest()
+
+
+def test_legacy_verse_digest_is_computed_and_saved(db, client, project):
+    add_book(client, project, VERSES)
+    db.query(database.Verse).update({database.Verse.digest: None})
+    db.commit()
+
+    result = add_book(client, project, VERSES)
+
+    assert result["modified_verses"] == []
+    assert {number: verse.digest for number, verse in stored_verses(db, project).items()} == {
+        number: hashlib.sha256(content).hexdigest() for number, content in VERSES.items()
+    }
+
+
+def test_identical_verses_share_a_blob(db, client, project):
+    add_book(client, project, VERSES)
+
+    verses = stored_verses(db, project)
+
+    first, second, third = (os.stat(verses[number].path) for number in (1, 2, 3))
+    assert first.st_ino == third.st_ino
+    assert first.st_ino != second.st_ino
+    assert first.st_ino == os.stat(crud.blob_path(verses[1].digest)).st_ino
+
+
+
+def orphan_blob():
+    orphan = crud.blob_path("0" * 64)
+    orphan.parent.mkdir(parents=True, exist_ok=True)
+    orphan.write_bytes(b"no longer used")
+    return orphan
+
+
+def test_prune_keeps_linked_blobs(db, client, project, monkeypatch):
+    add_book(client, project, VERSES)
+    orphan = orphan_blob()
+    monkeypatch.setattr(crud, "BLOB_PRUNE_GRACE_SECONDS", 0)
+
+    crud.prune_blob_store()
+
+    assert not orphan.exists()
+    for verse in stored_verses(db, project).values():
+        assert crud.blob_path(verse.digest).exists()
+
+
+def test_prune_keeps_recently_unlinked_blobs():
+    # An upload may be linking a project file to this blob right now
+    orphan = orphan_blob()
+
+    crud.prune_blob_store()
+
+    assert orphan.exists()
+    orphan.unlink()
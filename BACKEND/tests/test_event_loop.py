@@ -0,0 +1,87 @@
+import asyncio
+import gc
+import os
+import shutil
+import time
+
+import httpx
+import pytest
+
+import crud
+import main
+from conftest import project_zip
+
+# Longest the event loop may stall while exports and status requests run. Threads
+# share the GIL, so some lag remains; an export run on the loop stalls it for seconds
+MAX_LAG_SECONDS = 0.1
+CHAPTERS = 6
+VERSES = 20
+
+
+@pytest.fixture
+def project_id(db, client):
+    """A project ingested through POST /projects, with enough audio to make its export take a while."""
+    payload = project_zip(
+        "Lag test",
+        {"MRK": {
+            chapter: {f"{chapter}_{verse}.wav": os.urandom(200_000) for verse in range(1, VERSES + 1)}
+            for chapter in range(1, CHAPTERS + 1)
+        }},
+    )
+    response = client.post("/projects", files={"file": ("Lag test.zip", payload, "application/zip")})
+    assert response.status_code == 202, response.text
+    status = client.get(f"/ingestion-status/{response.json()['ingestion_id']}").json()["data"]
+    assert status["status"] == "completed", status
+    yield status["project_id"]
+    shutil.rmtree(crud.BASE_DIR / str(status["project_id"]), ignore_errors=True)
+
+
+async def measure_lag(stop: asyncio.Event) -> float:
+    """Largest delay of a 5 ms sleep on the event loop until `stop` is set."""
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        worst = max(worst, time.perf_counter() - started - 0.005)
+    return worst
+
+
+async def poll_chapter_status(client: httpx.AsyncClient, project_id: int, stop: asyncio.Event) -> list:
+    """Request the status of each chapter in turn until `stop` is set; return the response codes."""
+    codes = []
+    while not stop.is_set():
+        chapter = len(codes) % CHAPTERS + 1
+        response = await client.get(f"/project/{project_id}/MRK/{chapter}")
+        codes.append(response.status_code)
+    return codes
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_exports_do_not_block_event_loop(anyio_backend, project_id, client):
+    # A full garbage collection of everything the earlier tests left behind stalls
+    # all threads for longer than the limit; leave those objects out of it
+    gc.collect()
+    gc.freeze()
+    try:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=120) as http:
+            stop = asyncio.Event()
+            lag = asyncio.create_task(measure_lag(stop))
+            statuses = asyncio.create_task(poll_chapter_status(http, project_id, stop))
+            exported, usfm = await asyncio.gather(
+                http.get("/download-processed-project-zip/", params={"project_id": project_id}),
+                http.get("/generate-usfm/", params={"project_id": project_id, "book": "MRK"}),
+            )
+            stop.set()
+            worst_lag = await lag
+            status_codes = await statuses
+    finally:
+        gc.unfreeze()
+
+    assert exported.status_code == 200, exported.text
+    assert exported.headers["content-type"] == "application/zip"
+    assert usfm.status_code == 200, usfm.text
+    # Chapter status requests were served while the exports ran
+    assert len(status_codes) > 1 and set(status_codes) == {200}
+    assert worst_lag < MAX_LAG_SECONDS, f"event loop stalled for {worst_lag:.3f} seconds"
@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+
+import job_monitor
+
+
+def entry(kind: str) -> dict:
+    return {
+        "kind": kind, "model": None, "work": 0, "expected": None,
+        "errors": 0, "checks": 0, "watched_at": time.time(), "next_check": 0,
+    }
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    monkeypatch.setattr(job_monitor, "_jobs", {})
+    monkeypatch.setattr(job_monitor, "_checks", {})
+    monkeypatch.setattr(job_monitor, "AI_CALLBACK_TOKEN", None)
+    yield job_monitor
+    job_monitor.stop()
+
+
+def test_slow_status_check_does_not_hold_back_other_jobs(monitor, monkeypatch):
+    release = threading.Event()
+    slow_checks = []
+    finished = threading.Event()
+
+    def check_ai_job_status(ai_jobid):
+        if ai_jobid == "slow":
+            # Stands in for a status request hanging until its read timeout
+            slow_checks.append(ai_jobid)
+            release.wait(10)
+            return {"data": {"status": "job running"}}
+        return {"data": {"status": "job finished"}}
+
+    monkeypatch.setattr(monitor.crud, "check_ai_job_status", check_ai_job_status)
+    monkeypatch.setitem(monitor._handlers, "test", lambda ai_jobid, result: finished.set())
+    monitor._jobs["slow"] = entry("test")
+    monitor.start()
+    try:
+        time.sleep(0.1)
+        # Watched while the slow check is running
+        monitor._jobs["fast"] = entry("test")
+        monitor._wakeup.set()
+        assert finished.wait(2), "the fast job waited for the slow check"
+        # The slow job is not checked a second time while its check runs
+        assert slow_checks == ["slow"]
+    finally:
+        release.set()
+
+
+
+@pytest.fixture
+def polling(monkeypatch):
+    monkeypatch.setattr(job_monitor, "JOB_MONITOR_MIN_POLL_SECONDS", 2)
+    monkeypatch.setattr(job_monitor, "JOB_MONITOR_MAX_POLL_SECONDS", 60)
+    monkeypatch.setattr(job_monitor, "JOB_MONITOR_SAFETY_POLL_SECONDS", 300)
+    monkeypatch.setattr(job_monitor, "AI_CALLBACK_TOKEN", None)
+    monkeypatch.setattr(job_monitor, "_seconds_per_unit", {})
+    return monkeypatch
+
+
+def interval_bounds(monkeypatch, elapsed: float, **fields) -> tuple:
+    """The shortest and longest interval the jitter allows for a job watched `elapsed` seconds ago."""
+    now = time.time()
+    job = {**entry("test"), "watched_at": now - elapsed, **fields}
+    bounds = []
+    for factor in (0.8, 1.2):
+        with monkeypatch.context() as patch:
+            patch.setattr(job_monitor.random, "uniform", lambda low, high: factor)
+            bounds.append(job_monitor._next_interval(job, now))
+    return pytest.approx(tuple(bounds))
+
+
+def test_failed_checks_back_off_exponentially_up_to_the_maximum(polling):
+    assert [interval_bounds(polling, 0, errors=errors) for errors in (1, 2, 3, 6)] == [
+        (3.2, 4.8), (6.4, 9.6), (12.8, 19.2), (48, 72),
+    ]
+
+
+def test_job_is_checked_when_its_expected_duration_is_up(polling):
+    assert interval_bounds(polling, 10, expected=40) == (24, 36)
+
+
+def test_overdue_job_is_checked_at_a_quarter_of_its_age_within_limits(polling):
+    assert interval_bounds(polling, 40) == (8, 12)
+    assert interval_bounds(polling, 1) == (1.6, 2.4)
+    assert interval_bounds(polling, 1000) == (48, 72)
+
+
+def test_jobs_reporting_by_callback_are_polled_rarely(polling):
+    polling.setattr(job_monitor, "AI_CALLBACK_TOKEN", "secret")
+
+    assert interval_bounds(polling, 40) == (240, 360)
+    # Failed checks still back off from the minimum
+    assert interval_bounds(polling, 40, errors=1) == (3.2, 4.8)
+
+
+def test_jitter_stays_within_a_fifth_of_the_interval(polling):
+    now = time.time()
+    job = {**entry("test"), "watched_at": now - 40}
+
+    intervals = [job_monitor._next_interval(job, now) for _ in range(1000)]
+
+    assert 8 <= min(intervals) < max(intervals) <= 12
+
+
+def test_expected_duration_follows_moving_average_per_unit_of_work(polling):
+    job = {**entry("test"), "model": "model-a", "work": 100}
+    job_monitor._record_duration(job, 50)
+    job_monitor._record_duration(job, 150)
+
+    assert job_monitor._seconds_per_unit[("test", "model-a")] == pytest.approx(0.3 * 1.5 + 0.7 * 0.5)
+    polling.setattr(job_monitor, "start", lambda: None)
+    polling.setattr(job_monitor, "_jobs", {})
+    job_monitor.watch("ai-1", "test", model="model-a", work=200)
+    job_monitor.watch("ai-2", "test", model="model-b", work=200)
+    assert job_monitor._jobs["ai-1"]["expected"] == pytest.approx(160)
+    assert job_monitor._jobs["ai-2"]["expected"] is None
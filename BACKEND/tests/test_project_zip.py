@@ -0,0 +1,105 @@
+import io
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+
+import crud
+from conftest import project_zip
+
+
+def plan(payload: bytes) -> dict:
+    with zipfile.ZipFile(io.BytesIO(payload)) as zip_ref:
+        return crud.plan_project_zip(zip_ref, crud.read_metadata(zip_ref))
+
+
+def planned_verses(project_plan: dict) -> dict:
+    """{book: {chapter: {verse: member name}}} of a plan."""
+    return {
+        book: {
+            chapter: {verse: zip_info.filename for verse, (zip_info, _) in chapter_plan["verses"].items()}
+            for chapter, chapter_plan in chapters.items()
+        }
+        for book, chapters in project_plan["books"].items()
+    }
+
+
+def test_plan_picks_one_file_per_verse():
+    payload = project_zip("Demo", {
+        "MRK": {
+            1: {
+                "1_1.wav": b"a",
+                # Same verse in another format: the first one in the ZIP wins
+                "1_1.mp3": b"b",
+                "1_2_1.wav": b"take",
+                "1_2_default.wav": b"default",
+                "1_3_1.wav": b"take 1",
+                "1_3.wav": b"main",
+                "intro.wav": b"not a verse",
+            },
+            2: {"2_1.mp3": b"c"},
+            # Files of another chapter in the wrong folder are ignored
+            3: {"2_5.wav": b"d"},
+        },
+        "LUK": {1: {"notes.txt": b"no verses"}},
+    })
+
+    project_plan = plan(payload)
+
+    prefix = "Demo/audio/ingredients/MRK"
+    assert planned_verses(project_plan) == {
+        "MRK": {
+            1: {1: f"{prefix}/1/1_1.wav", 2: f"{prefix}/1/1_2_default.wav", 3: f"{prefix}/1/1_3.wav"},
+            2: {1: f"{prefix}/2/2_1.mp3"},
+        },
+    }
+    assert project_plan["books"]["MRK"][1]["missing_verses"] == sorted(set(range(4, 46)))
+    assert project_plan["incompartible_verses"] == ["intro"]
+    # The wrapping project folder is flattened; the skipped book is not written at all
+    assert [relative for _, relative in project_plan["files"]] == [("metadata.json",)]
+
+
+def test_plan_keeps_members_inside_the_project():
+    payload = project_zip("Demo", {"MRK": {1: {"1_1.wav": b"a"}}}, extra={
+        "Demo/audio/ingredients/MRK/1/../../../../../etc/1_2.wav": b"escape",
+        "Demo/audio/ingredients/MRK/1/takes/1_3.wav": b"nested",
+    })
+
+    project_plan = plan(payload)
+
+    assert list(project_plan["books"]["MRK"][1]["verses"]) == [1]
+    for _, relative in project_plan["files"]:
+        assert ".." not in relative
+
+
+def test_plan_finds_text_ingredients_below_an_unnamed_folder():
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("1234/metadata.json", '{"identification": {"name": {"en": "Demo"}}}')
+        archive.writestr("1234/text-1/ingredients/MRK/1/1_1.wav", b"a")
+
+    project_plan = plan(buffer.getvalue())
+
+    assert planned_verses(project_plan) == {"MRK": {1: {1: "1234/text-1/ingredients/MRK/1/1_1.wav"}}}
+    assert crud.find_ingredients_dir({"1234": {"text-1": {"ingredients": {}}}}) == ("1234", "text-1", "ingredients")
+
+
+def test_plan_rejects_project_without_verses():
+    payload = project_zip("Demo", {"MRK": {1: {"notes.txt": b"x"}}})
+
+    with pytest.raises(HTTPException) as error:
+        plan(payload)
+
+    assert error.value.status_code == 400
+
+
+def test_oversized_audio_is_reported(tmp_path, monkeypatch):
+    monkeypatch.setattr(crud, "MAX_AUDIO_FILE_SIZE_MB", 0.001)
+    zip_path = tmp_path / "project.zip"
+    zip_path.write_bytes(project_zip("Demo", {"MRK": {1: {"1_1.wav": bytes(2000), "1_2.wav": b"small"}}}))
+
+    assert crud.find_oversized_audio_files(zip_path) == ["Demo/audio/ingredients/MRK/1/1_1.wav (0.00 MB)"]
+    with pytest.raises(HTTPException) as error:
+        crud.validate_project_zip(zip_path)
+    assert error.value.status_code == 400
+    assert not zip_path.exists()
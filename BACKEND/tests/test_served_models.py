@@ -0,0 +1,62 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import served_models
+
+CALLERS = 8
+
+
+@pytest.fixture
+def ai_service(monkeypatch):
+    """Serves model "a" after a slow fetch; records each fetch."""
+    fetches = []
+    lock = threading.Lock()
+
+    def fetch_served_models():
+        with lock:
+            fetches.append(time.time())
+        time.sleep(0.2)
+        return ["a"]
+
+    monkeypatch.setattr(served_models.crud, "fetch_served_models", fetch_served_models)
+    monkeypatch.setattr(served_models, "_cache", None)
+    return fetches
+
+
+def test_concurrent_callers_share_one_fetch(ai_service):
+    with ThreadPoolExecutor(max_workers=CALLERS) as executor:
+        results = list(executor.map(lambda _: served_models.model_names(), range(CALLERS)))
+
+    assert results == [frozenset({"a"})] * CALLERS
+    assert len(ai_service) == 1
+
+
+def test_fresh_list_is_answered_from_memory(ai_service):
+    served_models.model_names()
+
+    assert served_models.model_names() == frozenset({"a"})
+    assert len(ai_service) == 1
+
+
+def test_expired_list_is_fetched_again(ai_service, monkeypatch):
+    served_models.model_names()
+    monkeypatch.setattr(served_models, "SERVED_MODELS_TTL_SECONDS", 0)
+
+    served_models.model_names()
+
+    assert len(ai_service) == 2
+
+
+def test_expired_list_is_not_served_when_fetch_fails(ai_service, monkeypatch):
+    served_models.model_names()
+    monkeypatch.setattr(served_models, "SERVED_MODELS_TTL_SECONDS", 0)
+
+    def unreachable():
+        raise ConnectionError("AI service unreachable")
+
+    monkeypatch.setattr(served_models.crud, "fetch_served_models", unreachable)
+    with pytest.raises(ConnectionError):
+        served_models.model_names()
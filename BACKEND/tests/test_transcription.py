@@ -0,0 +1,234 @@
+import datetime
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+import crud
+import database
+import served_models
+import work_queue
+
+
+@pytest.fixture
+def served(monkeypatch):
+    """Serve no models, without calling the AI service."""
+    monkeypatch.setattr(served_models, "model_names", lambda: frozenset())
+
+
+def test_bulk_transcription_rejects_unmapped_language(db, chapter, served):
+    db.query(database.Verse).update({database.Verse.stt: True, database.Verse.stt_msg: "Transcription successful"})
+    chapter.approved = True
+    db.commit()
+    book = db.get(database.Book, chapter.book_id)
+
+    with pytest.raises(HTTPException) as error:
+        crud.start_bulk_transcription(db, book.project_id, "Klingon")
+
+    assert error.value.status_code == 400
+    db.expire_all()
+    assert db.get(database.Chapter, chapter.chapter_id).approved is True
+    assert all(verse.stt for verse in db.query(database.Verse))
+    assert db.query(database.WorkItem).count() == 0
+
+
+def test_bulk_transcription_refused_by_stt_api_changes_nothing(db, chapter, monkeypatch):
+    db.query(database.Verse).update({database.Verse.stt: True, database.Verse.stt_msg: "Transcription successful"})
+    chapter.approved = True
+    db.commit()
+    book = db.get(database.Book, chapter.book_id)
+    monkeypatch.setattr(crud, "is_model_served", lambda script_lang, kind: True)
+
+    def busy(call, user_id, project_id):
+        raise HTTPException(status_code=503, detail="The AI service is busy")
+
+    monkeypatch.setattr(crud, "submit_preflight", busy)
+
+    with pytest.raises(HTTPException) as error:
+        crud.start_bulk_transcription(db, book.project_id, "Kannada")
+
+    assert error.value.status_code == 503
+    db.expire_all()
+    assert db.get(database.Chapter, chapter.chapter_id).approved is True
+    assert all(verse.stt and verse.stt_msg for verse in db.query(database.Verse))
+    assert db.query(database.WorkItem).count() == 0
+
+
+def test_bulk_transcription_queues_bulk_work(db, chapter, stt, monkeypatch):
+    db.query(database.Verse).update({database.Verse.stt: True, database.Verse.stt_msg: "Transcription successful"})
+    chapter.approved = True
+    db.commit()
+    book = db.get(database.Book, chapter.book_id)
+    monkeypatch.setattr(crud, "is_model_served", lambda script_lang, kind: True)
+
+    result = crud.start_bulk_transcription(db, book.project_id, "Kannada")
+
+    db.expire_all()
+    assert (result["chapters"], result["verses"]) == (1, 3)
+    assert db.get(database.Chapter, chapter.chapter_id).approved is False
+    assert not any(verse.stt for verse in db.query(database.Verse))
+    assert [(item.interactive, item.payload["bulk"]) for item in db.query(database.WorkItem)] == [(False, True)]
+    assert stt.submitted == [db.query(database.Verse).order_by(database.Verse.verse).first().path]
+
+
+class FakeSTT:
+    """Accepts STT batches, except those holding a file in `reject`, and records what was submitted."""
+
+    def __init__(self, reject=()):
+        self.reject = set(reject)
+        self.broken = set()
+        self.submitted = []
+        self.lock = threading.Lock()
+
+    def __call__(self, file_paths, script_lang):
+        if self.broken & set(file_paths):
+            raise ConnectionError("connection reset by peer")
+        if self.reject & set(file_paths):
+            return {"error": "Failed to transcribe", "status_code": 500}
+        with self.lock:
+            self.submitted.extend(file_paths)
+            return {"data": {"jobId": f"ai-{len(self.submitted)}"}}
+
+
+@pytest.fixture
+def stt(monkeypatch):
+    """One verse per batch; submissions go to a `FakeSTT` and watched jobs are recorded."""
+    watched = []
+    monkeypatch.setattr(crud, "STT_BATCH_SIZE", 1)
+    monkeypatch.setattr(crud.job_monitor, "watch", lambda ai_jobid, kind, **kwargs: watched.append(ai_jobid))
+    fake = FakeSTT()
+    monkeypatch.setattr(crud, "call_stt_api", fake)
+    fake.watched = watched
+    return fake
+
+
+def jobs(db):
+    db.expire_all()
+    return {job.verse_id: (job.status, job.ai_jobid) for job in db.query(database.Job).order_by(database.Job.job_id)}
+
+
+def test_retry_after_partial_submit_skips_accepted_verses(db, chapter, stt):
+    verses = db.query(database.Verse).order_by(database.Verse.verse).all()
+    verse_ids = [verse.verse_id for verse in verses]
+    stt.reject = {verses[2].path}
+    commits = []
+
+    # The commit storing the submissions fails, after the STT API accepted two of three batches
+    def fail_second_commit(session):
+        commits.append(session)
+        if len(commits) == 2:
+            raise RuntimeError("database went away")
+
+    event.listen(crud.SessionLocal, "before_commit", fail_second_commit)
+    try:
+        with pytest.raises(RuntimeError):
+            crud.transcribe_verses(verse_ids, "Kannada")
+    finally:
+        event.remove(crud.SessionLocal, "before_commit", fail_second_commit)
+
+    assert jobs(db) == {
+        verse_ids[0]: ("in_progress", "ai-1"),
+        verse_ids[1]: ("in_progress", "ai-2"),
+        verse_ids[2]: ("failed", None),
+    }
+    assert stt.watched == ["ai-1", "ai-2"]
+
+    # The work queue retries the item: only the verse that was not accepted is submitted again
+    stt.reject = set()
+    crud.transcribe_verses(verse_ids, "Kannada")
+
+    assert stt.submitted == [verses[0].path, verses[1].path, verses[2].path]
+    assert db.query(database.Job).filter(database.Job.status == "pending").count() == 0
+    assert db.query(database.Job).filter(database.Job.created_date.is_(None)).count() == 0
+
+
+def test_batch_that_raises_fails_only_its_verses(db, chapter, stt):
+    verses = db.query(database.Verse).order_by(database.Verse.verse).all()
+    verse_ids = [verse.verse_id for verse in verses]
+    stt.broken = {verses[1].path}
+
+    crud.transcribe_verses(verse_ids, "Kannada")
+
+    statuses = {verse_id: status for verse_id, (status, _) in jobs(db).items()}
+    assert statuses == {verse_ids[0]: "in_progress", verse_ids[1]: "failed", verse_ids[2]: "in_progress"}
+    assert db.get(database.Verse, verse_ids[1]).stt_msg == "Exception occurred"
+    assert sorted(stt.submitted) == sorted([verses[0].path, verses[2].path])
+    assert sorted(stt.watched) == ["ai-1", "ai-2"]
+
+
+def test_failure_before_submit_leaves_no_pending_jobs(db, chapter, stt, monkeypatch):
+    verse_ids = [verse.verse_id for verse in db.query(database.Verse)]
+
+    def no_owner(db_session, verse_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    monkeypatch.setattr(crud, "verse_owner", no_owner)
+    with pytest.raises(HTTPException):
+        crud.transcribe_verses(verse_ids, "Kannada")
+
+    assert {status for status, _ in jobs(db).values()} == {"failed"}
+    assert stt.submitted == []
+
+
+def test_progress_follows_work_item_state(db, chapter):
+    verses = db.query(database.Verse).order_by(database.Verse.verse).all()
+    now = datetime.datetime.utcnow()
+    long_ago = now - datetime.timedelta(seconds=work_queue.WORK_QUEUE_VISIBILITY_SECONDS + 60)
+    db.add_all([
+        # An old run left a pending job behind, a later run is in progress
+        database.Job(verse_id=verses[0].verse_id, status="pending", kind="stt", created_date=long_ago),
+        database.Job(verse_id=verses[0].verse_id, ai_jobid="ai-1", status="in_progress", kind="stt"),
+        # A run whose worker died: its lock ran out
+        database.Job(verse_id=verses[1].verse_id, status="pending", kind="stt", created_date=long_ago),
+        database.WorkItem(
+            kind="stt", payload={"verse_ids": [verses[1].verse_id], "script_lang": "Kannada"}, status="running",
+            attempts=1, max_attempts=3, available_at=long_ago, locked_until=now - datetime.timedelta(seconds=1),
+        ),
+        # A bulk run that has been waiting for a long time, under a renewed lock
+        database.Job(verse_id=verses[2].verse_id, status="pending", kind="stt", created_date=long_ago),
+        database.WorkItem(
+            kind="stt", payload={"verse_ids": [verses[2].verse_id], "script_lang": "Kannada", "bulk": True},
+            status="running", attempts=1, max_attempts=3, interactive=False, available_at=long_ago,
+            locked_until=now + datetime.timedelta(seconds=60),
+        ),
+    ])
+    for verse in verses:
+        verse.stt_msg = ""
+    db.commit()
+    book = db.get(database.Book, chapter.book_id)
+
+    progress = crud.transcription_progress(db, book.project_id)
+
+    assert (progress["transcribed"], progress["failed"], progress["in_progress"], progress["pending"]) == (0, 1, 2, 0)
+
+
+def test_batches_hold_at_most_batch_size_files(monkeypatch):
+    monkeypatch.setattr(crud, "STT_BATCH_SIZE", 2)
+    pending = [(number, 100 + number, f"/audio/1/1_{number}.wav") for number in range(1, 6)]
+
+    assert crud.stt_batches(pending) == [pending[0:2], pending[2:4], pending[4:5]]
+
+
+def test_batches_never_repeat_a_file_name(monkeypatch):
+    monkeypatch.setattr(crud, "STT_BATCH_SIZE", 10)
+    # Takes of the same verse in two folders: transcriptions are matched back by file name
+    pending = [
+        (1, 101, "/audio/1/1_1.wav"),
+        (2, 102, "/audio/1/1_2.wav"),
+        (3, 103, "/other/1/1_1.wav"),
+    ]
+
+    assert crud.stt_batches(pending) == [pending[0:2], pending[2:3]]
+
+
+def test_chapter_is_submitted_in_batches(db, chapter, stt, monkeypatch):
+    monkeypatch.setattr(crud, "STT_BATCH_SIZE", 2)
+    verses = db.query(database.Verse).order_by(database.Verse.verse).all()
+
+    crud.transcribe_verses([verse.verse_id for verse in verses], "Kannada")
+
+    ai_jobids = [ai_jobid for _, ai_jobid in jobs(db).values()]
+    assert len(set(ai_jobids)) == 2
+    assert sorted(ai_jobids.count(ai_jobid) for ai_jobid in set(ai_jobids)) == [1, 2]
+    assert sorted(stt.watched) == sorted(set(ai_jobids))
@@ -0,0 +1,21 @@
+import database
+import crud
+
+
+def test_tts_job_without_audio_fails(db, chapter, tmp_path, monkeypatch):
+    verse = db.query(database.Verse).filter(database.Verse.chapter_id == chapter.chapter_id).first()
+    db.add(database.Job(verse_id=verse.verse_id, ai_jobid="tts-1", status="in_progress", kind="tts"))
+    db.commit()
+    assets = tmp_path / "assets"
+    assets.mkdir()
+    (assets / "log.txt").write_text("no audio here")
+    monkeypatch.setattr(crud, "download_and_extract_audio_zip", lambda url: str(assets))
+
+    crud.handle_tts_job("tts-1", {"data": {"status": "job finished"}})
+
+    db.expire_all()
+    job = db.query(database.Job).filter(database.Job.ai_jobid == "tts-1").one()
+    assert job.status == "failed"
+    verse = db.get(database.Verse, verse.verse_id)
+    assert verse.tts is False
+    assert verse.tts_msg == "No audio found in the TTS output"
@@ -0,0 +1,112 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+import crud
+import database
+import main
+from conftest import book_zip, project_zip
+
+UPLOADS = 4
+
+
+def leftover_workspaces():
+    temp_root = crud.BASE_DIR / "temp"
+    return sorted(temp_root.glob("upload_*")) if temp_root.exists() else []
+
+
+def verse_contents(db, project_id: int) -> dict:
+    db.expire_all()
+    rows = (
+        db.query(database.Book.book, database.Chapter.chapter, database.Verse.verse, database.Verse.path)
+        .join(database.Chapter, database.Verse.chapter_id == database.Chapter.chapter_id)
+        .join(database.Book, database.Chapter.book_id == database.Book.book_id)
+        .filter(database.Book.project_id == project_id)
+    )
+    return {(book, chapter, verse): Path(path).read_bytes() for book, chapter, verse, path in rows}
+
+
+def post_project(name: str, payload: bytes) -> dict:
+    # One client per thread, so the requests really overlap; startup events do not run
+    client = TestClient(main.app)
+    response = client.post("/projects", files={"file": (f"{name}.zip", payload, "application/zip")})
+    assert response.status_code == 202, response.text
+    ingestion_id = response.json()["ingestion_id"]
+    # The ingestion runs as a background task before the test client returns
+    return client.get(f"/ingestion-status/{ingestion_id}").json()["data"]
+
+
+def test_concurrent_project_uploads_ingest_their_own_content(db, client):
+    uploads = {
+        f"Project {index}": project_zip(
+            f"Project {index}",
+            {"MRK": {1: {f"1_{verse}.wav": f"project {index} verse {verse}".encode() for verse in (1, 2, 3)}}},
+        )
+        for index in range(UPLOADS)
+    }
+    with ThreadPoolExecutor(max_workers=UPLOADS) as executor:
+        results = dict(zip(uploads, executor.map(post_project, uploads, uploads.values())))
+
+    for name, status in results.items():
+        assert status["status"] == "completed", status
+        assert verse_contents(db, status["project_id"]) == {
+            ("MRK", 1, verse): f"{name.lower()} verse {verse}".encode() for verse in (1, 2, 3)
+        }
+    assert leftover_workspaces() == []
+
+
+def test_failed_project_upload_leaves_no_workspace(db, client):
+    # A project without an ingredients folder is rejected during ingestion
+    payload = project_zip("Broken", {}, extra={"Broken/notes/readme.txt": b"no audio"})
+
+    status = post_project("Broken", payload)
+
+    assert status["status"] == "failed"
+    assert db.query(database.Project).count() == 0
+    assert leftover_workspaces() == []
+
+
+def test_invalid_zip_upload_leaves_no_workspace(client):
+    response = client.post("/projects", files={"file": ("broken.zip", b"not a zip", "application/zip")})
+
+    assert response.status_code == 400
+    assert leftover_workspaces() == []
+
+
+@pytest.fixture
+def projects(db, user):
+    projects = [
+        database.Project(name=f"Book target {index}", owner_id=user.user_id, script_lang="", audio_lang="")
+        for index in range(UPLOADS)
+    ]
+    db.add_all(projects)
+    db.commit()
+    return [project.project_id for project in projects]
+
+
+def post_book(project_id: int, payload: bytes):
+    return TestClient(main.app).post(
+        f"/projects/{project_id}/add-book", files={"file": ("MRK.zip", payload, "application/zip")}
+    )
+
+
+def test_concurrent_book_uploads_add_their_own_content(db, client, projects):
+    payloads = [
+        book_zip("MRK", {1: {f"1_{verse}.wav": f"book {project_id} verse {verse}".encode() for verse in (1, 2)}})
+        for project_id in projects
+    ]
+    # One of the uploads is not a ZIP and fails
+    projects = projects + [projects[0]]
+    payloads = payloads + [b"not a zip"]
+    with ThreadPoolExecutor(max_workers=len(projects)) as executor:
+        responses = list(executor.map(post_book, projects, payloads))
+
+    assert [response.status_code for response in responses[:-1]] == [200] * UPLOADS
+    assert responses[-1].status_code >= 400
+    for project_id in projects[:-1]:
+        assert verse_contents(db, project_id) == {
+            ("MRK", 1, verse): f"book {project_id} verse {verse}".encode() for verse in (1, 2)
+        }
+    assert leftover_workspaces() == []
@@ -0,0 +1,71 @@
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import HTTPException
+
+import uploads
+
+USER_ID = 1
+
+
+class SlowRequest:
+    """Stands in for a chunk request whose body arrives in pieces."""
+
+    def __init__(self, pieces, delay: float):
+        self.pieces = pieces
+        self.delay = delay
+        self.started = asyncio.Event()
+
+    async def stream(self):
+        for piece in self.pieces:
+            yield piece
+            # The piece has been written once the consumer asks for the next one
+            self.started.set()
+            await asyncio.sleep(self.delay)
+
+
+def new_session(payload: bytes) -> str:
+    session = uploads.create_upload_session(
+        USER_ID, "project.zip", len(payload), hashlib.sha256(payload).hexdigest(), "project", 1 << 20
+    )
+    return session["upload_id"]
+
+
+async def append_and_complete(upload_id: str, request: SlowRequest, target, chunk_checksum=None):
+    append = asyncio.create_task(uploads.append_chunk(upload_id, USER_ID, 0, request, chunk_checksum))
+    await request.started.wait()
+    complete = asyncio.create_task(asyncio.to_thread(uploads.complete_upload_session, upload_id, USER_ID, target))
+    results = await asyncio.gather(append, complete, return_exceptions=True)
+    return results
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_complete_waits_for_chunk_being_written(anyio_backend, tmp_path):
+    payload = bytes(range(256)) * 64
+    upload_id = new_session(payload)
+    request = SlowRequest([payload[i:i + 4096] for i in range(0, len(payload), 4096)], delay=0.05)
+
+    appended, completed = await append_and_complete(upload_id, request, tmp_path / "upload.zip")
+
+    assert appended["offset"] == len(payload)
+    assert completed["upload_id"] == upload_id
+    assert (tmp_path / "upload.zip").read_bytes() == payload
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("anyio_backend", ["asyncio"])
+async def test_complete_does_not_move_rejected_chunk(anyio_backend, tmp_path):
+    payload = bytes(range(256)) * 64
+    upload_id = new_session(payload)
+    # All bytes are written before the chunk checksum is found to be wrong and the chunk dropped
+    request = SlowRequest([payload], delay=0.3)
+
+    appended, completed = await append_and_complete(upload_id, request, tmp_path / "upload.zip", "0" * 64)
+
+    assert isinstance(appended, HTTPException) and appended.status_code == 400
+    assert isinstance(completed, HTTPException) and completed.status_code == 409
+    assert not (tmp_path / "upload.zip").exists()
+    assert uploads.get_upload_session(upload_id, USER_ID)["offset"] == 0
+    uploads.delete_upload_session(upload_id, USER_ID)
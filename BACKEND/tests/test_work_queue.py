@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+
+import database
+import work_queue
+
+
+@pytest.fixture
+def sleepy(monkeypatch):
+    """A task that runs for longer than the (shortened) visibility timeout."""
+    monkeypatch.setattr(work_queue, "WORK_QUEUE_VISIBILITY_SECONDS", 1)
+    monkeypatch.setitem(work_queue._tasks, "sleepy", lambda seconds: time.sleep(seconds))
+
+
+def test_running_item_is_not_reclaimed_after_visibility_timeout(db, sleepy):
+    work_id = work_queue.enqueue(db, "sleepy", {"seconds": 2.5}).work_id
+    item = work_queue.claim(db, "first")
+    outcomes = []
+    runner = threading.Thread(
+        target=lambda: outcomes.append(work_queue._run(item.work_id, item.kind, dict(item.payload), "first"))
+    )
+    runner.start()
+
+    # Well past the lock taken by the claim
+    time.sleep(1.8)
+    reclaimed = work_queue.claim(db, "second")
+    runner.join()
+
+    assert reclaimed is None
+    assert outcomes == ["done"]
+    db.expire_all()
+    item = db.get(database.WorkItem, work_id)
+    assert (item.status, item.attempts, item.locked_by) == ("done", 1, "first")
+
+
+def test_interactive_item_is_claimed_before_earlier_bulk_work(db, monkeypatch):
+    monkeypatch.setitem(work_queue._tasks, "chapter", lambda chapter: None)
+    bulk_ids = work_queue.enqueue_many(db, "chapter", [{"chapter": number} for number in range(3)], interactive=False)
+    interactive_id = work_queue.enqueue(db, "chapter", {"chapter": 99}).work_id
+
+    claimed = [work_queue.claim(db, "worker").work_id for _ in range(4)]
+
+    assert claimed == [interactive_id] + bulk_ids
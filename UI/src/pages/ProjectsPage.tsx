@@ -85,6 +85,17 @@ interface UploadProjectResponse {
   };
 }
 
+interface IngestionStatus {
+  ingestion_id: string;
+  status: "queued" | "in_progress" | "completed" | "failed";
+  phase: string;
+  project_id: number | null;
+  incompartible_verses: string[];
+  error: { status_code: number; detail: string | { message: string; invalid_files?: string[] } } | null;
+}
+
+const INGESTION_POLL_INTERVAL_MS = 2000;
+
 export const fuzzyFilter: FilterFn<Project> = (row, columnId, value) => {
   // Simple case-insensitive filtering
   const cellValue = String(row.getValue(columnId)).toLowerCase();
@@ -193,9 +204,10 @@ const uploadProject = async (
     };
 
     xhr.onload = () => {
-      if (xhr.status === 200) {
-        const response: UploadProjectResponse = JSON.parse(xhr.responseText);
-        resolve(response);
+      if (xhr.status === 202) {
+        // The upload is stored; wait for the server to finish ingesting it
+        const { ingestion_id } = JSON.parse(xhr.responseText);
+        waitForIngestion(ingestion_id).then(resolve, reject);
       } else {
         const errorResponse = JSON.parse(xhr.responseText);
         const detail = errorResponse.detail;
@@ -214,6 +226,43 @@ const uploadProject = async (
   });
 };
 
+const waitForIngestion = async (
+  ingestionId: string
+): Promise<UploadProjectResponse> => {
+  for (;;) {
+    await new Promise((resolve) => setTimeout(resolve, INGESTION_POLL_INTERVAL_MS));
+    const response = await fetch(`${BASE_URL}/ingestion-status/${ingestionId}`, {
+      headers: {
+        Authorization: `Bearer ${useAuthStore.getState().token}`,
+      },
+    });
+    const responseData = await response.json();
+    if (!response.ok) {
+      throw new Error(responseData.detail || "Failed to fetch upload status");
+    }
+    const ingestion: IngestionStatus = responseData.data;
+    if (ingestion.status === "completed") {
+      return {
+        message: "Project uploaded successfully",
+        project_id: String(ingestion.project_id),
+        result: {
+          status: "success",
+          incompartible_verses: ingestion.incompartible_verses,
+        },
+      };
+    }
+    if (ingestion.status === "failed") {
+      const detail = ingestion.error?.detail;
+      if (typeof detail === "object" && detail.invalid_files) {
+        throw new Error(`${detail.message}: ${detail.invalid_files.join(", ")}`);
+      }
+      throw new Error(
+        (typeof detail === "string" && detail) || "Failed to upload project"
+      );
+    }
+  }
+};
+
 const downloadProject = async (projectId: string, name: string) => {
   const response = await fetch(
     `${BASE_URL}/download-processed-project-zip/?project_id=${projectId}`,